@@ -0,0 +1,82 @@
+"""
+Load time and memory of JSON vs columnar (.vrc) events/chunks files.
+
+    python -m benchmarks.artifact_format data/derived/<video_id>/events.json
+
+Each measurement runs in a fresh process so peak RSS is not polluted by the
+previous one. "scan" touches every t_start and every text, which is what a
+consumer like the chunker does; "columns" only reads the numeric columns.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import resource
+import sys
+import time
+from pathlib import Path
+
+from videorag.pipeline.columnar import json_to_columnar, open_columnar
+
+
+def _rss_mb() -> float:
+    """Peak RSS of this process in MB."""
+    status = Path("/proc/self/status")
+    if status.exists():
+        # VmHWM is reset on exec, unlike ru_maxrss which a spawned child
+        # inherits from its parent.
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _measure(fmt: str, mode: str, path: str, out: "mp.Queue") -> None:
+    base = _rss_mb()
+    t0 = time.perf_counter()
+    if fmt == "json":
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        rows = payload.get("events") or payload.get("chunks") or []
+        key = "t_start" if "events" in payload else "ts_start"
+        total = sum(r[key] for r in rows)
+        if mode == "scan":
+            total += sum(len(r["text"]) for r in rows)
+    else:
+        art = open_columnar(Path(path))
+        key = "t_start" if art.kind == "events" else "ts_start"
+        total = float(art[key].sum())
+        if mode == "scan":
+            total += sum(len(t) for t in art.iter_text())
+    dt = time.perf_counter() - t0
+    out.put({"format": fmt, "mode": mode, "seconds": dt, "rss_delta_mb": _rss_mb() - base, "check": total})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("json_path", type=Path, help="events.json or chunks.json")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    vrc_path = json_to_columnar(args.json_path)
+    print(f"json: {args.json_path.stat().st_size / 1e6:.1f} MB, vrc: {vrc_path.stat().st_size / 1e6:.1f} MB")
+    print(f"{'format':>9} {'mode':>8} {'best_ms':>9} {'rss_mb':>8}")
+
+    ctx = mp.get_context("spawn")
+    for fmt, path in (("json", args.json_path), ("columnar", vrc_path)):
+        for mode in ("columns", "scan"):
+            runs = []
+            for _ in range(args.repeat):
+                q = ctx.Queue()
+                p = ctx.Process(target=_measure, args=(fmt, mode, str(path), q))
+                p.start()
+                runs.append(q.get())
+                p.join()
+            best = min(runs, key=lambda r: r["seconds"])
+            print(f"{fmt:>9} {mode:>8} {best['seconds'] * 1000:>9.1f} {best['rss_delta_mb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Real-time factor of the CPU ASR backend against worker count.
+
+    python -m benchmarks.asr_rtf data/raw/<video_id>/video.mp4 --workers 1,2,4,8
+
+RTF = wall time / audio duration (lower is better; < 1 is faster than
+real time). Model load is timed separately from transcription.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from videorag.pipeline.asr_backends import SAMPLE_RATE, CpuWhisperBackend
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", type=Path, help="Audio/video file to transcribe.")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts.")
+    parser.add_argument("--model", default="large-v2")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--seconds", type=float, default=0.0, help="Only use the first N seconds.")
+    parser.add_argument("--json", type=Path, help="Also write results to this file.")
+    args = parser.parse_args()
+
+    probe = CpuWhisperBackend(model_name=args.model)
+    audio = probe.load_audio(args.input)
+    if args.seconds > 0:
+        audio = audio[: int(args.seconds * SAMPLE_RATE)]
+    duration = len(audio) / SAMPLE_RATE
+
+    cores = os.cpu_count() or 1
+    print(f"audio: {duration:.1f}s, cores: {cores}, model: {args.model} ({args.compute_type})")
+    print(f"{'workers':>8} {'threads/w':>9} {'load_s':>8} {'asr_s':>8} {'rtf':>7} {'segments':>9}")
+
+    results = []
+    for n in [int(x) for x in args.workers.split(",") if x.strip()]:
+        backend = CpuWhisperBackend(
+            model_name=args.model, workers=n, compute_type=args.compute_type
+        )
+        t0 = time.perf_counter()
+        backend.open()
+        # Force model load in every worker before timing transcription.
+        backend.transcribe_audio(audio[: SAMPLE_RATE], language=args.language)
+        load_s = time.perf_counter() - t0
+
+        t1 = time.perf_counter()
+        segments = backend.transcribe_audio(audio, language=args.language)
+        asr_s = time.perf_counter() - t1
+        backend.close()
+
+        row = {
+            "workers": n,
+            "threads_per_worker": max(1, cores // n),
+            "load_s": round(load_s, 3),
+            "asr_s": round(asr_s, 3),
+            "audio_s": round(duration, 3),
+            "rtf": round(asr_s / duration, 4) if duration else None,
+            "segments": len(segments),
+        }
+        results.append(row)
+        print(
+            f"{n:>8} {row['threads_per_worker']:>9} {load_s:>8.1f} {asr_s:>8.1f} "
+            f"{row['rtf']:>7.3f} {len(segments):>9}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Import-time budgets of the videorag CLI, measured with `python -X importtime`.
+
+    python -m benchmarks.cli_import_time
+    python -m benchmarks.cli_import_time --scale 2 --json cli_import.json
+
+Each check runs in a fresh interpreter and fails when the cumulative
+import time of its target module exceeds the budget, or when it loads a
+module that belongs to another stage (ASR, tokenizer, embedder, database).
+Exits 1 on any failure, so it can gate CI like a test.
+
+Budgets are for a warm disk on a laptop; --scale multiplies them for
+slower machines.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+ASR = ("mlx_whisper", "whisperx", "torch", "torchaudio")
+TOKENIZER = ("tiktoken",)
+EMBEDDER = ("sentence_transformers",)
+DATABASE = ("sqlalchemy", "psycopg")
+
+
+@dataclass(frozen=True)
+class Check:
+    name: str
+    # Code run with -X importtime; `target` is the module whose cumulative
+    # time is compared against budget_ms.
+    code: str
+    target: str
+    budget_ms: float
+    forbidden: Tuple[str, ...] = ()
+
+
+CHECKS: List[Check] = [
+    # Building the parser (what `videorag --help` and every subcommand pay).
+    Check("cli", "import videorag.cli; videorag.cli.build_parser()", "videorag.cli", 30.0,
+          ASR + TOKENIZER + EMBEDDER + DATABASE + ("numpy",)),
+    # What each subcommand imports once it runs.
+    Check("events", "import videorag.pipeline.events_builder", "videorag.pipeline.events_builder", 250.0,
+          ASR + EMBEDDER + DATABASE),
+    Check("chunk", "import videorag.pipeline.chunk_events", "videorag.pipeline.chunk_events", 300.0,
+          ASR + EMBEDDER + DATABASE),
+    Check("embed", "import videorag.pipeline.embeddings", "videorag.pipeline.embeddings", 300.0,
+          ASR + TOKENIZER + DATABASE),
+    Check("index", "import videorag.db.indexing", "videorag.db.indexing", 600.0,
+          ASR + TOKENIZER + EMBEDDER),
+    Check("run", "import videorag.pipeline.batch", "videorag.pipeline.batch", 100.0,
+          ASR + TOKENIZER + EMBEDDER + DATABASE + ("numpy",)),
+]
+
+
+@dataclass
+class Result:
+    name: str
+    target_ms: float
+    budget_ms: float
+    total_ms: float
+    loaded_forbidden: List[str] = field(default_factory=list)
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and not self.loaded_forbidden and self.target_ms <= self.budget_ms
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Cumulative import time in ms per module from -X importtime output."""
+    out: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        out[name.strip()] = int(cumulative) / 1000
+    return out
+
+
+def run_check(check: Check, *, scale: float = 1.0) -> Result:
+    budget = check.budget_ms * scale
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check.code],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    times = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        err = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+        return Result(check.name, 0.0, budget, 0.0, error=err)
+    top_level = {name.split(".")[0] for name in times}
+    return Result(
+        name=check.name,
+        target_ms=times.get(check.target, 0.0),
+        budget_ms=budget,
+        total_ms=sum(ms for name, ms in times.items() if "." not in name),
+        loaded_forbidden=sorted(m for m in check.forbidden if m in top_level),
+    )
+
+
+def run_checks(checks: Sequence[Check], *, scale: float = 1.0, repeat: int = 1) -> List[Result]:
+    """Best of `repeat` runs per check; forbidden imports fail on any run."""
+    results: List[Result] = []
+    for check in checks:
+        runs = [run_check(check, scale=scale) for _ in range(repeat)]
+        best = min(runs, key=lambda r: (bool(r.error), r.target_ms))
+        best.loaded_forbidden = sorted({m for r in runs for m in r.loaded_forbidden})
+        results.append(best)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget by this.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per check (best is kept).")
+    parser.add_argument("--json", type=Path, help="Also write results to this file.")
+    args = parser.parse_args()
+
+    results = run_checks(CHECKS, scale=args.scale, repeat=args.repeat)
+    print(f"{'check':>10} {'import_ms':>10} {'budget_ms':>10}  status")
+    for r in results:
+        status = "ok" if r.ok else "FAIL"
+        if r.loaded_forbidden:
+            status += f" (loaded {', '.join(r.loaded_forbidden)})"
+        if r.error:
+            status += f" ({r.error})"
+        print(f"{r.name:>10} {r.target_ms:>10.1f} {r.budget_ms:>10.1f}  {status}")
+
+    if args.json:
+        args.json.write_text(
+            json.dumps([{**asdict(r), "ok": r.ok} for r in results], indent=2), encoding="utf-8"
+        )
+    if not all(r.ok for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare two benchmark result files (e.g. from two commits) and fail on regressions.
+
+    python -m benchmarks.compare before.json after.json
+    python -m benchmarks.compare before.json after.json --threshold 0.15 --metrics wall_s,peak_rss_mb,output_bytes
+
+Rows are matched by key (duration/stage/backend for pipeline_scale). A
+row regresses when a metric grew by more than --threshold relative to the
+base; rows whose base wall time is under --min-wall-s are reported but
+never fail (too noisy). Exits 1 on any regression.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+DEFAULT_METRICS = ("wall_s", "peak_rss_mb", "output_bytes")
+
+
+def load_results(path: Path) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    return doc.get("meta", {}), {row["key"]: row for row in doc["results"]}
+
+
+def compare(
+    base: Dict[str, Dict[str, Any]],
+    new: Dict[str, Dict[str, Any]],
+    *,
+    metrics: Sequence[str] = DEFAULT_METRICS,
+    threshold: float = 0.10,
+    min_wall_s: float = 0.05,
+) -> List[Dict[str, Any]]:
+    """One entry per (key, metric) present in both files, with the relative change."""
+    out: List[Dict[str, Any]] = []
+    for key in (k for k in new if k in base):
+        b, n = base[key], new[key]
+        noisy = b.get("wall_s", 0.0) < min_wall_s
+        for metric in metrics:
+            if metric not in b or metric not in n:
+                continue
+            before, after = float(b[metric]), float(n[metric])
+            change = (after - before) / before if before else (0.0 if after == before else float("inf"))
+            out.append(
+                {
+                    "key": key,
+                    "metric": metric,
+                    "base": before,
+                    "new": after,
+                    "change": change,
+                    "regressed": change > threshold and not (noisy and metric == "wall_s"),
+                }
+            )
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative increase (0.10 = +10%%).")
+    parser.add_argument("--metrics", default=",".join(DEFAULT_METRICS), help="Comma-separated result fields.")
+    parser.add_argument("--min-wall-s", type=float, default=0.05, help="Ignore wall-time changes of faster rows.")
+    args = parser.parse_args()
+
+    base_meta, base = load_results(args.base)
+    new_meta, new = load_results(args.new)
+    rows = compare(
+        base,
+        new,
+        metrics=[m.strip() for m in args.metrics.split(",") if m.strip()],
+        threshold=args.threshold,
+        min_wall_s=args.min_wall_s,
+    )
+
+    print(f"base {base_meta.get('commit') or args.base}  ->  new {new_meta.get('commit') or args.new}")
+    print(f"{'key':<28} {'metric':<14} {'base':>12} {'new':>12} {'change':>9}")
+    for r in rows:
+        flag = "  REGRESSION" if r["regressed"] else ""
+        print(f"{r['key']:<28} {r['metric']:<14} {r['base']:>12.4g} {r['new']:>12.4g} {r['change']:>+9.1%}{flag}")
+
+    missing = sorted(set(base) - set(new))
+    if missing:
+        print(f"not in new results: {', '.join(missing)}")
+    regressions = [r for r in rows if r["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
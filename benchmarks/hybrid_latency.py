@@ -0,0 +1,123 @@
+"""
+Per-component latency of hybrid (full-text + vector) search against a p95 budget.
+
+    PGPORT=5431 PGPASSWORD=postgres python -m benchmarks.hybrid_latency --budget-ms 150
+
+Queries come from --queries (one per line) or are sampled from indexed
+chunk text. Reports p50/p95 of embed, db, fuse and total, plus lexical and
+vector run on their own (profile mode), and exits 1 if total p95 exceeds
+the budget. --async measures hybrid_search_async (components fanned out
+on the async pool) instead.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import text
+
+from videorag.db.session import db_session
+from videorag.retrieval.ann_index import SearchParams
+from videorag.retrieval.hybrid import HybridConfig, hybrid_search, hybrid_search_async
+
+
+def _sample_queries(n: int, seed: int) -> List[str]:
+    with db_session() as session:
+        texts = session.execute(
+            text("SELECT text FROM chunks ORDER BY random() LIMIT :n"), {"n": n}
+        ).scalars().all()
+    rng = random.Random(seed)
+    queries = []
+    for t in texts:
+        words = t.split()
+        if not words:
+            continue
+        start = rng.randrange(max(1, len(words) - 4))
+        queries.append(" ".join(words[start : start + rng.randint(2, 5)]))
+    return queries
+
+
+async def _run_async(
+    queries: List[str], k: int, cfg: HybridConfig, params: SearchParams
+) -> Dict[str, List[float]]:
+    from videorag.db.session import dispose_async_engine
+
+    samples: Dict[str, List[float]] = {}
+    try:
+        await hybrid_search_async(queries[0], k, cfg=cfg, params=params)  # warm-up
+        for q in queries:
+            result = await hybrid_search_async(q, k, cfg=cfg, params=params)
+            for name, ms in result.timings.items():
+                samples.setdefault(name, []).append(ms)
+    finally:
+        await dispose_async_engine()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=Path, help="File with one query per line.")
+    parser.add_argument("-n", type=int, default=200, help="Sampled queries if --queries is not given.")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--candidates", type=int, default=HybridConfig.candidates)
+    parser.add_argument("--lexical-weight", type=float, default=HybridConfig.lexical_weight)
+    parser.add_argument("--vector-weight", type=float, default=HybridConfig.vector_weight)
+    parser.add_argument("--ef-search", type=int, default=SearchParams.ef_search)
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="p95 budget for total latency.")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use hybrid_search_async.")
+    parser.add_argument("--json", type=Path, help="Also write results to this file.")
+    args = parser.parse_args()
+
+    if args.queries:
+        queries = [q.strip() for q in args.queries.read_text(encoding="utf-8").splitlines() if q.strip()]
+    else:
+        queries = _sample_queries(args.n, seed=0)
+    if not queries:
+        print("No queries.")
+        return
+
+    cfg = HybridConfig(
+        candidates=args.candidates,
+        lexical_weight=args.lexical_weight,
+        vector_weight=args.vector_weight,
+    )
+    params = SearchParams(ef_search=args.ef_search)
+
+    samples: Dict[str, List[float]] = {}
+    if args.use_async:
+        samples = asyncio.run(_run_async(queries, args.k, cfg, params))
+    else:
+        hybrid_search(queries[0], args.k, cfg=cfg, params=params)  # warm-up (model load, pool)
+        for q in queries:
+            result = hybrid_search(q, args.k, cfg=cfg, params=params, profile=True)
+            for name, ms in result.timings.items():
+                samples.setdefault(name, []).append(ms)
+
+    summary = {
+        name: {"p50_ms": float(np.percentile(v, 50)), "p95_ms": float(np.percentile(v, 95))}
+        for name, v in samples.items()
+    }
+    print(f"{len(queries)} queries, k={args.k}, candidates={args.candidates}")
+    print(f"{'component':>10} {'p50_ms':>8} {'p95_ms':>8}")
+    for name in ("embed", "lexical", "vector", "db", "fuse", "total"):
+        if name in summary:
+            print(f"{name:>10} {summary[name]['p50_ms']:>8.2f} {summary[name]['p95_ms']:>8.2f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    p95 = summary["total"]["p95_ms"]
+    if p95 > args.budget_ms:
+        print(f"OVER BUDGET: total p95 {p95:.1f} ms > {args.budget_ms:.1f} ms")
+        sys.exit(1)
+    print(f"within budget: total p95 {p95:.1f} ms <= {args.budget_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Queries per second of the in-process vector index against corpus size.
+
+    python -m benchmarks.local_index_qps --sizes 10000,100000,1000000
+
+Builds a synthetic clustered corpus per size in a temp directory and
+measures exact search one query at a time, exact search in batches, and
+IVF search per n_probe (with recall@k against exact). No database needed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from videorag.pipeline.embeddings import EMBEDDING_DIM
+from videorag.retrieval.local_index import LocalIndex
+
+
+def _corpus(rows: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    x = centers[rng.integers(0, clusters, rows)] + 0.5 * rng.standard_normal((rows, dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def _qps(fn, n_queries: int) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return n_queries / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--videos", type=int, default=100, help="Videos the corpus is split into.")
+    parser.add_argument("--queries", type=int, default=256)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--n-probe", default="4,16,64")
+    parser.add_argument("--dtype", choices=("float32", "float16"), default="float32")
+    parser.add_argument("--json", type=Path, help="Also write results to this file.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    results: List[Dict] = []
+    print(f"{'rows':>9} {'mode':>12} {'qps':>10} {'recall':>7}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        corpus = _corpus(size, EMBEDDING_DIM, max(1, size // 500), rng)
+        picks = corpus[rng.integers(0, size, args.queries)]
+        queries = picks + 0.1 * rng.standard_normal(picks.shape).astype(np.float32)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index = LocalIndex(Path(tmp))
+            per_video = -(-size // args.videos)
+            for v, a in enumerate(range(0, size, per_video)):
+                block = corpus[a : a + per_video]
+                n = len(block)
+                index.add(
+                    f"bench_{v}",
+                    block,
+                    chunk_ids=range(n),
+                    ts_start=np.arange(n) * 30.0,
+                    ts_end=np.arange(n) * 30.0 + 30.0,
+                    model="synthetic",
+                    dtype=args.dtype,
+                )
+
+            truth = index.search_vectors(queries, k=args.k)
+
+            def one_by_one() -> None:
+                for q in queries:
+                    index.search_vectors(q[None, :], k=args.k)
+
+            def batched() -> None:
+                for i in range(0, len(queries), args.batch):
+                    index.search_vectors(queries[i : i + args.batch], k=args.k)
+
+            rows = [
+                ("exact/1", _qps(one_by_one, len(queries)), 1.0),
+                (f"exact/{args.batch}", _qps(batched, len(queries)), 1.0),
+            ]
+
+            index.build_ivf()
+            for n_probe in [int(p) for p in args.n_probe.split(",")]:
+                out: List = []
+                qps = _qps(
+                    lambda: out.extend(index.search_vectors(queries, k=args.k, n_probe=n_probe)),
+                    len(queries),
+                )
+                recall = float(
+                    np.mean([len({r for r, _ in a} & {r for r, _ in t}) / max(1, len(t)) for a, t in zip(out, truth)])
+                )
+                rows.append((f"ivf/{n_probe}", qps, recall))
+
+        for mode, qps, recall in rows:
+            print(f"{size:>9} {mode:>12} {qps:>10.0f} {recall:>7.3f}")
+            results.append({"rows": size, "mode": mode, "qps": qps, "recall": recall})
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
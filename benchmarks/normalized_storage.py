@@ -0,0 +1,196 @@
+"""
+Storage size and read latency of inline chunk text vs the normalized
+(events + chunk spans) layout, on real videos.
+
+    python -m benchmarks.normalized_storage 'lecture_*'
+    PGPORT=5431 PGPASSWORD=postgres python -m benchmarks.normalized_storage --db
+
+Files: chunks.json as written today vs chunks.json with text_layout
+"events" (the events file exists in both layouts and is reported apart),
+and the time to load each, text included.
+
+--db: bytes of the videos' rows in `chunks` (text column) vs `events` +
+`chunk_spans`, and the latency of fetching the text of k random chunks
+from chunks.text, from the chunk_span_texts view and with
+normalized.chunk_texts(). Writes the videos to the normalized tables first;
+`chunks` must already be indexed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from videorag.input.paths import video_paths
+from videorag.pipeline.batch import resolve_video_ids
+from videorag.pipeline.columnar import load_payload
+
+
+def _best_ms(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def _files(video_ids: Sequence[str], repeat: int) -> Dict[str, float]:
+    totals = {"inline_bytes": 0, "spans_bytes": 0, "events_bytes": 0, "chunk_chars": 0, "event_chars": 0}
+    inline_ms = spans_ms = 0.0
+    tmp = Path(tempfile.mkdtemp(prefix="normalized_"))
+    try:
+        for video_id in video_ids:
+            paths = video_paths(video_id, artifact_format="json")
+            payload = load_payload(paths.chunks_path)
+            events = load_payload(paths.events_path)
+
+            out = tmp / video_id
+            out.mkdir()
+            shutil.copy(paths.events_path, out / "events.json")
+            inline = out / "chunks.json"
+            inline.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            spans_payload = {
+                **payload,
+                "text_layout": "events",
+                "chunks": [{k: v for k, v in ch.items() if k != "text"} for ch in payload["chunks"]],
+            }
+            spans = out / "spans" / "chunks.json"
+            spans.parent.mkdir()
+            shutil.copy(paths.events_path, spans.parent / "events.json")
+            spans.write_text(json.dumps(spans_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+            totals["inline_bytes"] += inline.stat().st_size
+            totals["spans_bytes"] += spans.stat().st_size
+            totals["events_bytes"] += paths.events_path.stat().st_size
+            totals["chunk_chars"] += sum(len(ch["text"]) for ch in payload["chunks"])
+            totals["event_chars"] += sum(len(e.get("text") or "") for e in events.get("events", []))
+            inline_ms += _best_ms(lambda: load_payload(inline), repeat)
+            spans_ms += _best_ms(lambda: load_payload(spans), repeat)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {**totals, "inline_load_ms": inline_ms, "spans_load_ms": spans_ms}
+
+
+def _db(video_ids: Sequence[str], k: int, samples: int, rng: random.Random) -> Dict[str, float]:
+    from sqlalchemy import text
+
+    from videorag.db.normalized import chunk_texts, index_normalized_video
+    from videorag.db.session import db_session
+
+    for video_id in video_ids:
+        paths = video_paths(video_id)
+        index_normalized_video(video_id=video_id, chunks_path=paths.chunks_path, events_path=paths.events_path)
+
+    with db_session() as session:
+        session.execute(text("ANALYZE events"))
+        session.execute(text("ANALYZE chunk_spans"))
+        sizes = session.execute(
+            text(
+                """
+                SELECT
+                  (SELECT coalesce(sum(pg_column_size(text)), 0) FROM chunks WHERE video_id = ANY(:v)),
+                  (SELECT coalesce(sum(pg_column_size(e.*)), 0) FROM events e WHERE video_id = ANY(:v)),
+                  (SELECT coalesce(sum(pg_column_size(s.*)), 0) FROM chunk_spans s WHERE video_id = ANY(:v))
+                """
+            ),
+            {"v": list(video_ids)},
+        ).one()
+        keys: List[Tuple[str, int]] = [
+            (r.video_id, int(r.chunk_id))
+            for r in session.execute(
+                text("SELECT video_id, chunk_id FROM chunk_spans WHERE video_id = ANY(:v)"), {"v": list(video_ids)}
+            )
+        ]
+
+    def inline(sample):
+        with db_session() as session:
+            session.execute(
+                text(
+                    "SELECT c.text FROM chunks c JOIN unnest(CAST(:v AS text[]), CAST(:c AS integer[])) "
+                    "AS k(video_id, chunk_id) ON c.video_id = k.video_id AND c.chunk_id = k.chunk_id"
+                ),
+                {"v": [s[0] for s in sample], "c": [s[1] for s in sample]},
+            ).all()
+
+    def view(sample):
+        with db_session() as session:
+            session.execute(
+                text(
+                    "SELECT t.text FROM chunk_span_texts t JOIN unnest(CAST(:v AS text[]), CAST(:c AS integer[])) "
+                    "AS k(video_id, chunk_id) ON t.video_id = k.video_id AND t.chunk_id = k.chunk_id"
+                ),
+                {"v": [s[0] for s in sample], "c": [s[1] for s in sample]},
+            ).all()
+
+    latencies: Dict[str, List[float]] = {"inline": [], "view": [], "batch": []}
+    for _ in range(samples):
+        sample = rng.sample(keys, min(k, len(keys)))
+        for name, fn in (("inline", inline), ("view", view), ("batch", chunk_texts)):
+            t0 = time.perf_counter()
+            fn(sample)
+            latencies[name].append((time.perf_counter() - t0) * 1000)
+
+    out: Dict[str, float] = {
+        "pg_chunks_text_bytes": float(sizes[0]),
+        "pg_events_bytes": float(sizes[1]),
+        "pg_chunk_spans_bytes": float(sizes[2]),
+    }
+    for name, lat in latencies.items():
+        out[f"{name}_p50_ms"] = float(np.percentile(lat, 50))
+        out[f"{name}_p95_ms"] = float(np.percentile(lat, 95))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("videos", nargs="*", help="Video IDs or glob patterns (default: all).")
+    parser.add_argument("--repeat", type=int, default=3, help="File loads per layout (best is kept).")
+    parser.add_argument("--db", action="store_true", help="Also measure the Postgres tables.")
+    parser.add_argument("-k", type=int, default=10, help="Chunks fetched per DB read.")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--json", type=Path, help="Also write results to this file.")
+    args = parser.parse_args()
+
+    video_ids = [
+        v for v in resolve_video_ids(args.videos)
+        if video_paths(v, artifact_format="json").chunks_path.exists()
+        and video_paths(v, artifact_format="json").events_path.exists()
+    ]
+    if not video_ids:
+        print("No videos with events.json and chunks.json.")
+        return
+
+    results: Dict[str, float] = {"videos": len(video_ids)}
+    results.update(_files(video_ids, args.repeat))
+    dup = 1 - results["event_chars"] / results["chunk_chars"] if results["chunk_chars"] else 0.0
+    print(f"{len(video_ids)} video(s); {dup:.1%} of inline chunk text is overlap")
+    print(f"{'layout':>8} {'chunks_MB':>10} {'events_MB':>10} {'load_ms':>9}")
+    print(f"{'inline':>8} {results['inline_bytes'] / 1e6:>10.2f} {results['events_bytes'] / 1e6:>10.2f} "
+          f"{results['inline_load_ms']:>9.1f}")
+    print(f"{'events':>8} {results['spans_bytes'] / 1e6:>10.2f} {results['events_bytes'] / 1e6:>10.2f} "
+          f"{results['spans_load_ms']:>9.1f}")
+
+    if args.db:
+        results.update(_db(video_ids, args.k, args.samples, random.Random(0)))
+        print(
+            f"postgres: chunks.text {results['pg_chunks_text_bytes'] / 1e6:.2f} MB vs "
+            f"events {results['pg_events_bytes'] / 1e6:.2f} MB + spans {results['pg_chunk_spans_bytes'] / 1e6:.2f} MB"
+        )
+        print(f"{'read':>8} {'p50_ms':>8} {'p95_ms':>8}   (k={args.k})")
+        for name in ("inline", "view", "batch"):
+            print(f"{name:>8} {results[f'{name}_p50_ms']:>8.2f} {results[f'{name}_p95_ms']:>8.2f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Latency and recall@k of pgvector ANN search against exact search.
+
+    docker compose up -d db
+    PGPORT=5431 PGPASSWORD=postgres python -m benchmarks.retrieval_ann --rows 100000
+
+Loads a synthetic clustered corpus into `chunks` (video_ids "bench_*"),
+computes exact top-k with the index disabled, then builds each index kind
+and sweeps its search parameter. Rebuilds the ANN index on `chunks`, so
+run it against a scratch database. Synthetic rows are deleted at the end
+unless --keep.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy import text
+
+from videorag.db.indexing import vector_literal
+from videorag.db.session import db_session, get_engine
+from videorag.pipeline.embeddings import EMBEDDING_DIM
+from videorag.retrieval.ann_index import AnnIndexConfig, SearchParams, create_ann_index, drop_ann_index
+from videorag.retrieval.search import PostgresBackend
+
+BENCH_PREFIX = "bench_"
+
+
+def _corpus(rows: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    x = centers[rng.integers(0, clusters, rows)] + 0.5 * rng.standard_normal((rows, dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def _load(vectors: np.ndarray, videos: int) -> None:
+    raw = get_engine().raw_connection()
+    try:
+        conn = raw.driver_connection
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM chunks WHERE video_id LIKE %s", (BENCH_PREFIX + "%",))
+            with cur.copy(
+                "COPY chunks (video_id, chunk_id, ts_start, ts_end, text, embedding) FROM STDIN"
+            ) as copy:
+                for i, v in enumerate(vectors):
+                    ts = float((i // videos) * 30)
+                    copy.write_row(
+                        (f"{BENCH_PREFIX}{i % videos}", i // videos, ts, ts + 30.0, f"chunk {i}", vector_literal(v))
+                    )
+        conn.commit()
+    finally:
+        raw.close()
+
+
+def _run(backend: PostgresBackend, queries: np.ndarray, k: int, video_ids) -> tuple[List[float], List[List]]:
+    latencies, results = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        hits = backend.search_vector(q, k=k, video_ids=video_ids)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        results.append([(h.video_id, h.chunk_id) for h in hits])
+    return latencies, results
+
+
+def _recall(results: Sequence[List], truth: Sequence[List], k: int) -> float:
+    return float(np.mean([len(set(r) & set(t)) / max(1, min(k, len(t))) for r, t in zip(results, truth)]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--videos", type=int, default=100)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--ef-search", default="10,20,40,80,160")
+    parser.add_argument("--probes", default="1,5,10,20,40")
+    parser.add_argument("--filtered", action="store_true", help="Restrict every query to one video.")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic rows.")
+    parser.add_argument("--json", type=Path, help="Also write results to this file.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    corpus = _corpus(args.rows, EMBEDDING_DIM, args.clusters, rng)
+    picks = corpus[rng.integers(0, args.rows, args.queries)]
+    queries = picks + 0.1 * rng.standard_normal(picks.shape).astype(np.float32)
+    video_ids = [f"{BENCH_PREFIX}0"] if args.filtered else [f"{BENCH_PREFIX}{i}" for i in range(args.videos)]
+
+    t0 = time.perf_counter()
+    _load(corpus, args.videos)
+    with db_session() as session:
+        session.execute(text("ANALYZE chunks"))
+    print(f"loaded {args.rows} rows in {time.perf_counter() - t0:.1f}s")
+
+    exact_lat, truth = _run(PostgresBackend(SearchParams(exact=True)), queries, args.k, video_ids)
+    results: List[Dict] = [
+        {"index": "exact", "param": None, "p50_ms": float(np.percentile(exact_lat, 50)),
+         "p95_ms": float(np.percentile(exact_lat, 95)), "recall": 1.0, "build_s": 0.0}
+    ]
+
+    sweeps = (
+        ("hnsw", [int(x) for x in args.ef_search.split(",")], lambda v: SearchParams(ef_search=v)),
+        ("ivfflat", [int(x) for x in args.probes.split(",")], lambda v: SearchParams(probes=v)),
+    )
+    try:
+        for kind, values, make_params in sweeps:
+            cfg = AnnIndexConfig(kind=kind, lists=max(1, args.rows // 1000))
+            t0 = time.perf_counter()
+            create_ann_index(cfg)
+            build_s = time.perf_counter() - t0
+            for v in values:
+                lat, res = _run(PostgresBackend(make_params(v)), queries, args.k, video_ids)
+                results.append(
+                    {"index": kind, "param": v, "p50_ms": float(np.percentile(lat, 50)),
+                     "p95_ms": float(np.percentile(lat, 95)), "recall": _recall(res, truth, args.k),
+                     "build_s": build_s}
+                )
+            drop_ann_index(kind)
+    finally:
+        if not args.keep:
+            with db_session() as session:
+                session.execute(
+                    text("DELETE FROM chunks WHERE video_id LIKE :p"), {"p": BENCH_PREFIX + "%"}
+                )
+
+    print(f"{'index':>8} {'param':>6} {'p50_ms':>8} {'p95_ms':>8} {f'recall@{args.k}':>10} {'build_s':>8}")
+    for r in results:
+        param = "-" if r["param"] is None else r["param"]
+        print(
+            f"{r['index']:>8} {param:>6} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+            f"{r['recall']:>10.3f} {r['build_s']:>8.1f}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
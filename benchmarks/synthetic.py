@@ -0,0 +1,174 @@
+"""
+Synthetic long-form transcripts (transcript_segments.json) for scale benchmarks.
+
+    python -m benchmarks.synthetic --duration 20h --out /tmp/bench/derived
+    python -m benchmarks.synthetic --duration 90m --segment-seconds 3 --words-per-second 3.2
+
+Segments follow ASR output: lognormal lengths around --segment-seconds,
+short pauses between them, a few empty segments (silence / music) and
+text drawn from a Zipf-distributed pseudo-word vocabulary with some
+numbers and punctuation, so tokens per word vary like real speech (common
+words are short and one token, rare ones are long and split). The same
+seed and parameters always give byte-identical files.
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import json
+import math
+import random
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+_SYLLABLES = [c + v for c in "bcdfghklmnprstvwz" for v in "aeiou"] + ["th", "sh", "ch", "qu", "str", "pl"]
+
+
+@dataclass(frozen=True)
+class TranscriptSpec:
+    duration_s: float
+    seed: int = 0
+    # Median segment length; lengths are lognormal with this sigma.
+    segment_seconds: float = 4.0
+    segment_sigma: float = 0.5
+    # Speech rate (English lectures are ~2.5 words/s).
+    words_per_second: float = 2.5
+    # Vocabulary size and Zipf exponent of word frequencies.
+    vocab_size: int = 20_000
+    zipf: float = 1.1
+    # Share of words that are numbers (several tokens each).
+    number_rate: float = 0.02
+    # Share of segments without text (dropped by the events builder).
+    blank_rate: float = 0.01
+    pause_seconds: float = 0.15
+
+
+def parse_duration(value: str) -> float:
+    """'90s', '45m', '1h30m', '20h' or plain seconds -> seconds."""
+    value = value.strip().lower()
+    if re.fullmatch(r"\d+(\.\d+)?", value):
+        return float(value)
+    parts = re.findall(r"(\d+(?:\.\d+)?)([hms])", value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        raise ValueError(f"Invalid duration '{value}' (e.g. 90s, 45m, 1h30m, 20h)")
+    return sum(float(n) * {"h": 3600, "m": 60, "s": 1}[u] for n, u in parts)
+
+
+def format_duration(seconds: float) -> str:
+    """Inverse of parse_duration for labels: 60 -> '1m', 5400 -> '1h30m'."""
+    seconds = int(round(seconds))
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return "".join(f"{n}{u}" for n, u in ((h, "h"), (m, "m"), (s, "s")) if n) or "0s"
+
+
+def _vocabulary(size: int, rng: random.Random) -> List[str]:
+    # Frequent words get fewer syllables (Zipf's law of abbreviation).
+    words: List[str] = []
+    seen = set()
+    while len(words) < size:
+        rank = len(words) + 1
+        n_syl = 1 + min(5, int(math.log10(rank + 1) + rng.random() * 1.5))
+        word = "".join(rng.choice(_SYLLABLES) for _ in range(n_syl))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+class _WordSampler:
+    def __init__(self, spec: TranscriptSpec, rng: random.Random) -> None:
+        self.rng = rng
+        self.spec = spec
+        self.vocab = _vocabulary(spec.vocab_size, rng)
+        weights = [1.0 / (rank ** spec.zipf) for rank in range(1, spec.vocab_size + 1)]
+        self.cum = list(itertools.accumulate(weights))
+
+    def word(self) -> str:
+        if self.rng.random() < self.spec.number_rate:
+            return str(self.rng.randint(0, 10 ** self.rng.randint(1, 6)))
+        i = bisect.bisect_left(self.cum, self.rng.random() * self.cum[-1])
+        return self.vocab[min(i, len(self.vocab) - 1)]
+
+    def sentence(self, n_words: int) -> str:
+        words = [self.word() for _ in range(max(1, n_words))]
+        words[0] = words[0].capitalize()
+        out = []
+        for i, w in enumerate(words):
+            out.append(w)
+            if i < len(words) - 1 and self.rng.random() < 0.06:
+                out[-1] += ","
+        return " ".join(out) + self.rng.choice([".", ".", ".", "?", "!"])
+
+
+def synthetic_transcript(spec: TranscriptSpec, *, video_id: str) -> Dict[str, Any]:
+    """A transcript_segments.json payload covering spec.duration_s seconds."""
+    rng = random.Random(spec.seed)
+    words = _WordSampler(spec, rng)
+    mu = math.log(spec.segment_seconds)
+
+    segments: List[Dict[str, Any]] = []
+    t = 0.0
+    while t < spec.duration_s:
+        length = min(rng.lognormvariate(mu, spec.segment_sigma), spec.duration_s - t)
+        if length < 0.2:
+            break
+        if rng.random() < spec.blank_rate:
+            text = ""
+        else:
+            n = max(1, round(length * spec.words_per_second * rng.uniform(0.7, 1.3)))
+            text = " " + words.sentence(n)  # whisper-style leading space
+        segments.append({"start": round(t, 3), "end": round(t + length, 3), "text": text})
+        t += length + rng.expovariate(1.0 / spec.pause_seconds)
+    return {"video_id": video_id, "segments": segments}
+
+
+def write_synthetic_video(
+    video_id: str,
+    spec: TranscriptSpec,
+    *,
+    derived_root: Path,
+) -> Path:
+    """Write derived_root/<video_id>/transcript_segments.json (plus the spec used) and return its path."""
+    out_dir = derived_root / video_id
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / "transcript_segments.json"
+    path.write_text(json.dumps(synthetic_transcript(spec, video_id=video_id), ensure_ascii=False), encoding="utf-8")
+    (out_dir / "synthetic_spec.json").write_text(json.dumps(asdict(spec), indent=2), encoding="utf-8")
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", default="1h", help="e.g. 1m, 90m, 20h.")
+    parser.add_argument("--video-id", help="Default: synthetic_<duration>.")
+    parser.add_argument("--out", type=Path, default=Path("data/derived"), help="Derived root to write into.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--segment-seconds", type=float, default=TranscriptSpec.segment_seconds)
+    parser.add_argument("--segment-sigma", type=float, default=TranscriptSpec.segment_sigma)
+    parser.add_argument("--words-per-second", type=float, default=TranscriptSpec.words_per_second)
+    parser.add_argument("--vocab-size", type=int, default=TranscriptSpec.vocab_size)
+    parser.add_argument("--zipf", type=float, default=TranscriptSpec.zipf)
+    args = parser.parse_args()
+
+    duration = parse_duration(args.duration)
+    spec = TranscriptSpec(
+        duration_s=duration,
+        seed=args.seed,
+        segment_seconds=args.segment_seconds,
+        segment_sigma=args.segment_sigma,
+        words_per_second=args.words_per_second,
+        vocab_size=args.vocab_size,
+        zipf=args.zipf,
+    )
+    video_id = args.video_id or f"synthetic_{format_duration(duration)}"
+    path = write_synthetic_video(video_id, spec, derived_root=args.out)
+    n = len(json.loads(path.read_text(encoding="utf-8"))["segments"])
+    print(f"Wrote {n} segments ({format_duration(duration)}) to {path}")
+
+
+if __name__ == "__main__":
+    main()
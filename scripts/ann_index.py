@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+
+from videorag.logging import metered
+from videorag.retrieval.ann_index import (
+    INDEX_KINDS,
+    AnnIndexConfig,
+    create_ann_index,
+    existing_ann_indexes,
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the ANN index on chunks.embedding.")
+    parser.add_argument("--kind", choices=INDEX_KINDS, default=AnnIndexConfig.kind)
+    parser.add_argument("--m", type=int, default=AnnIndexConfig.m, help="HNSW graph degree.")
+    parser.add_argument("--ef-construction", type=int, default=AnnIndexConfig.ef_construction)
+    parser.add_argument("--lists", type=int, default=AnnIndexConfig.lists, help="IVFFlat lists.")
+    parser.add_argument(
+        "--keep-others",
+        action="store_true",
+        help="Do not drop an existing index of the other kind.",
+    )
+    return parser.parse_args()
+
+
+@metered("script.ann_index", export=True)
+def main() -> None:
+    args = _parse_args()
+    cfg = AnnIndexConfig(kind=args.kind, m=args.m, ef_construction=args.ef_construction, lists=args.lists)
+    print(f"Building {cfg.index_name}...")
+    create_ann_index(cfg, drop_others=not args.keep_others)
+    for name, definition in existing_ann_indexes().items():
+        print(f"  {name}: {definition}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+from pathlib import Path
+
+from videorag.logging import metered, setup_logging
+from videorag.pipeline.asr_backends import BACKENDS, get_backend
+from videorag.pipeline.asr_worker import serve, socket_path
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Keep a Whisper model loaded and serve transcription jobs on a Unix socket."
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default=None)
+    parser.add_argument("--model", default="large-v2")
+    parser.add_argument("--workers", type=int, default=0, help="CPU backend worker processes.")
+    parser.add_argument("--socket", type=Path, default=None, help=f"Default: {socket_path()}")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--batch-window", type=float, default=0.5, help="Seconds to collect a batch.")
+    parser.add_argument("--short-clip-seconds", type=float, default=120.0)
+    return parser.parse_args()
+
+
+@metered("script.asr_worker", export=True)
+def main() -> None:
+    args = _parse_args()
+    setup_logging()
+
+    kwargs = {"workers": args.workers} if args.backend == "cpu" or args.workers else {}
+    backend = get_backend(args.backend, model_name=args.model, **kwargs)
+
+    serve(
+        backend,
+        path=args.socket,
+        max_batch=args.max_batch,
+        batch_window=args.batch_window,
+        short_clip_seconds=args.short_clip_seconds,
+    )
+
+
+if __name__ == "__main__":
+    main()
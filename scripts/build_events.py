@@ -1,11 +1,26 @@
+import argparse
 from pathlib import Path
 
 from videorag.input.paths import video_paths
 from videorag.input.select_video import pick_video_id
+from videorag.logging import metered
 from videorag.pipeline.events_builder import build_events_from_asr
+from videorag.pipeline.stage_cache import drain_report, format_report
 
 
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build events.json from a transcript.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute even if the stage cache says the output is up to date.",
+    )
+    return parser.parse_args()
+
+
+@metered("script.build_events", export=True)
 def main() -> None:
+    args = _parse_args()
     video_id = pick_video_id("Select video to build events for")
     paths = video_paths(video_id)
 
@@ -19,7 +34,10 @@ def main() -> None:
         video_id=video_id,
         transcript_segments_path=transcript_path,
         derived_root=Path("data/derived"),
+        artifact_format=paths.artifact_format,
+        force=args.force,
     )
+    print(format_report(drain_report()))
     print(f"Wrote: {out_path}")
 
 
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from videorag.db.bulk_index import DEFAULT_BATCH_VIDEOS, bulk_index_videos
+from videorag.logging import metered
+from videorag.pipeline.batch import resolve_video_ids
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Bulk-index chunks of many videos into Postgres with COPY."
+    )
+    parser.add_argument(
+        "videos",
+        nargs="*",
+        help="Video IDs or glob patterns (default: every video in the registry).",
+    )
+    parser.add_argument(
+        "--batch-videos",
+        type=int,
+        default=DEFAULT_BATCH_VIDEOS,
+        help=f"Videos merged per transaction (default: {DEFAULT_BATCH_VIDEOS}).",
+    )
+    return parser.parse_args()
+
+
+@metered("script.bulk_index", export=True)
+def main() -> None:
+    args = _parse_args()
+    video_ids = resolve_video_ids(args.videos)
+    if not video_ids:
+        print("No videos to index.")
+        return
+
+    result = bulk_index_videos(video_ids, batch_videos=args.batch_videos)
+
+    print(
+        f"Indexed {result.total_rows} chunks from {len(result.rows)} video(s) "
+        f"in {result.batches} batch(es), {result.seconds:.2f}s "
+        f"({result.rows_per_second:.0f} rows/s)."
+    )
+    print(f"  {result.stats}")
+    if result.missing:
+        print(f"No chunks file for {len(result.missing)} video(s): {', '.join(result.missing)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
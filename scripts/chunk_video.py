@@ -1,17 +1,65 @@
+import argparse
 from pathlib import Path
 
 from videorag.input.paths import video_paths
 from videorag.input.select_video import pick_video_id
-from videorag.pipeline.chunk_events import chunk_events_to_file, default_chunking_config
+from videorag.logging import metered
+from videorag.pipeline.chunk_events import (
+    TEXT_LAYOUTS,
+    ChunkingConfig,
+    chunk_events_multi,
+    chunk_events_to_file,
+    default_chunking_config,
+)
+from videorag.pipeline.stage_cache import drain_report, format_report
 
 
+def _parse_config(value: str) -> ChunkingConfig:
+    parts = [int(p) for p in value.split(":")]
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError("expected CHUNK:OVERLAP or CHUNK:OVERLAP:MAX")
+    chunk_tokens, overlap_tokens = parts[:2]
+    max_tokens = parts[2] if len(parts) == 3 else chunk_tokens + chunk_tokens // 4
+    return ChunkingConfig(chunk_tokens=chunk_tokens, overlap_tokens=overlap_tokens, max_tokens=max_tokens)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Chunk events.json into chunks.json.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute even if the stage cache says the output is up to date.",
+    )
+    parser.add_argument(
+        "--config",
+        dest="configs",
+        action="append",
+        type=_parse_config,
+        default=[],
+        metavar="CHUNK:OVERLAP[:MAX]",
+        help=(
+            "Extra chunking config, repeatable (e.g. --config 256:50 --config 1024:200). "
+            "Each is written to chunks.<config-hash>.json in the same pass."
+        ),
+    )
+    parser.add_argument(
+        "--text-layout",
+        choices=TEXT_LAYOUTS,
+        default="inline",
+        help="'events' stores chunks as event ranges only; text is rebuilt from events.json on load.",
+    )
+    return parser.parse_args()
+
+
+@metered("script.chunk_video", export=True)
 def main() -> None:
+    args = _parse_args()
     video_id = pick_video_id("Select video to chunk")
     data_paths = video_paths(video_id)
 
     events_path = data_paths.events_path
     if not events_path.exists():
-        print("events.json not found. Run ASR -> events first.")
+        print(f"{events_path} not found. Run ASR -> events first.")
         return
 
     print(f"Chunking '{video_id}'...")
@@ -20,9 +68,27 @@ def main() -> None:
         events_path=events_path,
         derived_root=Path("data/derived"),
         cfg=default_chunking_config(),
+        artifact_format=data_paths.artifact_format,
+        text_layout=args.text_layout,
+        force=args.force,
     )
 
+    extra = {}
+    if args.configs:
+        extra = chunk_events_multi(
+            video_id=video_id,
+            events_path=events_path,
+            cfgs=args.configs,
+            derived_root=Path("data/derived"),
+            artifact_format=data_paths.artifact_format,
+            text_layout=args.text_layout,
+            force=args.force,
+        )
+
+    print(format_report(drain_report()))
     print("Chunks written to:", out_path)
+    for cfg, path in extra.items():
+        print(f"  {cfg.chunk_tokens}/{cfg.overlap_tokens}/{cfg.max_tokens} ->", path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,32 @@
+import argparse
+
+from videorag.input.paths import video_paths
+from videorag.input.select_video import pick_video_id
+from videorag.logging import metered
+from videorag.pipeline.columnar import columnar_to_json, json_to_columnar
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Convert events/chunks between JSON and the columnar .vrc format."
+    )
+    parser.add_argument("--to", choices=("columnar", "json"), default="columnar")
+    return parser.parse_args()
+
+
+@metered("script.convert_artifacts", export=True)
+def main() -> None:
+    args = _parse_args()
+    video_id = pick_video_id("Select video to convert")
+    src = video_paths(video_id, artifact_format="json" if args.to == "columnar" else "columnar")
+
+    for path in (src.events_path, src.chunks_path):
+        if not path.exists():
+            print(f"Skipping missing {path}")
+            continue
+        out = json_to_columnar(path) if args.to == "columnar" else columnar_to_json(path)
+        print(f"{path} -> {out}")
+
+
+if __name__ == "__main__":
+    main()
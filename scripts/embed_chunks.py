@@ -0,0 +1,61 @@
+import argparse
+import json
+from pathlib import Path
+
+from videorag.input.paths import video_paths
+from videorag.input.select_video import pick_video_id
+from videorag.logging import metered
+from videorag.pipeline.embeddings import EMBEDDERS, embed_chunks_to_file, get_embedder
+from videorag.pipeline.stage_cache import drain_report, format_report
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Embed chunk text into embeddings.npy.")
+    parser.add_argument(
+        "--embedder",
+        choices=EMBEDDERS,
+        default=None,
+        help="Embedding backend (default: VIDEORAG_EMBEDDER, else sentence-transformers; hashing only when chosen).",
+    )
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute even if the stage cache says the output is up to date.",
+    )
+    return parser.parse_args()
+
+
+@metered("script.embed_chunks", export=True)
+def main() -> None:
+    args = _parse_args()
+    video_id = pick_video_id("Select video to embed")
+    data_paths = video_paths(video_id)
+
+    chunks_path = data_paths.chunks_path
+    if not chunks_path.exists():
+        print("chunks.json not found. Run events -> chunks first.")
+        return
+
+    print(f"Embedding '{video_id}'...")
+    out_path = embed_chunks_to_file(
+        video_id=video_id,
+        chunks_path=chunks_path,
+        derived_root=Path("data/derived"),
+        embedder=get_embedder(args.embedder),
+        batch_size=args.batch_size,
+        force=args.force,
+    )
+
+    print(format_report(drain_report()))
+    meta = json.loads(out_path.with_suffix(".json").read_text(encoding="utf-8"))
+    stats = meta["stats"]
+    print(
+        f"{stats['chunks']} chunks ({stats['cached']} cached, {stats['embedded']} embedded), "
+        f"{stats['chunks'] / stats['seconds'] if stats['seconds'] else 0:.0f} chunks/s"
+    )
+    print("Embeddings written to:", out_path)
+
+
+if __name__ == "__main__":
+    main()
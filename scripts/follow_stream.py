@@ -0,0 +1,41 @@
+import argparse
+
+from videorag.input.select_video import pick_video_id
+from videorag.logging import metered
+from videorag.pipeline.streaming import follow_transcript_stream
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Rebuild events/chunks while a streaming transcription is running."
+    )
+    parser.add_argument("--index", action="store_true", help="Index chunks after every update.")
+    parser.add_argument("--poll", type=float, default=10.0, help="Seconds between checks.")
+    return parser.parse_args()
+
+
+@metered("script.follow_stream", export=True)
+def main() -> None:
+    args = _parse_args()
+    video_id = pick_video_id("Select video to follow")
+
+    def on_update(chunks_path, done) -> None:
+        state = "final" if done else "partial"
+        if args.index:
+            from videorag.db.indexing import index_chunks_for_video
+
+            stats = index_chunks_for_video(video_id=video_id, chunks_path=chunks_path)
+            print(f"[{state}] indexed {stats.total} chunks ({stats})")
+        else:
+            print(f"[{state}] chunks updated: {chunks_path}")
+
+    out_path = follow_transcript_stream(
+        video_id=video_id,
+        poll_seconds=args.poll,
+        on_update=on_update,
+    )
+    print("Stream finished. Chunks:", out_path)
+
+
+if __name__ == "__main__":
+    main()
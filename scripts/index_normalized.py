@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+
+from videorag.db.normalized import index_normalized_video
+from videorag.input.paths import video_paths
+from videorag.logging import metered
+from videorag.pipeline.batch import resolve_video_ids
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Write videos to the normalized events / chunk_spans tables."
+    )
+    parser.add_argument(
+        "videos",
+        nargs="*",
+        help="Video IDs or glob patterns (default: every video in the registry).",
+    )
+    return parser.parse_args()
+
+
+@metered("script.index_normalized", export=True)
+def main() -> None:
+    args = _parse_args()
+    video_ids = resolve_video_ids(args.videos)
+    if not video_ids:
+        print("No videos to index.")
+        return
+
+    for video_id in video_ids:
+        paths = video_paths(video_id)
+        if not paths.events_path.exists() or not paths.chunks_path.exists():
+            print(f"{video_id}: missing events or chunks file, skipped.")
+            continue
+        n_events, n_spans = index_normalized_video(
+            video_id=video_id, chunks_path=paths.chunks_path, events_path=paths.events_path
+        )
+        print(f"{video_id}: {n_events} events, {n_spans} chunk spans.")
+
+
+if __name__ == "__main__":
+    main()
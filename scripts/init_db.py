@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+
+from videorag.db.migrations import MIGRATIONS, applied_versions, migrate, schema_drift
+from videorag.db.models import Video
+from videorag.input.registry import load_registry
+from videorag.logging import metered
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create / migrate the Postgres schema.")
+    parser.add_argument("--status", action="store_true", help="Show applied and pending migrations only.")
+    parser.add_argument("--target", type=int, default=None, help="Migrate up to this version.")
+    return parser.parse_args()
+
+
+def _sync_registry() -> int:
+    """Upsert data/registry.json into the videos table."""
+    from videorag.db.session import db_session
+
+    videos = load_registry().get("videos", {})
+    with db_session() as session:
+        for video_id, meta in videos.items():
+            added_at = meta.get("added_at")
+            session.merge(
+                Video(
+                    video_id=video_id,
+                    title=meta.get("title") or video_id,
+                    raw_path=meta.get("raw_path"),
+                    added_at=datetime.fromisoformat(added_at) if added_at else None,
+                )
+            )
+    return len(videos)
+
+
+@metered("script.init_db", export=True)
+def main() -> None:
+    args = _parse_args()
+    if args.status:
+        from videorag.db.session import get_engine
+
+        with get_engine().begin() as conn:
+            applied = applied_versions(conn)
+        for m in MIGRATIONS:
+            print(f"{'applied' if m.version in applied else 'pending':>8}  {m.version:03d}_{m.name}")
+        return
+
+    done = migrate(target=args.target)
+    print(f"Applied {len(done)} migration(s): {', '.join(m.name for m in done) or 'none pending'}.")
+    if args.target is None:
+        print(f"Synced {_sync_registry()} video(s) from the registry.")
+        drift = schema_drift()
+        for problem in drift:
+            print(f"  schema drift: {problem}")
+
+
+if __name__ == "__main__":
+    main()
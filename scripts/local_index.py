@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+
+from videorag.logging import metered
+from videorag.pipeline.batch import resolve_video_ids
+from videorag.retrieval.local_index import DEFAULT_INDEX_DIR, LocalIndex
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Add embedded videos to the in-process vector index (no Postgres)."
+    )
+    parser.add_argument(
+        "videos",
+        nargs="*",
+        help="Video IDs or glob patterns (default: every video in the registry).",
+    )
+    parser.add_argument("--dir", type=str, default=str(DEFAULT_INDEX_DIR), help="Index directory.")
+    parser.add_argument(
+        "--float16",
+        action="store_true",
+        help="Store vectors as float16 (half the memory; only applies to a new index).",
+    )
+    parser.add_argument("--ivf", type=int, default=None, metavar="LISTS", help="(Re)build the IVF layer (0 = auto).")
+    parser.add_argument("--compact", action="store_true", help="Drop rows of replaced videos.")
+    return parser.parse_args()
+
+
+@metered("script.local_index", export=True)
+def main() -> None:
+    args = _parse_args()
+    index = LocalIndex(args.dir)
+    dtype = "float16" if args.float16 else "float32"
+
+    added = [vid for vid in resolve_video_ids(args.videos) if index.add_video(vid, dtype=dtype)]
+    print(f"Added {len(added)} video(s); index holds {len(index)} vectors.")
+
+    if args.compact:
+        index.compact()
+    if args.ivf is not None:
+        index.build_ivf(args.ivf)
+        print("IVF layer built.")
+
+
+if __name__ == "__main__":
+    main()
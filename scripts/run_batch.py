@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from videorag.logging import metered
+from videorag.pipeline.batch import (
+    DEFAULT_WORKERS,
+    STAGES,
+    format_summary,
+    resolve_video_ids,
+    run_batch,
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run transcribe -> events -> chunk -> embed -> index for many videos."
+    )
+    parser.add_argument(
+        "videos",
+        nargs="*",
+        help="Video IDs or glob patterns (default: every video in the registry).",
+    )
+    parser.add_argument(
+        "--pending",
+        action="store_true",
+        help=(
+            "Only videos with work left: a stage output is missing, "
+            "or the chunks were not indexed since they last changed."
+        ),
+    )
+    parser.add_argument(
+        "--stages",
+        default=",".join(STAGES),
+        help=f"Comma-separated subset of: {','.join(STAGES)}",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the stage cache and recompute every stage.",
+    )
+    for stage in STAGES:
+        parser.add_argument(
+            f"--{stage}-workers",
+            type=int,
+            default=DEFAULT_WORKERS[stage],
+            help=f"Worker processes for the {stage} stage (default: {DEFAULT_WORKERS[stage]}).",
+        )
+    return parser.parse_args()
+
+
+@metered("script.run_batch", export=True)
+def main() -> None:
+    args = _parse_args()
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+
+    video_ids = resolve_video_ids(args.videos, pending_only=args.pending, stages=stages)
+    if not video_ids:
+        print("No videos to process.")
+        return
+
+    workers = {stage: getattr(args, f"{stage}_workers") for stage in STAGES}
+
+    print(f"Processing {len(video_ids)} video(s): stages={','.join(stages)}")
+    results = run_batch(video_ids, stages=stages, workers=workers, force=args.force)
+
+    print("Summary:")
+    print(format_summary(results))
+
+    if not all(r.ok for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
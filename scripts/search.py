@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import argparse
+
+from videorag.logging import metered
+from videorag.retrieval.ann_index import SearchParams
+from videorag.retrieval.cache import CachedRetriever
+from videorag.retrieval.context import pack_context
+from videorag.retrieval.hybrid import HybridConfig, hybrid_search
+from videorag.retrieval.search import BACKENDS, default_backend_name, get_backend, search
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Semantic search over indexed chunks.")
+    parser.add_argument("query")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--video", action="append", dest="videos", help="Restrict to video (repeatable).")
+    parser.add_argument("--from", dest="t0", type=float, help="Only chunks ending after this second.")
+    parser.add_argument("--to", dest="t1", type=float, help="Only chunks starting before this second.")
+    parser.add_argument("--ef-search", type=int, default=SearchParams.ef_search)
+    parser.add_argument("--probes", type=int, default=SearchParams.probes)
+    parser.add_argument("--exact", action="store_true", help="Bypass the ANN index.")
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=None,
+        help="Retrieval backend (default: VIDEORAG_RETRIEVAL_BACKEND or postgres).",
+    )
+    parser.add_argument("--n-probe", type=int, default=None, help="Local backend: IVF lists to scan.")
+    parser.add_argument(
+        "--hybrid",
+        action="store_true",
+        help="Fuse full-text and vector rankings (reciprocal rank fusion).",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Serve repeated queries from the on-disk retrieval cache (prints its stats).",
+    )
+    parser.add_argument(
+        "--context",
+        type=int,
+        metavar="TOKENS",
+        help="Print the deduplicated prompt context packed into this token budget instead of hits.",
+    )
+    parser.add_argument("--lexical-weight", type=float, default=HybridConfig.lexical_weight)
+    parser.add_argument("--vector-weight", type=float, default=HybridConfig.vector_weight)
+    return parser.parse_args()
+
+
+@metered("script.search", export=True)
+def main() -> None:
+    args = _parse_args()
+    time_range = (args.t0, args.t1) if args.t0 is not None or args.t1 is not None else None
+    params = SearchParams(ef_search=args.ef_search, probes=args.probes, exact=args.exact)
+
+    if args.hybrid:
+        cfg = HybridConfig(lexical_weight=args.lexical_weight, vector_weight=args.vector_weight)
+        result = hybrid_search(
+            args.query, args.k, video_ids=args.videos, time_range=time_range, cfg=cfg, params=params
+        )
+        hits = result.hits
+        print(" ".join(f"{name}={ms:.1f}ms" for name, ms in result.timings.items()))
+    else:
+        name = args.backend or default_backend_name()
+        if name == "local":
+            backend = get_backend(name, n_probe=args.n_probe)
+        else:
+            backend = get_backend(name, params=params)
+        if args.cache:
+            retriever = CachedRetriever.on_disk(backend=backend)
+            hits = retriever.search(args.query, args.k, video_ids=args.videos, time_range=time_range)
+            for level, stats in retriever.stats().items():
+                print(f"cache {level}: hits={stats['hits']} misses={stats['misses']} entries={stats['entries']}")
+        else:
+            hits = search(args.query, args.k, video_ids=args.videos, time_range=time_range, backend=backend)
+    if not hits:
+        print("No results.")
+        return
+    if args.context is not None:
+        packed = pack_context(hits, token_budget=args.context)
+        print(
+            f"context: {packed.token_count}/{packed.token_budget} tokens "
+            f"({packed.hit_tokens} in retrieved chunks), {len(packed.blocks)} blocks, "
+            f"{len(packed.dropped)} dropped"
+        )
+        print(packed.render())
+        return
+    for rank, hit in enumerate(hits, start=1):
+        print(f"{rank}. [{hit.score:.3f}] {hit.video_id} {hit.ts_start:.1f}-{hit.ts_end:.1f}s")
+        print(f"   {hit.deep_link()}")
+        print(f"   {hit.text[:200]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+
+from videorag.input.paths import video_paths
+from videorag.logging import metered
+from videorag.pipeline.batch import resolve_video_ids
+from videorag.pipeline.tokens import DEFAULT_TOKENIZER, annotate_events_files
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Add per-event token counts to many videos' events files in one batch."
+    )
+    parser.add_argument(
+        "videos",
+        nargs="*",
+        help="Video IDs or glob patterns (default: every video in the registry).",
+    )
+    parser.add_argument("--tokenizer", default=DEFAULT_TOKENIZER)
+    parser.add_argument("--force", action="store_true", help="Recount files that already have counts.")
+    return parser.parse_args()
+
+
+@metered("script.tokenize_events", export=True)
+def main() -> None:
+    args = _parse_args()
+    paths = [video_paths(vid).events_path for vid in resolve_video_ids(args.videos)]
+    existing = [p for p in paths if p.exists()]
+    if not existing:
+        print("No events files found.")
+        return
+
+    n = annotate_events_files(existing, name=args.tokenizer, force=args.force)
+    print(f"Token counts written for {n} of {len(existing)} events file(s).")
+
+
+if __name__ == "__main__":
+    main()
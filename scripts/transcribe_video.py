@@ -1,9 +1,37 @@
+import argparse
+
 from videorag.input.paths import video_paths
 from videorag.input.select_video import pick_video_id
+from videorag.logging import metered
+from videorag.pipeline.asr_backends import BACKENDS
 from videorag.pipeline.asr_transcription import transcribe_video_to_derived
+from videorag.pipeline.stage_cache import drain_report, format_report
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Transcribe one registered video.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute even if the stage cache says the output is up to date.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=None,
+        help="ASR backend (default: mlx on Apple Silicon, cpu elsewhere).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Append segments to transcript_segments.jsonl as they are decoded (resumable).",
+    )
+    return parser.parse_args()
 
 
+@metered("script.transcribe_video", export=True)
 def main() -> None:
+    args = _parse_args()
     video_id = pick_video_id("Select video to transcribe")
     paths = video_paths(video_id)
 
@@ -17,8 +45,12 @@ def main() -> None:
     transcribe_video_to_derived(
         video_id=video_id,
         input_path=raw_video_path,
+        backend=args.backend,
+        stream=args.stream,
+        force=args.force,
     )
 
+    print(format_report(drain_report()))
     print(f"Transcription completed for '{video_id}'")
     print(f"Output in: {paths.derived_dir}")
 
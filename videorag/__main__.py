@@ -0,0 +1,3 @@
+from videorag.cli import main
+
+main()
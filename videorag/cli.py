@@ -0,0 +1,381 @@
+"""
+videorag command line: one entry point for the pipeline stages.
+
+    videorag add lecture.mp4
+    videorag transcribe [VIDEO] [--backend cpu] [--stream]
+    videorag events [VIDEO]
+    videorag chunk [VIDEO] [--config 256:50]
+    videorag embed [VIDEO]
+    videorag index [VIDEO]
+    videorag run ['lecture_*' ...] [--pending]
+    videorag --profile cprofile,sample chunk lecture_01
+
+Without a VIDEO the registered videos are listed to pick from. Parsing the
+command line imports nothing beyond the standard library: each subcommand
+imports its stage (ASR, tokenizer, embedder, database) when it runs, so
+`videorag index` never loads the ASR stack and `--help` returns at once.
+Keep it that way; benchmarks/cli_import_time.py enforces the budgets.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple
+
+DERIVED_ROOT = Path("data/derived")
+
+# Mirrors pipeline.batch.STAGES; not imported from there so that building
+# the parser stays free of pipeline imports.
+STAGES = ("transcribe", "events", "chunk", "embed", "index")
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def _video_id(args: argparse.Namespace, prompt: str) -> str:
+    if args.video:
+        return args.video
+    from videorag.input.select_video import pick_video_id
+
+    return pick_video_id(prompt)
+
+
+def _print_cache_report() -> None:
+    from videorag.pipeline.stage_cache import drain_report, format_report
+
+    print(format_report(drain_report()))
+
+
+def _parse_config(value: str) -> Tuple[int, ...]:
+    parts = value.split(":")
+    if len(parts) not in (2, 3) or not all(p.isdigit() for p in parts):
+        raise argparse.ArgumentTypeError("expected CHUNK:OVERLAP or CHUNK:OVERLAP:MAX")
+    return tuple(int(p) for p in parts)
+
+
+# -----------------------------
+# Subcommands
+# -----------------------------
+def cmd_add(args: argparse.Namespace) -> int:
+    from videorag.input.registry import register_video
+
+    raw = args.path or input("Paste/drag video file path:\n> ").strip()
+    if not raw:
+        print("No file selected.")
+        return 1
+    input_path = Path(raw.strip('"').strip("'")).expanduser()
+    if not input_path.is_file():
+        print(f"Invalid file: {input_path}")
+        return 1
+
+    video_id, raw_video_path = register_video(input_path, video_id=args.id)
+    print(f"Registered video '{video_id}'")
+    print(f"Stored at: {raw_video_path}")
+    print(f"Derived dir: {DERIVED_ROOT / video_id}")
+    return 0
+
+
+def cmd_transcribe(args: argparse.Namespace) -> int:
+    from videorag.input.paths import video_paths
+
+    video_id = _video_id(args, "Select video to transcribe")
+    paths = video_paths(video_id)
+    if not paths.raw_video_path.exists():
+        print(f"Raw video not found: {paths.raw_video_path}")
+        print("Add the video again or check your raw folder structure.")
+        return 1
+
+    from videorag.pipeline.asr_transcription import transcribe_video_to_derived
+
+    print(f"Transcribing '{video_id}'...")
+    transcribe_video_to_derived(
+        video_id=video_id,
+        input_path=paths.raw_video_path,
+        backend=args.backend,
+        stream=args.stream,
+        force=args.force,
+    )
+    _print_cache_report()
+    print(f"Transcription completed for '{video_id}'")
+    print(f"Output in: {paths.derived_dir}")
+    return 0
+
+
+def cmd_events(args: argparse.Namespace) -> int:
+    from videorag.input.paths import video_paths
+
+    video_id = _video_id(args, "Select video to build events for")
+    paths = video_paths(video_id)
+    if not paths.transcript_segments_path.exists():
+        print(f"Missing transcript: {paths.transcript_segments_path}")
+        print("Run `videorag transcribe` first.")
+        return 1
+
+    from videorag.pipeline.events_builder import build_events_from_asr
+
+    out_path = build_events_from_asr(
+        video_id=video_id,
+        transcript_segments_path=paths.transcript_segments_path,
+        derived_root=DERIVED_ROOT,
+        artifact_format=paths.artifact_format,
+        force=args.force,
+    )
+    _print_cache_report()
+    print(f"Wrote: {out_path}")
+    return 0
+
+
+def cmd_chunk(args: argparse.Namespace) -> int:
+    from videorag.input.paths import video_paths
+
+    video_id = _video_id(args, "Select video to chunk")
+    paths = video_paths(video_id)
+    if not paths.events_path.exists():
+        print(f"{paths.events_path} not found. Run `videorag events` first.")
+        return 1
+
+    from videorag.pipeline.chunk_events import (
+        ChunkingConfig,
+        chunk_events_multi,
+        chunk_events_to_file,
+        default_chunking_config,
+    )
+
+    print(f"Chunking '{video_id}'...")
+    out_path = chunk_events_to_file(
+        video_id=video_id,
+        events_path=paths.events_path,
+        derived_root=DERIVED_ROOT,
+        cfg=default_chunking_config(),
+        artifact_format=paths.artifact_format,
+        text_layout=args.text_layout,
+        force=args.force,
+    )
+    extra = {}
+    if args.configs:
+        cfgs = [
+            ChunkingConfig(
+                chunk_tokens=c[0],
+                overlap_tokens=c[1],
+                max_tokens=c[2] if len(c) == 3 else c[0] + c[0] // 4,
+            )
+            for c in args.configs
+        ]
+        extra = chunk_events_multi(
+            video_id=video_id,
+            events_path=paths.events_path,
+            cfgs=cfgs,
+            derived_root=DERIVED_ROOT,
+            artifact_format=paths.artifact_format,
+            text_layout=args.text_layout,
+            force=args.force,
+        )
+    _print_cache_report()
+    print("Chunks written to:", out_path)
+    for cfg, path in extra.items():
+        print(f"  {cfg.chunk_tokens}/{cfg.overlap_tokens}/{cfg.max_tokens} ->", path)
+    return 0
+
+
+def cmd_embed(args: argparse.Namespace) -> int:
+    from videorag.input.paths import video_paths
+
+    video_id = _video_id(args, "Select video to embed")
+    paths = video_paths(video_id)
+    if not paths.chunks_path.exists():
+        print(f"{paths.chunks_path} not found. Run `videorag chunk` first.")
+        return 1
+
+    from videorag.pipeline.embeddings import embed_chunks_to_file, get_embedder
+
+    print(f"Embedding '{video_id}'...")
+    out_path = embed_chunks_to_file(
+        video_id=video_id,
+        chunks_path=paths.chunks_path,
+        derived_root=DERIVED_ROOT,
+        embedder=get_embedder(args.embedder),
+        batch_size=args.batch_size,
+        force=args.force,
+    )
+    _print_cache_report()
+    print("Embeddings written to:", out_path)
+    return 0
+
+
+def cmd_index(args: argparse.Namespace) -> int:
+    from videorag.input.paths import video_paths
+
+    video_id = _video_id(args, "Select video to index chunks for")
+    paths = video_paths(video_id)
+    if not paths.chunks_path.exists():
+        print(f"{paths.chunks_path} not found. Run `videorag chunk` first.")
+        return 1
+
+    from videorag.db.indexing import index_chunks_for_video
+
+    stats = index_chunks_for_video(video_id=video_id, chunks_path=paths.chunks_path)
+    print(f"Indexed {stats.total} chunks for video '{video_id}' into Postgres ({stats}).")
+    return 0
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    from videorag.pipeline.batch import DEFAULT_WORKERS, format_summary, resolve_video_ids, run_batch
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        print(f"Unknown stage(s): {', '.join(unknown)}. Choose from: {', '.join(STAGES)}")
+        return 2
+
+    video_ids = resolve_video_ids(args.videos, pending_only=args.pending, stages=stages)
+    if not video_ids:
+        print("No videos to process.")
+        return 0
+
+    workers = {
+        stage: getattr(args, f"{stage}_workers") or DEFAULT_WORKERS[stage] for stage in STAGES
+    }
+    print(f"Processing {len(video_ids)} video(s): stages={','.join(stages)}")
+    results = run_batch(video_ids, stages=stages, workers=workers, force=args.force)
+    print("Summary:")
+    print(format_summary(results))
+    return 0 if all(r.ok for r in results) else 1
+
+
+# -----------------------------
+# Parser
+# -----------------------------
+def _add_video_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("video", nargs="?", help="Registered video ID (default: pick from a list).")
+
+
+def _add_force_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute even if the stage cache says the output is up to date.",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="videorag", description="Video transcript RAG pipeline.")
+    parser.add_argument(
+        "--profile",
+        metavar="MODES",
+        help=(
+            "Profile each stage with cprofile, tracemalloc and/or sample (comma-separated); "
+            "written to data/derived/<video>/profiles/. Same as VIDEORAG_PROFILE."
+        ),
+    )
+    parser.add_argument(
+        "--profile-stages",
+        metavar="STAGES",
+        help="Stages to profile, names or globs (default: every per-video stage). Same as VIDEORAG_PROFILE_STAGES.",
+    )
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    def add(name: str, handler: Callable[[argparse.Namespace], int], help: str) -> argparse.ArgumentParser:
+        p = sub.add_parser(name, help=help, description=help)
+        p.set_defaults(handler=handler)
+        return p
+
+    p = add("add", cmd_add, "Copy a video into data/raw and register it.")
+    p.add_argument("path", nargs="?", help="Video file (default: prompt for it).")
+    p.add_argument("--id", help="Video ID (default: the file name without extension).")
+
+    p = add("transcribe", cmd_transcribe, "Transcribe one registered video.")
+    _add_video_arg(p)
+    _add_force_arg(p)
+    # Validated by asr_backends.get_backend; listing the names here would
+    # import the ASR stack just to build --help.
+    p.add_argument("--backend", default=None, help="ASR backend: mlx or cpu (default: mlx on Apple Silicon).")
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Append segments to transcript_segments.jsonl as they are decoded (resumable).",
+    )
+
+    p = add("events", cmd_events, "Build events.json from a transcript.")
+    _add_video_arg(p)
+    _add_force_arg(p)
+
+    p = add("chunk", cmd_chunk, "Chunk events.json into chunks.json.")
+    _add_video_arg(p)
+    _add_force_arg(p)
+    p.add_argument(
+        "--config",
+        dest="configs",
+        action="append",
+        type=_parse_config,
+        default=[],
+        metavar="CHUNK:OVERLAP[:MAX]",
+        help="Extra chunking config, repeatable; each is written to chunks.<config-hash>.json.",
+    )
+    p.add_argument(
+        "--text-layout",
+        choices=("inline", "events"),
+        default="inline",
+        help="'events' stores chunks as event ranges only; text is rebuilt from events.json on load.",
+    )
+
+    p = add("embed", cmd_embed, "Embed chunk text into embeddings.npy.")
+    _add_video_arg(p)
+    _add_force_arg(p)
+    p.add_argument(
+        "--embedder",
+        default=None,
+        help="sentence-transformers or hashing (default: VIDEORAG_EMBEDDER, else sentence-transformers; hashing only when chosen).",
+    )
+    p.add_argument("--batch-size", type=int, default=1024)
+
+    p = add("index", cmd_index, "Upsert a video's chunks into Postgres.")
+    _add_video_arg(p)
+
+    p = add("run", cmd_run, "Run transcribe -> events -> chunk -> embed -> index for many videos.")
+    p.add_argument(
+        "videos",
+        nargs="*",
+        help="Video IDs or glob patterns (default: every video in the registry).",
+    )
+    p.add_argument(
+        "--pending",
+        action="store_true",
+        help="Only videos with work left: a stage output is missing, or the chunks were not indexed since they last changed.",
+    )
+    p.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated subset of: {','.join(STAGES)}")
+    p.add_argument("--force", action="store_true", help="Ignore the stage cache and recompute every stage.")
+    for stage in STAGES:
+        p.add_argument(
+            f"--{stage}-workers",
+            type=int,
+            default=None,
+            help=f"Worker processes for the {stage} stage (default: pipeline.batch.DEFAULT_WORKERS).",
+        )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from videorag.logging import metered, setup_logging
+    from videorag.profiling import profile_config
+
+    args = build_parser().parse_args(argv)
+    # Through the environment so batch worker processes profile too.
+    if args.profile:
+        os.environ["VIDEORAG_PROFILE"] = args.profile
+    if args.profile_stages:
+        os.environ["VIDEORAG_PROFILE_STAGES"] = args.profile_stages
+    try:
+        profile_config()
+    except ValueError as exc:
+        build_parser().error(str(exc))
+    setup_logging()
+    # Records every stage the command runs and writes them to data/metrics
+    # on the way out (see videorag.metrics).
+    handler = metered(f"cli.{args.command}", export=True)(args.handler)
+    sys.exit(handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,12 @@ class Settings:
     pg_db: str
     pg_user: str
     pg_password: str
+    # Connection pool (sync and async engines each have one of this size).
+    pool_size: int = 5
+    max_overflow: int = 10
+    # Seconds before a pooled connection is replaced (-1: never).
+    pool_recycle: int = 1800
+    pool_timeout: float = 30.0
 
     @property
     def sqlalchemy_url(self) -> str:
@@ -35,6 +41,14 @@ def get_settings() -> Settings:
         raise RuntimeError("PGPASSWORD is not set")
 
     return Settings(
-        pg_host=host, pg_port=port, pg_db=db, pg_user=user, pg_password=password
+        pg_host=host,
+        pg_port=port,
+        pg_db=db,
+        pg_user=user,
+        pg_password=password,
+        pool_size=int(os.getenv("PG_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("PG_MAX_OVERFLOW", "10")),
+        pool_recycle=int(os.getenv("PG_POOL_RECYCLE", "1800")),
+        pool_timeout=float(os.getenv("PG_POOL_TIMEOUT", "30")),
     )
 
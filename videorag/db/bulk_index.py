@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from videorag import metrics
+from videorag.db.indexing import IndexStats, chunk_embeddings, content_hash, diff_rows, index_cache
+from videorag.input.paths import video_paths
+from videorag.logging import metered
+from videorag.pipeline.columnar import is_columnar, load_payload, open_columnar
+from videorag.retrieval.versions import BUMP_DBAPI_SQL, bump_keys
+
+logger = logging.getLogger("rag")
+
+# Videos merged per transaction. Bigger batches mean fewer round trips and
+# commits; smaller ones keep a failure (and the temp table) cheap.
+DEFAULT_BATCH_VIDEOS = 50
+
+COLUMNS: Tuple[str, ...] = (
+    "video_id", "chunk_id", "ts_start", "ts_end", "text", "content_hash", "embedding", "embedding_model",
+)
+
+ChunkRow = Tuple[str, int, float, float, str]
+
+# Staging table with exactly the types of the real columns; dropped at commit.
+_CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE chunks_staging ON COMMIT DROP AS
+    SELECT {", ".join(COLUMNS)} FROM chunks WITH NO DATA
+"""
+
+_COPY_SQL = f"COPY chunks_staging ({', '.join(COLUMNS)}) FROM STDIN"
+
+_MERGE_SQL = f"""
+    INSERT INTO chunks ({", ".join(COLUMNS)})
+    SELECT {", ".join(COLUMNS)} FROM chunks_staging
+    ON CONFLICT (video_id, chunk_id)
+    DO UPDATE SET
+      ts_start        = EXCLUDED.ts_start,
+      ts_end          = EXCLUDED.ts_end,
+      text            = EXCLUDED.text,
+      content_hash    = EXCLUDED.content_hash,
+      embedding       = EXCLUDED.embedding,
+      embedding_model = EXCLUDED.embedding_model
+"""
+
+_EXISTING_SQL = "SELECT video_id, chunk_id, content_hash FROM chunks WHERE video_id = ANY(%s)"
+
+_DELETE_SQL = """
+    DELETE FROM chunks c
+    USING unnest(%s::text[], %s::integer[]) AS d(video_id, chunk_id)
+    WHERE c.video_id = d.video_id AND c.chunk_id = d.chunk_id
+"""
+
+
+@dataclass
+class BulkIndexResult:
+    rows: Dict[str, int] = field(default_factory=dict)
+    stats: IndexStats = field(default_factory=IndexStats)
+    missing: List[str] = field(default_factory=list)
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows.values())
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total_rows / self.seconds if self.seconds else 0.0
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+def iter_chunk_rows(video_id: str, chunks_path: Path) -> Iterator[ChunkRow]:
+    """
+    (video_id, chunk_id, ts_start, ts_end, text) per chunk; the indexer
+    appends content_hash, embedding and embedding_model to get COPY column
+    order. Columnar files are read straight from their columns without
+    building chunk dicts.
+    """
+    if is_columnar(chunks_path):
+        with open_columnar(chunks_path) as art:
+            chunk_ids = art["chunk_id"].tolist()
+            ts_start = art["ts_start"].tolist()
+            ts_end = art["ts_end"].tolist()
+            for i, text in enumerate(art.iter_text()):
+                yield (video_id, chunk_ids[i], ts_start[i], ts_end[i], text)
+        return
+
+    for ch in load_payload(chunks_path).get("chunks", []):
+        yield (
+            video_id,
+            int(ch["chunk_id"]),
+            float(ch["ts_start"]),
+            float(ch["ts_end"]),
+            str(ch["text"]),
+        )
+
+
+# -----------------------------
+# Indexing
+# -----------------------------
+def _copy_batch(conn, batch: Sequence[Tuple[str, Path]], result: BulkIndexResult) -> None:
+    """
+    One transaction: diff the batch against the stored content hashes
+    (one read query), COPY only new / changed rows into staging, merge them
+    once, delete chunk_ids that disappeared and bump the changed videos'
+    index versions. A batch with no changes runs the read query only.
+    """
+    with conn.cursor() as cur:
+        cur.execute(_EXISTING_SQL, ([video_id for video_id, _ in batch],))
+        existing: Dict[str, Dict[int, str | None]] = {video_id: {} for video_id, _ in batch}
+        for video_id, chunk_id, h in cur.fetchall():
+            existing[video_id][chunk_id] = h
+
+        upsert_rows: List[Tuple] = []
+        delete_videos: List[str] = []
+        delete_ids: List[int] = []
+        stats = IndexStats()
+        counts: Dict[str, int] = {}
+        changed: List[str] = []
+        for video_id, chunks_path in batch:
+            base = list(iter_chunk_rows(video_id, chunks_path))
+            model, vectors = chunk_embeddings(
+                chunks_path.parent, [r[1] for r in base], [r[4] for r in base]
+            )
+            rows: Dict[int, Tuple] = {}
+            for row, vector in zip(base, vectors):
+                row_model = model if vector else None
+                rows[row[1]] = row + (content_hash(*row[2:], row_model), vector, row_model)
+            upsert, delete, video_stats = diff_rows(
+                {chunk_id: row[5] for chunk_id, row in rows.items()}, existing[video_id]
+            )
+            upsert_rows.extend(rows[chunk_id] for chunk_id in upsert)
+            delete_videos.extend([video_id] * len(delete))
+            delete_ids.extend(delete)
+            stats.add(video_stats)
+            counts[video_id] = len(rows)
+            if video_stats.written or video_stats.deleted:
+                changed.append(video_id)
+
+        if upsert_rows:
+            cur.execute(_CREATE_STAGING_SQL)
+            with cur.copy(_COPY_SQL) as copy:
+                for row in upsert_rows:
+                    copy.write_row(row)
+            cur.execute(_MERGE_SQL)
+        if delete_ids:
+            cur.execute(_DELETE_SQL, (delete_videos, delete_ids))
+        if changed:
+            cur.execute(BUMP_DBAPI_SQL, (bump_keys(changed),))
+    conn.commit()
+    for video_id, chunks_path in batch:
+        index_cache(video_id, chunks_path).record()
+    result.rows.update(counts)
+    result.stats.add(stats)
+    result.batches += 1
+
+
+@metered("bulk_index")
+def bulk_index_videos(
+    video_ids: Sequence[str],
+    *,
+    derived_root: Path = Path("data/derived"),
+    batch_videos: int = DEFAULT_BATCH_VIDEOS,
+) -> BulkIndexResult:
+    """
+    Index the chunks of many videos with COPY instead of per-row upserts.
+
+    For each batch of batch_videos videos, new and changed rows are streamed
+    into a temp staging table and merged into `chunks` with a single
+    INSERT ... ON CONFLICT, and chunk_ids no longer in a video's chunks file
+    are deleted, all inside one transaction per batch: a failing batch is
+    rolled back as a whole and earlier batches stay committed. Videos
+    without a chunks file are listed in result.missing.
+    """
+    # Imported here so callers that never index don't need DB credentials.
+    from videorag.db.session import get_engine
+
+    result = BulkIndexResult()
+    todo: List[Tuple[str, Path]] = []
+    for video_id in dict.fromkeys(video_ids):
+        chunks_path = video_paths(video_id, derived_root=derived_root).chunks_path
+        if chunks_path.exists():
+            todo.append((video_id, chunks_path))
+        else:
+            result.missing.append(video_id)
+
+    t0 = time.perf_counter()
+    raw = get_engine().raw_connection()
+    try:
+        conn = raw.driver_connection
+        for i in range(0, len(todo), batch_videos):
+            batch = todo[i : i + batch_videos]
+            try:
+                _copy_batch(conn, batch, result)
+            except Exception:
+                conn.rollback()
+                raise
+            logger.info("Bulk indexed batch %d (%d videos): %s", result.batches, len(batch), result.stats)
+    finally:
+        raw.close()
+    result.seconds = time.perf_counter() - t0
+    metrics.current().add(videos=len(todo), chunks=result.total_rows, written=result.stats.written)
+
+    return result
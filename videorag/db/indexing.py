@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, text
+
+from videorag import metrics
+from videorag.logging import metered
+from videorag.pipeline.columnar import load_payload
+from videorag.pipeline.embeddings import (
+    EMBEDDINGS_FILENAME,
+    EMBEDDINGS_META_FILENAME,
+    load_embeddings,
+    text_hash,
+)
+from videorag.pipeline.stage_cache import StageCache
+from videorag.retrieval.versions import bump_index_version
+
+UPSERT_SQL = text(
+    """
+    INSERT INTO chunks (video_id, chunk_id, ts_start, ts_end, text, content_hash, embedding, embedding_model)
+    VALUES (:video_id, :chunk_id, :ts_start, :ts_end, :text, :content_hash, CAST(:embedding AS vector),
+            :embedding_model)
+    ON CONFLICT (video_id, chunk_id)
+    DO UPDATE SET
+      ts_start        = EXCLUDED.ts_start,
+      ts_end          = EXCLUDED.ts_end,
+      text            = EXCLUDED.text,
+      content_hash    = EXCLUDED.content_hash,
+      embedding       = EXCLUDED.embedding,
+      embedding_model = EXCLUDED.embedding_model
+    """
+)
+
+EXISTING_SQL = text("SELECT chunk_id, content_hash FROM chunks WHERE video_id = :video_id")
+
+DELETE_SQL = text(
+    "DELETE FROM chunks WHERE video_id = :video_id AND chunk_id IN :chunk_ids"
+).bindparams(bindparam("chunk_ids", expanding=True))
+
+
+@dataclass
+class IndexStats:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        """Rows of the indexed videos now in the table."""
+        return self.inserted + self.updated + self.unchanged
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+    def add(self, other: "IndexStats") -> None:
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.deleted += other.deleted
+        self.unchanged += other.unchanged
+
+    def __str__(self) -> str:
+        return (
+            f"{self.inserted} inserted, {self.updated} updated, "
+            f"{self.deleted} deleted, {self.unchanged} unchanged"
+        )
+
+
+def content_hash(ts_start: float, ts_end: float, text: str, embedding_model: str | None = None) -> str:
+    """
+    Hash of the values a chunk row is indexed with. The embedding is
+    represented by its model id: for a given model the vector is a function
+    of the text.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{ts_start!r}\x1f{ts_end!r}\x1f".encode("utf-8"))
+    h.update(text.encode("utf-8"))
+    if embedding_model:
+        h.update(f"\x1f{embedding_model}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def vector_literal(vector: Sequence[float]) -> str:
+    """pgvector text form, usable as a bind parameter and in COPY."""
+    return "[" + ",".join(f"{x:.7g}" for x in vector) + "]"
+
+
+def chunk_embeddings(
+    derived_dir: Path,
+    chunk_ids: Sequence[int],
+    texts: Sequence[str],
+) -> Tuple[Optional[str], List[Optional[str]]]:
+    """
+    (model_id, vector literal per chunk) from the video's embeddings.npy.
+    A chunk gets None when the video was not embedded or its vector was
+    computed for different text (chunks changed after the embed stage).
+    """
+    loaded = load_embeddings(derived_dir)
+    if loaded is None:
+        return None, [None] * len(chunk_ids)
+    vectors, meta = loaded
+    row_of = {
+        (chunk_id, h): i for i, (chunk_id, h) in enumerate(zip(meta["chunk_ids"], meta["text_hashes"]))
+    }
+    out: List[Optional[str]] = []
+    for chunk_id, text in zip(chunk_ids, texts):
+        i = row_of.get((chunk_id, text_hash(text)))
+        out.append(None if i is None else vector_literal(vectors[i].tolist()))
+    return meta["model"], out
+
+
+def diff_rows(
+    hashes: Mapping[int, str],
+    existing: Mapping[int, str | None],
+) -> Tuple[List[int], List[int], IndexStats]:
+    """
+    Compare new {chunk_id: hash} with what is stored for the video.
+    Returns (chunk_ids to upsert, chunk_ids to delete, stats).
+    """
+    stats = IndexStats()
+    upsert: List[int] = []
+    for chunk_id, h in hashes.items():
+        if chunk_id not in existing:
+            stats.inserted += 1
+            upsert.append(chunk_id)
+        elif existing[chunk_id] != h:
+            stats.updated += 1
+            upsert.append(chunk_id)
+        else:
+            stats.unchanged += 1
+    delete = [chunk_id for chunk_id in existing if chunk_id not in hashes]
+    stats.deleted = len(delete)
+    return upsert, delete, stats
+
+
+def load_chunk_rows(video_id: str, chunks_path: Path) -> List[Dict[str, Any]]:
+    """
+    Read chunks.json (or chunks.vrc) and turn it into row dicts for the
+    `chunks` table, with the chunk's vector and its model id when the
+    video was embedded.
+    An empty "chunks" list gives no rows, so indexing it deletes the
+    video's stale rows.
+    """
+    if not chunks_path.exists():
+        raise FileNotFoundError(f"Missing chunks file: {chunks_path}")
+
+    payload = load_payload(chunks_path)
+    chunks = payload.get("chunks")
+    if not isinstance(chunks, list):
+        raise ValueError(f"{chunks_path} has no 'chunks' list.")
+    if not chunks:
+        return []
+
+    rows = [
+        {
+            "video_id": video_id,
+            "chunk_id": int(ch["chunk_id"]),
+            "ts_start": float(ch["ts_start"]),
+            "ts_end": float(ch["ts_end"]),
+            "text": str(ch["text"]),
+        }
+        for ch in chunks
+    ]
+
+    model, vectors = chunk_embeddings(
+        chunks_path.parent, [r["chunk_id"] for r in rows], [r["text"] for r in rows]
+    )
+    for row, vector in zip(rows, vectors):
+        row["embedding"] = vector
+        row["embedding_model"] = model if vector else None
+        row["content_hash"] = content_hash(row["ts_start"], row["ts_end"], row["text"], row["embedding_model"])
+    return rows
+
+
+def _database_id() -> str:
+    # Which database the rows went to (no credentials: it lands in the manifest).
+    return "{}:{}/{}".format(
+        os.getenv("PGHOST", "localhost"), os.getenv("PGPORT", "5432"), os.getenv("PGDATABASE", "videorag")
+    )
+
+
+def index_cache(video_id: str, chunks_path: Path) -> StageCache:
+    """
+    Stage-cache entry of the index stage. Indexing has no local output, so
+    this only records which chunks (and vectors) were last written to which
+    database; the batch runner's --pending reads it. Indexing itself always
+    diffs against the table, which is as cheap as a cache check.
+    """
+    derived_dir = chunks_path.parent
+    vectors = [derived_dir / EMBEDDINGS_FILENAME, derived_dir / EMBEDDINGS_META_FILENAME]
+    return StageCache(
+        derived_dir=derived_dir,
+        video_id=video_id,
+        stage="index",
+        inputs=[chunks_path] + [p for p in vectors if p.exists()],
+        outputs=[],
+        config={"database": _database_id()},
+        code_files=[],
+    )
+
+
+@metered("index")
+def index_chunks_for_video(*, video_id: str, chunks_path: Path) -> IndexStats:
+    """
+    Bring the video's rows in Postgres in line with its chunks file: insert
+    new chunks, update changed ones, delete chunk_ids that no longer exist.
+    Re-indexing an unchanged video costs one read query.
+    """
+    # Imported here so callers that never index don't need DB credentials.
+    from videorag.db.session import db_session
+
+    rows = load_chunk_rows(video_id, chunks_path)
+    by_id = {row["chunk_id"]: row for row in rows}
+
+    with db_session() as session:
+        existing = dict(session.execute(EXISTING_SQL, {"video_id": video_id}).all())
+        upsert, delete, stats = diff_rows(
+            {chunk_id: row["content_hash"] for chunk_id, row in by_id.items()}, existing
+        )
+        if upsert:
+            session.execute(UPSERT_SQL, [by_id[chunk_id] for chunk_id in upsert])
+        if delete:
+            session.execute(DELETE_SQL, {"video_id": video_id, "chunk_ids": delete})
+        if upsert or delete:
+            bump_index_version(session, [video_id])
+
+    index_cache(video_id, chunks_path).record()
+    metrics.current().add(chunks=len(rows), written=stats.written)
+    return stats
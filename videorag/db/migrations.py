@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from videorag.db.models import CHUNK_PARTITIONS, Base
+from videorag.db.schema import SCHEMA_STATEMENTS, TEXT_SEARCH_CONFIG, TIME_RANGE_SQL
+from videorag.pipeline.embeddings import EMBEDDING_DIM
+
+logger = logging.getLogger("rag")
+
+# Serialises concurrent migrate() calls (workers starting together).
+_LOCK_KEY = 0x76726167  # "vrag"
+
+Step = Union[str, Callable[[Connection], None]]
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    One schema change. Steps are SQL strings or functions of the
+    connection, run in one transaction together with the version bump, so
+    a migration either applies completely or not at all.
+
+    Migrations are append-only: once released, a migration's steps never
+    change; fix mistakes with a new one. models.py describes the schema
+    they add up to (check with schema_drift()).
+    """
+
+    version: int
+    name: str
+    steps: Sequence[Step]
+
+
+# -----------------------------
+# Migration steps
+# -----------------------------
+def _relkind(conn: Connection, table: str) -> Optional[str]:
+    return conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:t)"), {"t": table}
+    ).scalar()
+
+
+def _partition_chunks(conn: Connection) -> None:
+    """
+    Turn `chunks` into a table hash-partitioned by video_id with
+    CHUNK_PARTITIONS partitions, moving the existing rows. ANN indexes are
+    not carried over (rebuild with scripts/ann_index.py); they are built
+    per partition from now on.
+    """
+    if _relkind(conn, "chunks") == "p":
+        return
+    conn.execute(text("ALTER TABLE chunks RENAME TO chunks_unpartitioned"))
+    conn.execute(text("ALTER TABLE chunks_unpartitioned RENAME CONSTRAINT chunks_pkey TO chunks_unpartitioned_pkey"))
+    # Index names are schema-wide; free them for the partitioned table.
+    for name in (
+        "chunks_text_tsv_idx",
+        "chunks_time_gist_idx",
+        "chunks_video_ts_idx",
+        "chunks_embedding_hnsw_idx",
+        "chunks_embedding_ivfflat_idx",
+    ):
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    conn.execute(
+        text(
+            f"""
+            CREATE TABLE chunks (
+              video_id     text NOT NULL,
+              chunk_id     integer NOT NULL,
+              ts_start     double precision NOT NULL,
+              ts_end       double precision NOT NULL,
+              text         text NOT NULL,
+              content_hash text,
+              embedding    vector({EMBEDDING_DIM}),
+              text_tsv     tsvector GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}', text)) STORED,
+              CONSTRAINT chunks_pkey PRIMARY KEY (video_id, chunk_id)
+            ) PARTITION BY HASH (video_id)
+            """
+        )
+    )
+    for i in range(CHUNK_PARTITIONS):
+        conn.execute(
+            text(
+                f"CREATE TABLE chunks_p{i:02d} PARTITION OF chunks "
+                f"FOR VALUES WITH (MODULUS {CHUNK_PARTITIONS}, REMAINDER {i})"
+            )
+        )
+    conn.execute(
+        text(
+            "INSERT INTO chunks (video_id, chunk_id, ts_start, ts_end, text, content_hash, embedding) "
+            "SELECT video_id, chunk_id, ts_start, ts_end, text, content_hash, embedding FROM chunks_unpartitioned"
+        )
+    )
+    conn.execute(text("DROP TABLE chunks_unpartitioned"))
+    # Indexes on the parent cascade to every partition.
+    conn.execute(text("CREATE INDEX chunks_video_ts_idx ON chunks (video_id, ts_start)"))
+    conn.execute(text("CREATE INDEX chunks_text_tsv_idx ON chunks USING gin (text_tsv)"))
+    conn.execute(text(f"CREATE INDEX chunks_time_gist_idx ON chunks USING gist (video_id, {TIME_RANGE_SQL})"))
+    conn.execute(text("ANALYZE chunks"))
+
+
+MIGRATIONS: List[Migration] = [
+    # Everything init_db created before migrations existed. Idempotent, so
+    # databases made by hand or by older versions adopt it as-is.
+    Migration(1, "baseline", SCHEMA_STATEMENTS),
+    Migration(
+        2,
+        "videos",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS videos (
+              video_id   text PRIMARY KEY,
+              title      text NOT NULL,
+              raw_path   text,
+              added_at   timestamptz
+            )
+            """
+        ],
+    ),
+    Migration(3, "partition_chunks", [_partition_chunks]),
+    Migration(
+        4,
+        "embedding_model",
+        [
+            # model_id of the embedder behind chunks.embedding; searches
+            # reject query vectors from a different model.
+            "ALTER TABLE chunks ADD COLUMN IF NOT EXISTS embedding_model text",
+            # The model of vectors indexed so far is unknown: dropping their
+            # hash makes the next index run rewrite them with it.
+            "UPDATE chunks SET content_hash = NULL WHERE embedding IS NOT NULL",
+            """
+            CREATE INDEX IF NOT EXISTS chunks_embedding_model_idx ON chunks (embedding_model)
+              WHERE embedding IS NOT NULL
+            """,
+        ],
+    ),
+    Migration(
+        5,
+        "index_versions",
+        [
+            # Per-video counters bumped with every chunk write (retrieval.versions).
+            """
+            CREATE TABLE IF NOT EXISTS index_versions (
+              video_id text PRIMARY KEY,
+              version  bigint NOT NULL
+            )
+            """
+        ],
+    ),
+]
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+_CREATE_VERSIONS_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version    integer PRIMARY KEY,
+  name       text NOT NULL,
+  applied_at timestamptz NOT NULL DEFAULT now()
+)
+"""
+
+
+def applied_versions(conn: Connection) -> Dict[int, str]:
+    conn.execute(text(_CREATE_VERSIONS_SQL))
+    return dict(conn.execute(text("SELECT version, name FROM schema_migrations")).all())
+
+
+def pending_migrations(conn: Connection) -> List[Migration]:
+    applied = applied_versions(conn)
+    return [m for m in MIGRATIONS if m.version not in applied]
+
+
+def migrate(*, target: int | None = None) -> List[Migration]:
+    """
+    Apply pending migrations in order (up to target), each in its own
+    transaction. Safe to call from several processes at once. Returns the
+    migrations applied.
+    """
+    from videorag.db.session import get_engine
+
+    done: List[Migration] = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if target is not None and migration.version > target:
+            break
+        with get_engine().begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _LOCK_KEY})
+            if migration.version in applied_versions(conn):
+                continue
+            logger.info("Applying migration %03d_%s", migration.version, migration.name)
+            for step in migration.steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(text(step))
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+                {"v": migration.version, "n": migration.name},
+            )
+        done.append(migration)
+    return done
+
+
+def schema_drift() -> List[str]:
+    """
+    Differences between models.py and the live database: missing tables,
+    columns and indexes. Empty when the migrations and models agree.
+    """
+    from videorag.db.session import get_engine
+
+    problems: List[str] = []
+    with get_engine().connect() as conn:
+        insp = inspect(conn)
+        tables = set(insp.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                problems.append(f"missing table {table.name}")
+                continue
+            columns = {c["name"] for c in insp.get_columns(table.name)}
+            problems.extend(
+                f"missing column {table.name}.{c.name}" for c in table.columns if c.name not in columns
+            )
+            indexes = {i["name"] for i in insp.get_indexes(table.name)}
+            problems.extend(
+                f"missing index {i.name} on {table.name}" for i in table.indexes if i.name not in indexes
+            )
+        if _relkind(conn, "chunks") != "p":
+            problems.append("chunks is not partitioned")
+    return problems
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import BigInteger, Computed, DateTime, Float, Index, Integer, PrimaryKeyConstraint, Text
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import UserDefinedType
+
+from videorag.db.base import Base
+from videorag.db.schema import TEXT_SEARCH_CONFIG, TIME_RANGE_SQL
+from videorag.pipeline.embeddings import EMBEDDING_DIM
+
+# Hash partitions of `chunks` (by video_id). Deleting or re-indexing a
+# video touches one partition and its indexes; changing this needs a new
+# migration that repartitions (see db.migrations).
+CHUNK_PARTITIONS = 16
+
+
+class Vector(UserDefinedType):
+    """pgvector column; values are bound in text form (indexing.vector_literal)."""
+
+    cache_ok = True
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+
+    def get_col_spec(self, **kw) -> str:
+        return f"vector({self.dim})"
+
+
+class Video(Base):
+    """A registered video (data/registry.json), synced by scripts/init_db.py."""
+
+    __tablename__ = "videos"
+
+    video_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    title: Mapped[str] = mapped_column(Text)
+    raw_path: Mapped[Optional[str]] = mapped_column(Text)
+    added_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+
+class Chunk(Base):
+    __tablename__ = "chunks"
+
+    video_id: Mapped[str] = mapped_column(Text)
+    chunk_id: Mapped[int] = mapped_column(Integer)
+    ts_start: Mapped[float] = mapped_column(Float)
+    ts_end: Mapped[float] = mapped_column(Float)
+    text: Mapped[str] = mapped_column(Text)
+    content_hash: Mapped[Optional[str]] = mapped_column(Text)
+    embedding: Mapped[Optional[List[float]]] = mapped_column(Vector(EMBEDDING_DIM))
+    embedding_model: Mapped[Optional[str]] = mapped_column(Text)
+    text_tsv: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{TEXT_SEARCH_CONFIG}', text)", persisted=True),
+    )
+
+    __table_args__ = (
+        PrimaryKeyConstraint("video_id", "chunk_id", name="chunks_pkey"),
+        Index("chunks_video_ts_idx", "video_id", "ts_start"),
+        Index("chunks_text_tsv_idx", "text_tsv", postgresql_using="gin"),
+        Index("chunks_time_gist_idx", "video_id", sql_text(TIME_RANGE_SQL), postgresql_using="gist"),
+        Index("chunks_embedding_model_idx", "embedding_model", postgresql_where=sql_text("embedding IS NOT NULL")),
+        {"postgresql_partition_by": "HASH (video_id)"},
+    )
+
+
+class Event(Base):
+    __tablename__ = "events"
+
+    video_id: Mapped[str] = mapped_column(Text)
+    event_id: Mapped[int] = mapped_column(Integer)
+    ts_start: Mapped[float] = mapped_column(Float)
+    ts_end: Mapped[float] = mapped_column(Float)
+    type: Mapped[str] = mapped_column(Text)
+    text: Mapped[str] = mapped_column(Text)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("video_id", "event_id", name="events_pkey"),
+        Index("events_time_gist_idx", "video_id", sql_text(TIME_RANGE_SQL), postgresql_using="gist"),
+    )
+
+
+class ChunkSpan(Base):
+    """A chunk as an event range (normalized layout, see db.normalized)."""
+
+    __tablename__ = "chunk_spans"
+
+    video_id: Mapped[str] = mapped_column(Text)
+    chunk_id: Mapped[int] = mapped_column(Integer)
+    event_start: Mapped[int] = mapped_column(Integer)
+    event_end: Mapped[int] = mapped_column(Integer)
+    ts_start: Mapped[float] = mapped_column(Float)
+    ts_end: Mapped[float] = mapped_column(Float)
+    token_count: Mapped[int] = mapped_column(Integer)
+
+    __table_args__ = (PrimaryKeyConstraint("video_id", "chunk_id", name="chunk_spans_pkey"),)
+
+
+class IndexVersion(Base):
+    """Per-video index version counter (see retrieval.versions); "*" counts every write."""
+
+    __tablename__ = "index_versions"
+
+    video_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger)
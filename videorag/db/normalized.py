@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import text
+
+from videorag import metrics
+from videorag.logging import metered
+from videorag.pipeline.chunk_events import _load_events
+from videorag.pipeline.columnar import read_chunk_spans
+
+# Normalized layout: `events` holds each event's text once per video,
+# `chunk_spans` the chunks as [event_start, event_end] ranges. Event ids are
+# positions in the cleaned, time-sorted event list the chunker indexes
+# (chunk_events._load_events), so a span selects the same events as the
+# chunk's event_range.
+
+ChunkKey = Tuple[str, int]
+
+_DELETE_EVENTS_SQL = text("DELETE FROM events WHERE video_id = :video_id")
+_DELETE_SPANS_SQL = text("DELETE FROM chunk_spans WHERE video_id = :video_id")
+
+_INSERT_EVENTS_SQL = text(
+    """
+    INSERT INTO events (video_id, event_id, ts_start, ts_end, type, text)
+    VALUES (:video_id, :event_id, :ts_start, :ts_end, :type, :text)
+    """
+)
+
+_INSERT_SPANS_SQL = text(
+    """
+    INSERT INTO chunk_spans (video_id, chunk_id, event_start, event_end, ts_start, ts_end, token_count)
+    VALUES (:video_id, :chunk_id, :event_start, :event_end, :ts_start, :ts_end, :token_count)
+    """
+)
+
+_SPANS_SQL = text(
+    """
+    SELECT s.video_id, s.chunk_id, s.event_start, s.event_end
+    FROM chunk_spans s
+    JOIN unnest(CAST(:video_ids AS text[]), CAST(:chunk_ids AS integer[])) AS k(video_id, chunk_id)
+      ON s.video_id = k.video_id AND s.chunk_id = k.chunk_id
+    """
+)
+
+_EVENTS_SQL = text(
+    """
+    SELECT e.video_id, e.event_id, e.text
+    FROM events e
+    JOIN unnest(CAST(:video_ids AS text[]), CAST(:lo AS integer[]), CAST(:hi AS integer[])) AS r(video_id, lo, hi)
+      ON e.video_id = r.video_id AND e.event_id BETWEEN r.lo AND r.hi
+    """
+)
+
+
+@metered("index_normalized")
+def index_normalized_video(*, video_id: str, chunks_path: Path, events_path: Path) -> Tuple[int, int]:
+    """
+    Replace the video's rows in `events` / `chunk_spans` with the contents
+    of its events and chunks files. Returns (events, spans) written.
+    """
+    from videorag.db.session import db_session
+
+    _, events, _ = _load_events(events_path)
+
+    event_rows = [
+        {
+            "video_id": video_id,
+            "event_id": i,
+            "ts_start": t_start,
+            "ts_end": t_end,
+            "type": events.type_names[code],
+            "text": text,
+        }
+        for i, (t_start, t_end, code, text) in enumerate(
+            zip(events.t_start.tolist(), events.t_end.tolist(), events.type_codes.tolist(), events.texts)
+        )
+    ]
+    span_rows = [
+        {
+            "video_id": video_id,
+            "chunk_id": chunk_id,
+            "event_start": event_start,
+            "event_end": event_end,
+            "ts_start": ts_start,
+            "ts_end": ts_end,
+            "token_count": token_count,
+        }
+        for chunk_id, event_start, event_end, ts_start, ts_end, token_count in read_chunk_spans(chunks_path)
+    ]
+
+    with db_session() as session:
+        session.execute(_DELETE_SPANS_SQL, {"video_id": video_id})
+        session.execute(_DELETE_EVENTS_SQL, {"video_id": video_id})
+        if event_rows:
+            session.execute(_INSERT_EVENTS_SQL, event_rows)
+        if span_rows:
+            session.execute(_INSERT_SPANS_SQL, span_rows)
+    metrics.current().add(events=len(event_rows), chunks=len(span_rows))
+    return len(event_rows), len(span_rows)
+
+
+def _merge_ranges(spans: Iterable[Tuple[str, int, int]]) -> List[Tuple[str, int, int]]:
+    """Union of overlapping / touching event ranges per video."""
+    merged: List[Tuple[str, int, int]] = []
+    for video_id, lo, hi in sorted(spans):
+        if merged and merged[-1][0] == video_id and lo <= merged[-1][2] + 1:
+            merged[-1] = (video_id, merged[-1][1], max(merged[-1][2], hi))
+        else:
+            merged.append((video_id, lo, hi))
+    return merged
+
+
+def chunk_texts(keys: Sequence[ChunkKey]) -> Dict[ChunkKey, str]:
+    """
+    Batch materialisation of chunk text: two queries for any number of
+    chunks, each event fetched once even when the requested chunks overlap
+    (the chunk_span_texts view aggregates per chunk instead).
+    """
+    from videorag.db.session import db_session
+
+    if not keys:
+        return {}
+    with db_session() as session:
+        spans = session.execute(
+            _SPANS_SQL,
+            {"video_ids": [k[0] for k in keys], "chunk_ids": [int(k[1]) for k in keys]},
+        ).all()
+
+        ranges = _merge_ranges((r.video_id, r.event_start, r.event_end) for r in spans)
+        events = session.execute(
+            _EVENTS_SQL,
+            {
+                "video_ids": [r[0] for r in ranges],
+                "lo": [r[1] for r in ranges],
+                "hi": [r[2] for r in ranges],
+            },
+        ).all()
+
+    texts: Dict[ChunkKey, str] = {}
+    by_event = {(r.video_id, r.event_id): r.text for r in events}
+    for r in spans:
+        texts[(r.video_id, r.chunk_id)] = " ".join(
+            by_event[(r.video_id, i)] for i in range(r.event_start, r.event_end + 1)
+        )
+    return texts
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import List
+
+from videorag.pipeline.embeddings import EMBEDDING_DIM
+
+# Postgres text search configuration for chunks.text_tsv and its queries.
+TEXT_SEARCH_CONFIG = "english"
+
+# A row's [ts_start, ts_end] as a range; must match the GiST index
+# expressions below for the planner to use them.
+TIME_RANGE_SQL = "numrange(ts_start::numeric, ts_end::numeric, '[]')"
+
+# Idempotent DDL of the schema before migrations existed; it is migration 1
+# ("baseline") in db.migrations and must not change. New schema changes
+# are new migrations there.
+SCHEMA_STATEMENTS: List[str] = [
+    "CREATE EXTENSION IF NOT EXISTS vector",
+    # GiST over (text, range) for the time lookups in db.timeline.
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    """
+    CREATE TABLE IF NOT EXISTS chunks (
+      video_id text NOT NULL,
+      chunk_id integer NOT NULL,
+      ts_start double precision NOT NULL,
+      ts_end   double precision NOT NULL,
+      text     text NOT NULL,
+      PRIMARY KEY (video_id, chunk_id)
+    )
+    """,
+    # Hash of the indexed values (see indexing.content_hash); lets the
+    # indexers skip unchanged rows. NULL for rows indexed before it existed.
+    "ALTER TABLE chunks ADD COLUMN IF NOT EXISTS content_hash text",
+    # Filled by the indexers from embeddings.npy (pipeline.embeddings).
+    f"ALTER TABLE chunks ADD COLUMN IF NOT EXISTS embedding vector({EMBEDDING_DIM})",
+    # Full-text side of hybrid search (retrieval.hybrid). Generated, so the
+    # indexers never write it.
+    f"""
+    ALTER TABLE chunks ADD COLUMN IF NOT EXISTS text_tsv tsvector
+      GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}', text)) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS chunks_text_tsv_idx ON chunks USING gin (text_tsv)",
+    # Normalized layout (db.normalized): each event's text once, chunks as
+    # event ranges. Optional; nothing in retrieval depends on it.
+    """
+    CREATE TABLE IF NOT EXISTS events (
+      video_id text NOT NULL,
+      event_id integer NOT NULL,
+      ts_start double precision NOT NULL,
+      ts_end   double precision NOT NULL,
+      type     text NOT NULL,
+      text     text NOT NULL,
+      PRIMARY KEY (video_id, event_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS chunk_spans (
+      video_id    text NOT NULL,
+      chunk_id    integer NOT NULL,
+      event_start integer NOT NULL,
+      event_end   integer NOT NULL,
+      ts_start    double precision NOT NULL,
+      ts_end      double precision NOT NULL,
+      token_count integer NOT NULL,
+      PRIMARY KEY (video_id, chunk_id)
+    )
+    """,
+    # Time lookups (db.timeline): "what covers t" / "what intersects
+    # [t0, t1]" within a video. The queries use the same range expression.
+    f"""
+    CREATE INDEX IF NOT EXISTS chunks_time_gist_idx ON chunks
+      USING gist (video_id, {TIME_RANGE_SQL})
+    """,
+    f"""
+    CREATE INDEX IF NOT EXISTS events_time_gist_idx ON events
+      USING gist (video_id, {TIME_RANGE_SQL})
+    """,
+    # Time-ordered scans of a video (player transcript pane).
+    "CREATE INDEX IF NOT EXISTS chunks_video_ts_idx ON chunks (video_id, ts_start)",
+    # Chunk text materialised on read; same text as chunks.text.
+    """
+    CREATE OR REPLACE VIEW chunk_span_texts AS
+    SELECT s.video_id, s.chunk_id, s.ts_start, s.ts_end, s.token_count,
+           (SELECT string_agg(e.text, ' ' ORDER BY e.event_id)
+            FROM events e
+            WHERE e.video_id = s.video_id AND e.event_id BETWEEN s.event_start AND s.event_end) AS text
+    FROM chunk_spans s
+    """,
+]
+
+
+def ensure_schema() -> List[str]:
+    """
+    Create / upgrade the tables the indexers write to by applying pending
+    migrations. Returns the names of the migrations applied.
+    """
+    from videorag.db.migrations import migrate
+
+    return [m.name for m in migrate()]
@@ -1,38 +1,82 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
-from typing import Iterator
-
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator
 
 from videorag.config.settings import get_settings
 
-_settings = get_settings()
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+    from sqlalchemy.orm import Session, sessionmaker
+
+# Nothing here connects (or needs PGPASSWORD) until the first query: the
+# engines and session factories are built on first use and shared by the
+# process afterwards.
+
+
+def _pool_kwargs() -> dict:
+    s = get_settings()
+    return {
+        "pool_size": s.pool_size,
+        "max_overflow": s.max_overflow,
+        "pool_recycle": s.pool_recycle,
+        "pool_timeout": s.pool_timeout,
+        "pool_pre_ping": True,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_engine() -> "Engine":
+    from sqlalchemy import create_engine
+
+    return create_engine(get_settings().sqlalchemy_url, future=True, **_pool_kwargs())
+
+
+@lru_cache(maxsize=None)
+def get_sessionmaker() -> "sessionmaker[Session]":
+    from sqlalchemy.orm import sessionmaker
+
+    return sessionmaker(bind=get_engine(), autoflush=False, autocommit=False, future=True)
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> "AsyncEngine":
+    """
+    Async engine on psycopg 3's asyncio driver (same URL; SQLAlchemy picks
+    the async variant), with its own pool of the same size.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    return create_async_engine(get_settings().sqlalchemy_url, **_pool_kwargs())
 
-engine = create_engine(
-    _settings.sqlalchemy_url,
-    future=True,
-    pool_pre_ping=True,
-)
 
-SessionLocal = sessionmaker(
-    bind=engine,
-    autoflush=False,
-    autocommit=False,
-    future=True,
-)
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> "async_sessionmaker[AsyncSession]":
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+def __getattr__(name: str) -> Any:
+    # `from videorag.db.session import engine` keeps working, lazily.
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @contextmanager
-def db_session() -> Iterator[Session]:
+def db_session() -> Iterator["Session"]:
     """
     Context-managed session:
       with db_session() as s:
           ...
     Commits on success, rollbacks on error.
     """
-    session = SessionLocal()
+    session = get_sessionmaker()()
     try:
         yield session
         session.commit()
@@ -41,3 +85,31 @@ def db_session() -> Iterator[Session]:
         raise
     finally:
         session.close()
+
+
+@asynccontextmanager
+async def async_db_session() -> AsyncIterator["AsyncSession"]:
+    """
+    Async counterpart of db_session():
+      async with async_db_session() as s:
+          await s.execute(...)
+    Each session holds one pooled connection, so concurrent lookups use one
+    session each (see retrieval.hybrid.hybrid_search_async).
+    """
+    session = get_async_sessionmaker()()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+async def dispose_async_engine() -> None:
+    """Close the async pool (before the event loop shuts down)."""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+        get_async_engine.cache_clear()
+        get_async_sessionmaker.cache_clear()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import text
+
+from videorag.db.schema import TIME_RANGE_SQL
+
+# Postgres counterparts of pipeline.timeline. Every predicate is written
+# against TIME_RANGE_SQL so it is answered by the (video_id, range) GiST
+# indexes on chunks / events instead of a scan of the video's rows.
+TABLES = ("chunks", "events")
+
+_COLUMNS = {
+    "chunks": "video_id, chunk_id, ts_start, ts_end, text",
+    "events": "video_id, event_id, ts_start, ts_end, type, text",
+}
+_ORDER = {"chunks": "ts_start, chunk_id", "events": "ts_start, event_id"}
+
+
+def _table(table: str) -> str:
+    if table not in TABLES:
+        raise ValueError(f"Unknown table '{table}'. Choose from: {TABLES}")
+    return table
+
+
+def at_sql(table: str = "chunks") -> str:
+    table = _table(table)
+    return (
+        f"SELECT {_COLUMNS[table]} FROM {table} "
+        f"WHERE video_id = :video_id AND {TIME_RANGE_SQL} @> CAST(:t AS numeric) "
+        f"ORDER BY {_ORDER[table]}"
+    )
+
+
+def between_sql(table: str = "chunks") -> str:
+    table = _table(table)
+    return (
+        f"SELECT {_COLUMNS[table]} FROM {table} "
+        f"WHERE video_id = :video_id "
+        f"AND {TIME_RANGE_SQL} && numrange(CAST(:t0 AS numeric), CAST(:t1 AS numeric), '[]') "
+        f"ORDER BY {_ORDER[table]}"
+    )
+
+
+def at_many_sql(table: str = "chunks") -> str:
+    """One round trip for many playhead positions; rows are tagged with their query index."""
+    table = _table(table)
+    return (
+        f"SELECT q.i, {_COLUMNS[table]} "
+        f"FROM unnest(CAST(:ts AS double precision[])) WITH ORDINALITY AS q(t, i) "
+        f"JOIN {table} ON video_id = :video_id AND {TIME_RANGE_SQL} @> q.t::numeric "
+        f"ORDER BY q.i, {_ORDER[table]}"
+    )
+
+
+def rows_at(video_id: str, t: float, *, table: str = "chunks") -> List[Dict[str, Any]]:
+    """Rows of the video covering second t."""
+    from videorag.db.session import db_session
+
+    with db_session() as session:
+        result = session.execute(text(at_sql(table)), {"video_id": video_id, "t": float(t)})
+        return [dict(r._mapping) for r in result]
+
+
+def rows_between(video_id: str, t0: float, t1: float, *, table: str = "chunks") -> List[Dict[str, Any]]:
+    """Rows of the video intersecting [t0, t1]."""
+    from videorag.db.session import db_session
+
+    with db_session() as session:
+        result = session.execute(
+            text(between_sql(table)), {"video_id": video_id, "t0": float(t0), "t1": float(t1)}
+        )
+        return [dict(r._mapping) for r in result]
+
+
+def rows_at_many(video_id: str, ts: Sequence[float], *, table: str = "chunks") -> List[List[Dict[str, Any]]]:
+    """rows_at() for every t in ts, in one query."""
+    from videorag.db.session import db_session
+
+    out: List[List[Dict[str, Any]]] = [[] for _ in ts]
+    if not out:
+        return out
+    with db_session() as session:
+        result = session.execute(
+            text(at_many_sql(table)), {"video_id": video_id, "ts": [float(t) for t in ts]}
+        )
+        for r in result:
+            row = dict(r._mapping)
+            out[int(row.pop("i")) - 1].append(row)
+    return out
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -9,6 +10,16 @@ class VideoPaths:
     video_id: str
     raw_root: Path
     derived_root: Path
+    # "json" or "columnar" (memory-mappable .vrc, see pipeline.columnar)
+    artifact_format: str = "json"
+
+    @property
+    def _artifact_suffix(self) -> str:
+        # Imported here: paths is loaded by light entry points (no numpy).
+        from videorag.pipeline.columnar import artifact_suffix
+
+        # Raises on an unknown format (e.g. a typo in VIDEORAG_ARTIFACT_FORMAT).
+        return artifact_suffix(self.artifact_format)
 
     @property
     def raw_dir(self) -> Path:
@@ -25,21 +36,36 @@ class VideoPaths:
         return self.raw_dir / "video.mp4"
 
     # ---- Derived artifacts ----
+    @property
+    def audio_path(self) -> Path:
+        # 16 kHz mono float32 PCM, memory-mapped by audio consumers
+        return self.derived_dir / "audio_16k_mono.f32"
+
     @property
     def transcript_segments_path(self) -> Path:
         return self.derived_dir / "transcript_segments.json"
 
+    @property
+    def transcript_stream_path(self) -> Path:
+        # Appended to while streaming ASR runs; see pipeline.streaming
+        return self.derived_dir / "transcript_segments.jsonl"
+
     @property
     def transcript_raw_path(self) -> Path:
         return self.derived_dir / "transcript_raw.txt"
 
     @property
     def events_path(self) -> Path:
-        return self.derived_dir / "events.json"
+        return self.derived_dir / f"events{self._artifact_suffix}"
 
     @property
     def chunks_path(self) -> Path:
-        return self.derived_dir / "chunks.json"
+        return self.derived_dir / f"chunks{self._artifact_suffix}"
+
+    @property
+    def embeddings_path(self) -> Path:
+        # float32 (n_chunks, dim); chunk_ids and model in embeddings.json
+        return self.derived_dir / "embeddings.npy"
 
 
 def video_paths(
@@ -47,5 +73,14 @@ def video_paths(
     *,
     raw_root: Path = Path("data/raw"),
     derived_root: Path = Path("data/derived"),
+    artifact_format: str | None = None,
 ) -> VideoPaths:
-    return VideoPaths(video_id=video_id, raw_root=raw_root, derived_root=derived_root)
+    # VIDEORAG_ARTIFACT_FORMAT=columnar switches every caller to .vrc files.
+    if artifact_format is None:
+        artifact_format = os.getenv("VIDEORAG_ARTIFACT_FORMAT", "json")
+    return VideoPaths(
+        video_id=video_id,
+        raw_root=raw_root,
+        derived_root=derived_root,
+        artifact_format=artifact_format,
+    )
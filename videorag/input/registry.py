@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import json
+import shutil
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 REGISTRY_PATH = Path("data/registry.json")
 
@@ -13,7 +15,48 @@ def load_registry(path: Path = REGISTRY_PATH) -> Dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+def save_registry(registry: Dict[str, Any], path: Path = REGISTRY_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(registry, ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+
 def list_video_ids(path: Path = REGISTRY_PATH) -> List[str]:
     data = load_registry(path)
     videos = data.get("videos", {})
     return sorted(videos.keys()) if isinstance(videos, dict) else []
+
+
+def register_video(
+    input_path: Path,
+    *,
+    video_id: str | None = None,
+    raw_root: Path = Path("data/raw"),
+    derived_root: Path = Path("data/derived"),
+    registry_path: Path = REGISTRY_PATH,
+) -> Tuple[str, Path]:
+    """
+    Copy a video into raw_root/<video_id>/ (once) and record it in the
+    registry. The ID defaults to the file name without extension. Returns
+    (video_id, raw_video_path).
+    """
+    video_id = video_id or input_path.stem
+    raw_dir = raw_root / video_id
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    (derived_root / video_id).mkdir(parents=True, exist_ok=True)
+
+    raw_video_path = raw_dir / f"video{input_path.suffix}"
+    if not raw_video_path.exists():
+        shutil.copy2(input_path, raw_video_path)
+
+    registry = load_registry(registry_path)
+    registry.setdefault("videos", {})
+    registry["videos"][video_id] = {
+        "title": video_id,
+        "added_at": datetime.now(timezone.utc).isoformat(),
+        "raw_path": str(raw_video_path),
+    }
+    save_registry(registry, registry_path)
+    return video_id, raw_video_path
@@ -1,7 +1,14 @@
+import functools
 import logging
 import time
 from contextlib import contextmanager
-from typing import Optional, Type
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from videorag.metrics import REGISTRY, StageMetrics, activate, cpu_seconds, deactivate, export_run, peak_rss_bytes
+from videorag.profiling import start_profiling, stop_profiling
+
+F = TypeVar("F", bound=Callable[..., Any])
 
 
 def setup_logging(level: int = logging.INFO) -> logging.Logger:
@@ -17,16 +24,41 @@ def setup_logging(level: int = logging.INFO) -> logging.Logger:
 
 
 @contextmanager
-def process_segment(logger: logging.Logger, name: str):
+def process_segment(
+    logger: logging.Logger,
+    name: str,
+    *,
+    stage: Optional[str] = None,
+    video_id: Optional[str] = None,
+    derived_root: Optional[Path] = None,
+) -> Iterator[StageMetrics]:
     """
     Context manager that logs START/END/FAIL with elapsed time.
     Works for any part of the app (not just transcription).
+
+    It also measures the section (wall / CPU time, peak RSS) and records it
+    in the metrics registry (see videorag.metrics) under `stage` (default:
+    name). The yielded StageMetrics takes input sizes, e.g.
+    m.add(audio_seconds=..., chunks=...), from which rates are derived;
+    code deeper in the call stack can reach it with metrics.current().
+
+    With VIDEORAG_PROFILE set, the section may also be profiled (see
+    videorag.profiling); profiles go to <derived_root>/<video_id>/profiles/.
     """
+    m = StageMetrics(stage=stage or name, name=name, video_id=video_id, started_at=time.time())
+    profiler = start_profiling(m.stage, video_id, derived_root=derived_root)
+    token = activate(m)
     t0 = time.perf_counter()
+    c0 = cpu_seconds()
     logger.info("START: %s", name)
     try:
-        yield
-    except Exception:
+        yield m
+    except BaseException as exc:
+        # A clean sys.exit() is not a failure.
+        if isinstance(exc, SystemExit) and exc.code in (None, 0):
+            raise
+        m.ok = False
+        m.error = f"{type(exc).__name__}: {exc}"
         dt = time.perf_counter() - t0
         # exception() automatically includes traceback info
         logger.exception("FAIL:  %s (%.2fs)", name, dt)
@@ -34,3 +66,43 @@ def process_segment(logger: logging.Logger, name: str):
     else:
         dt = time.perf_counter() - t0
         logger.info("END:   %s (%.2fs)", name, dt)
+    finally:
+        stop_profiling(profiler)
+        m.wall_s = time.perf_counter() - t0
+        m.cpu_s = cpu_seconds() - c0
+        m.peak_rss_bytes = peak_rss_bytes()
+        deactivate(token)
+        REGISTRY.record(m)
+        logger.debug("METRICS: %s (%s)", name, m.summary())
+
+
+def metered(stage: str, *, export: bool = False) -> Callable[[F], F]:
+    """
+    Decorator form of process_segment for pipeline functions (labelled
+    with their video_id keyword argument) and script entry points.
+    export=True writes the process's metrics (JSONL + Prometheus textfile,
+    see metrics.export_run) when the function returns or fails; use it on
+    script main()s.
+    """
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            video_id = kwargs.get("video_id")
+            name = f"{stage} {video_id}" if video_id else stage
+            try:
+                with process_segment(
+                    logging.getLogger("rag"),
+                    name,
+                    stage=stage,
+                    video_id=video_id,
+                    derived_root=kwargs.get("derived_root"),
+                ):
+                    return fn(*args, **kwargs)
+            finally:
+                if export:
+                    export_run()
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
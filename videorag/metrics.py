@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_METRICS_DIR = Path("data/metrics")
+
+# One ID per process run; every record and the JSONL file carry it.
+RUN_ID = time.strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+
+
+@dataclass
+class StageMetrics:
+    """
+    One timed section (a pipeline stage, a script): wall / CPU time, the
+    process's peak RSS when it ended, and input sizes the section reports
+    through add() (audio_seconds, segments, events, tokens, chunks, ...).
+    Rates are derived from the sizes: <size>_per_s for each, and the ASR
+    real-time factor (rtf, wall seconds per audio second).
+    """
+
+    stage: str
+    name: str = ""
+    video_id: Optional[str] = None
+    run_id: str = RUN_ID
+    started_at: float = 0.0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_bytes: int = 0
+    ok: bool = True
+    cache_hits: int = 0
+    cache_misses: int = 0
+    error: Optional[str] = None
+    sizes: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, **sizes: float) -> None:
+        for key, value in sizes.items():
+            self.sizes[key] = self.sizes.get(key, 0.0) + float(value)
+
+    def cache_event(self, hit: bool) -> None:
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    @property
+    def cached(self) -> bool:
+        """Every stage-cache lookup in the section was a hit (nothing recomputed)."""
+        return self.cache_hits > 0 and self.cache_misses == 0
+
+    @property
+    def rates(self) -> Dict[str, float]:
+        # A cache hit's wall time says nothing about throughput.
+        if self.cached or self.wall_s <= 0:
+            return {}
+        out = {f"{k}_per_s": v / self.wall_s for k, v in self.sizes.items() if k != "audio_seconds"}
+        audio = self.sizes.get("audio_seconds")
+        if audio:
+            out["rtf"] = self.wall_s / audio
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "cached": self.cached, "rates": self.rates}
+
+    def summary(self) -> str:
+        parts = [f"{self.wall_s:.2f}s", f"cpu {self.cpu_s:.2f}s", f"rss {self.peak_rss_bytes / 2**20:.0f}MB"]
+        if self.cached:
+            parts.append("cached")
+        parts.extend(f"{k}={v:g}" for k, v in self.sizes.items())
+        parts.extend(f"{k}={v:.3g}" for k, v in self.rates.items())
+        return ", ".join(parts)
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process plus its finished child processes (ffmpeg)."""
+    t = os.times()
+    return time.process_time() + t.children_user + t.children_system
+
+
+def peak_rss_bytes() -> int:
+    """High-water mark of this process's resident set (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+# -----------------------------
+# Registry
+# -----------------------------
+class MetricsRegistry:
+    """Records of this process, until drained (batch workers) or exported (scripts)."""
+
+    def __init__(self) -> None:
+        self._records: List[StageMetrics] = []
+        self._lock = threading.Lock()
+
+    def record(self, metrics: StageMetrics) -> None:
+        with self._lock:
+            self._records.append(metrics)
+
+    def extend(self, records: Iterable[StageMetrics]) -> None:
+        with self._lock:
+            self._records.extend(records)
+
+    def snapshot(self) -> List[StageMetrics]:
+        with self._lock:
+            return list(self._records)
+
+    def drain(self) -> List[StageMetrics]:
+        with self._lock:
+            records, self._records = self._records, []
+        return records
+
+
+REGISTRY = MetricsRegistry()
+
+_CURRENT: contextvars.ContextVar[Optional[StageMetrics]] = contextvars.ContextVar("videorag_metrics", default=None)
+
+
+def current() -> StageMetrics:
+    """
+    Metrics of the innermost active process_segment, for reporting input
+    sizes from inside a stage. Outside any segment the returned record is
+    simply discarded.
+    """
+    return _CURRENT.get() or StageMetrics(stage="")
+
+
+def activate(metrics: StageMetrics) -> contextvars.Token:
+    return _CURRENT.set(metrics)
+
+
+def deactivate(token: contextvars.Token) -> None:
+    _CURRENT.reset(token)
+
+
+def drain_metrics() -> List[StageMetrics]:
+    return REGISTRY.drain()
+
+
+# -----------------------------
+# Export
+# -----------------------------
+def metrics_dir() -> Path:
+    return Path(os.getenv("VIDEORAG_METRICS_DIR", str(DEFAULT_METRICS_DIR)))
+
+
+def export_enabled() -> bool:
+    return os.getenv("VIDEORAG_METRICS", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def write_jsonl(records: Sequence[StageMetrics], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r.to_dict(), ensure_ascii=False) + "\n")
+    return path
+
+
+def _labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{k}="{escape(str(v))}"' for k, v in labels.items()) + "}" if labels else ""
+
+
+def prometheus_text(records: Sequence[StageMetrics]) -> str:
+    """
+    Prometheus text exposition of a run, aggregated per stage (video IDs
+    are left out to keep label cardinality bounded; they are in the JSONL).
+    """
+    by_stage: Dict[str, List[StageMetrics]] = {}
+    for r in records:
+        by_stage.setdefault(r.stage, []).append(r)
+
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, doc: str, samples: List[tuple]) -> None:
+        if not samples:
+            return
+        lines.append(f"# HELP videorag_{name} {doc}")
+        lines.append(f"# TYPE videorag_{name} {kind}")
+        lines.extend(f"videorag_{name}{_labels(**labels)} {value:.10g}" for labels, value in samples)
+
+    stages = sorted(by_stage)
+    metric("stage_runs", "gauge", "Sections run, by outcome.", [
+        ({"stage": s, "status": status}, float(n))
+        for s in stages
+        for status, n in (
+            ("ok", sum(1 for r in by_stage[s] if r.ok and not r.cached)),
+            ("cached", sum(1 for r in by_stage[s] if r.ok and r.cached)),
+            ("failed", sum(1 for r in by_stage[s] if not r.ok)),
+        )
+    ])
+    metric("stage_wall_seconds", "gauge", "Total wall time.", [
+        ({"stage": s}, sum(r.wall_s for r in by_stage[s])) for s in stages
+    ])
+    metric("stage_cpu_seconds", "gauge", "Total CPU time of the recording process.", [
+        ({"stage": s}, sum(r.cpu_s for r in by_stage[s])) for s in stages
+    ])
+    metric("stage_peak_rss_bytes", "gauge", "Largest process peak RSS seen at the end of the stage.", [
+        ({"stage": s}, float(max(r.peak_rss_bytes for r in by_stage[s]))) for s in stages
+    ])
+    metric("stage_input", "gauge", "Input size processed, by unit.", [
+        ({"stage": s, "unit": unit}, sum(r.sizes.get(unit, 0.0) for r in by_stage[s]))
+        for s in stages
+        for unit in sorted({u for r in by_stage[s] for u in r.sizes})
+    ])
+    # Rates over the stage's uncached runs: total size / total wall time.
+    rate_samples = []
+    for s in stages:
+        fresh = [r for r in by_stage[s] if not r.cached and r.ok]
+        wall = sum(r.wall_s for r in fresh)
+        if wall <= 0:
+            continue
+        for unit in sorted({u for r in fresh for u in r.sizes}):
+            total = sum(r.sizes.get(unit, 0.0) for r in fresh)
+            if unit == "audio_seconds":
+                if total:
+                    rate_samples.append(({"stage": s, "rate": "rtf"}, wall / total))
+            else:
+                rate_samples.append(({"stage": s, "rate": f"{unit}_per_s"}, total / wall))
+    metric("stage_rate", "gauge", "Throughput of uncached runs (rtf: wall seconds per audio second).", rate_samples)
+    if records:
+        metric("run_timestamp_seconds", "gauge", "When this run's metrics were written.", [({}, time.time())])
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def write_prometheus(records: Sequence[StageMetrics], path: Path) -> Path:
+    """Write a node_exporter textfile atomically (the collector may read it any time)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(prometheus_text(records), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def export_run(*, records: Sequence[StageMetrics] | None = None, out_dir: Path | None = None) -> List[Path]:
+    """
+    Append records (default: everything recorded since the last export,
+    drained from the registry) to <metrics dir>/runs/<RUN_ID>.jsonl and
+    write their per-stage aggregates to <metrics dir>/videorag.prom.
+    No-op when VIDEORAG_METRICS=0 or there is nothing to write.
+    """
+    if not export_enabled():
+        return []
+    records = REGISTRY.drain() if records is None else list(records)
+    if not records:
+        return []
+    out_dir = out_dir or metrics_dir()
+    jsonl = out_dir / "runs" / f"{RUN_ID}.jsonl"
+    return [write_jsonl(records, jsonl), write_prometheus(records, out_dir / "videorag.prom")]
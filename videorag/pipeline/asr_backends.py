@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import platform
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Protocol, Tuple, Union
+
+from videorag.pipeline.audio_cache import SAMPLE_RATE, is_audio_cache, open_audio
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Raw segments as produced by a backend: {"start": float, "end": float, "text": str}
+Segment = Dict[str, Any]
+
+
+class AsrBackend(Protocol):
+    name: str
+    model_name: str
+
+    def transcribe(self, input_path: Path, *, language: str) -> List[Segment]:
+        ...
+
+    def iter_transcribe(
+        self, input_path: Path, *, language: str, start_at: float = 0.0
+    ) -> Iterator[Tuple[List[Segment], float]]:
+        """
+        Yield (segments, decoded_until) in time order as decoding progresses.
+        Everything before `decoded_until` seconds is final, so it can be used
+        as a resume point. `start_at` skips audio that was already decoded.
+        """
+        ...
+
+
+# -----------------------------
+# Apple Silicon (MLX)
+# -----------------------------
+def _mlx_input(input_path: Path) -> Any:
+    # mlx_whisper takes a path (decoded with ffmpeg) or a float32 array.
+    if is_audio_cache(input_path):
+        import numpy as np
+
+        return np.asarray(open_audio(input_path))
+    return str(input_path)
+
+
+# Whisper size -> converted weights on the Hugging Face hub. Anything with
+# a "/" is taken as a repo (or local path) as-is.
+MLX_MODEL_REPOS: Dict[str, str] = {
+    "tiny": "mlx-community/whisper-tiny-mlx",
+    "base": "mlx-community/whisper-base-mlx",
+    "small": "mlx-community/whisper-small-mlx",
+    "medium": "mlx-community/whisper-medium-mlx",
+    "large-v2": "mlx-community/whisper-large-v2-mlx",
+    "large-v3": "mlx-community/whisper-large-v3-mlx",
+    "large-v3-turbo": "mlx-community/whisper-large-v3-turbo",
+}
+
+
+def mlx_model_repo(model_name: str) -> str:
+    if "/" in model_name:
+        return model_name
+    try:
+        return MLX_MODEL_REPOS[model_name]
+    except KeyError:
+        raise ValueError(
+            f"No MLX weights known for Whisper model '{model_name}'. "
+            f"Choose from: {', '.join(MLX_MODEL_REPOS)} or pass a Hugging Face repo."
+        ) from None
+
+
+@dataclass
+class MlxWhisperBackend:
+    model_name: str = "large-v2"
+    name: str = "mlx"
+
+    def transcribe(self, input_path: Path, *, language: str) -> List[Segment]:
+        # Imported lazily: mlx only exists on Apple Silicon.
+        import mlx_whisper
+
+        result = mlx_whisper.transcribe(
+            _mlx_input(input_path),
+            path_or_hf_repo=mlx_model_repo(self.model_name),
+            language=language,
+        )
+        return list(result.get("segments", []))
+
+    def iter_transcribe(
+        self, input_path: Path, *, language: str, start_at: float = 0.0
+    ) -> Iterator[Tuple[List[Segment], float]]:
+        # mlx_whisper has no incremental API: one batch at the end.
+        import mlx_whisper
+
+        kwargs: Dict[str, Any] = {}
+        if start_at > 0:
+            kwargs["clip_timestamps"] = str(start_at)
+        result = mlx_whisper.transcribe(
+            _mlx_input(input_path),
+            path_or_hf_repo=mlx_model_repo(self.model_name),
+            language=language,
+            **kwargs,
+        )
+        segments = list(result.get("segments", []))
+        end = max((float(s.get("end", 0.0)) for s in segments), default=start_at)
+        yield segments, end
+
+
+# -----------------------------
+# CPU (faster-whisper / CTranslate2)
+# -----------------------------
+def find_silence_cuts(
+    audio: np.ndarray,
+    *,
+    piece_seconds: float,
+    search_seconds: float = 20.0,
+    frame_ms: int = 30,
+    sample_rate: int = SAMPLE_RATE,
+) -> List[Tuple[int, int]]:
+    """
+    Split audio into ~piece_seconds pieces, cutting at the quietest frame
+    within +/- search_seconds of each nominal boundary so words are not cut
+    in half. Returns [(start_sample, end_sample), ...] covering the audio.
+    """
+    import numpy as np
+
+    n = len(audio)
+    piece = int(piece_seconds * sample_rate)
+    if n <= piece:
+        return [(0, n)]
+
+    frame = int(sample_rate * frame_ms / 1000)
+    n_frames = n // frame
+    # Frame energy (mean square) used as a cheap VAD signal. Computed in
+    # blocks so a memory-mapped multi-hour file never needs a full-size temp.
+    energy = np.empty(n_frames, dtype=np.float32)
+    block = 10_000
+    for f0 in range(0, n_frames, block):
+        f1 = min(n_frames, f0 + block)
+        frames = np.asarray(audio[f0 * frame : f1 * frame]).reshape(f1 - f0, frame)
+        energy[f0:f1] = np.square(frames).mean(axis=1)
+
+    search = int(search_seconds * sample_rate) // frame
+    cuts = [0]
+    nominal = piece
+    while nominal < n - piece // 4:
+        centre = nominal // frame
+        lo = max(cuts[-1] // frame + 1, centre - search)
+        hi = min(n_frames, centre + search + 1)
+        if hi <= lo:
+            break
+        quietest = lo + int(np.argmin(energy[lo:hi]))
+        cut = quietest * frame + frame // 2
+        cuts.append(cut)
+        nominal = cut + piece
+    cuts.append(n)
+
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+_WORKER_MODEL = None
+
+
+def _init_cpu_worker(model_name: str, compute_type: str, cpu_threads: int) -> None:
+    global _WORKER_MODEL
+    from faster_whisper import WhisperModel
+
+    _WORKER_MODEL = WhisperModel(
+        model_name,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+    )
+
+
+def _worker_ready() -> bool:
+    return _WORKER_MODEL is not None
+
+
+# A piece is either an array or (audio_cache_path, start_sample, end_sample);
+# the latter lets workers map their slice of the shared PCM file directly
+# instead of receiving a pickled copy.
+Piece = Union["np.ndarray", Tuple[str, int, int]]
+
+
+def _transcribe_piece(piece: Piece, offset: float, language: str) -> List[Segment]:
+    if isinstance(piece, tuple):
+        path, a, b = piece
+        import numpy as np
+
+        audio = np.ascontiguousarray(open_audio(Path(path))[a:b])
+    else:
+        audio = piece
+    segments, _info = _WORKER_MODEL.transcribe(audio, language=language)
+    return [
+        {"start": offset + seg.start, "end": offset + seg.end, "text": seg.text}
+        for seg in segments
+    ]
+
+
+@dataclass
+class CpuWhisperBackend:
+    """
+    faster-whisper (CTranslate2, int8 by default) on CPU.
+
+    Long audio is cut at low-energy points into pieces that are transcribed
+    in parallel by a pool of worker processes, each holding its own model;
+    segment timestamps are shifted back by the piece offset.
+    """
+
+    model_name: str = "large-v2"
+    workers: int = 0  # 0 = one worker per ~4 cores
+    compute_type: str = "int8"
+    piece_seconds: float = 300.0
+    name: str = "cpu"
+
+    def __post_init__(self) -> None:
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def n_workers(self) -> int:
+        if self.workers > 0:
+            return self.workers
+        return max(1, (os.cpu_count() or 1) // 4)
+
+    def open(self) -> None:
+        """Start the worker pool and load the model in every worker."""
+        if self._pool is not None:
+            return
+        n = self.n_workers
+        threads = max(1, (os.cpu_count() or 1) // n)
+        self._pool = ProcessPoolExecutor(
+            max_workers=n,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_cpu_worker,
+            initargs=(self.model_name, self.compute_type, threads),
+        )
+
+    def warm_up(self) -> None:
+        """Start the pool and wait until every worker has loaded the model."""
+        self.open()
+        futures = [self._pool.submit(_worker_ready) for _ in range(self.n_workers)]
+        for fut in futures:
+            fut.result()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self) -> "CpuWhisperBackend":
+        self.open()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def load_audio(self, input_path: Path) -> np.ndarray:
+        if is_audio_cache(input_path):
+            return open_audio(input_path)
+
+        from faster_whisper import decode_audio
+
+        return decode_audio(str(input_path), sampling_rate=SAMPLE_RATE)
+
+    def iter_transcribe_audio(
+        self,
+        audio: np.ndarray,
+        *,
+        language: str,
+        offset: float = 0.0,
+        audio_path: Path | None = None,
+    ) -> Iterator[Tuple[List[Segment], float]]:
+        """
+        Transcribe pieces in parallel, yielding them in time order as soon as
+        each piece and all pieces before it are done.
+
+        If `audio` is a slice of an audio cache file starting at `offset`,
+        pass that file as audio_path so workers read their pieces from it.
+        """
+        base = int(round(offset * SAMPLE_RATE))
+
+        def piece(a: int, b: int) -> Piece:
+            if audio_path is not None:
+                return (str(audio_path), base + a, base + b)
+            return audio[a:b]
+
+        if len(audio) == 0:
+            return
+        owns_pool = self._pool is None
+        self.open()
+        try:
+            duration = len(audio) / SAMPLE_RATE
+            # Enough pieces to keep every worker busy, but never tiny ones.
+            piece_seconds = max(30.0, min(self.piece_seconds, duration / self.n_workers))
+            pieces = find_silence_cuts(audio, piece_seconds=piece_seconds)
+
+            futures = [
+                (
+                    self._pool.submit(
+                        _transcribe_piece, piece(a, b), offset + a / SAMPLE_RATE, language
+                    ),
+                    offset + b / SAMPLE_RATE,
+                )
+                for a, b in pieces
+            ]
+            for fut, piece_end in futures:
+                segments = fut.result()
+                segments.sort(key=lambda s: (s["start"], s["end"]))
+                yield segments, piece_end
+        finally:
+            if owns_pool:
+                self.close()
+
+    def transcribe_many_audio(
+        self, audios: List[np.ndarray], *, language: str
+    ) -> List[List[Segment]]:
+        """
+        Transcribe several (short) clips at once: the pieces of every clip go
+        into the pool together, so small clips do not leave workers idle.
+        """
+        owns_pool = self._pool is None
+        self.open()
+        try:
+            per_clip = []
+            for audio in audios:
+                pieces = find_silence_cuts(audio, piece_seconds=self.piece_seconds) if len(audio) else []
+                per_clip.append(
+                    [
+                        self._pool.submit(_transcribe_piece, audio[a:b], a / SAMPLE_RATE, language)
+                        for a, b in pieces
+                    ]
+                )
+            results = []
+            for futures in per_clip:
+                segments = [seg for fut in futures for seg in fut.result()]
+                segments.sort(key=lambda s: (s["start"], s["end"]))
+                results.append(segments)
+        finally:
+            if owns_pool:
+                self.close()
+        return results
+
+    def transcribe_audio(self, audio: np.ndarray, *, language: str) -> List[Segment]:
+        segments: List[Segment] = []
+        for batch, _end in self.iter_transcribe_audio(audio, language=language):
+            segments.extend(batch)
+        return segments
+
+    def transcribe(self, input_path: Path, *, language: str) -> List[Segment]:
+        segments: List[Segment] = []
+        for batch, _end in self.iter_transcribe(input_path, language=language):
+            segments.extend(batch)
+        return segments
+
+    def iter_transcribe(
+        self, input_path: Path, *, language: str, start_at: float = 0.0
+    ) -> Iterator[Tuple[List[Segment], float]]:
+        audio = self.load_audio(input_path)
+        start = int(round(start_at * SAMPLE_RATE))
+        yield from self.iter_transcribe_audio(
+            audio[start:],
+            language=language,
+            offset=start / SAMPLE_RATE,
+            audio_path=input_path if is_audio_cache(input_path) else None,
+        )
+
+
+# -----------------------------
+# Selection
+# -----------------------------
+BACKENDS = ("mlx", "cpu")
+
+
+def default_backend_name() -> str:
+    """
+    VIDEORAG_ASR_BACKEND if set, otherwise mlx on Apple Silicon and cpu
+    everywhere else.
+    """
+    env = os.getenv("VIDEORAG_ASR_BACKEND", "").strip().lower()
+    if env:
+        return env
+    if sys.platform == "darwin" and platform.machine() == "arm64":
+        return "mlx"
+    return "cpu"
+
+
+def get_backend(name: str | None = None, *, model_name: str = "large-v2", **kwargs: Any) -> AsrBackend:
+    name = (name or default_backend_name()).lower()
+    if name == "mlx":
+        return MlxWhisperBackend(model_name=model_name)
+    if name == "cpu":
+        return CpuWhisperBackend(model_name=model_name, **kwargs)
+    raise ValueError(f"Unknown ASR backend '{name}'. Choose from: {', '.join(BACKENDS)}")
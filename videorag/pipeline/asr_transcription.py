@@ -1,23 +1,205 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 
-import mlx_whisper
+from videorag import metrics
+from videorag.logging import metered
+from videorag.pipeline import asr_backends
+from videorag.pipeline.asr_backends import get_backend
+from videorag.pipeline.audio_cache import audio_duration, extract_audio
+from videorag.pipeline.stage_cache import StageCache
 
 
 def _clean_text(s: str) -> str:
     return " ".join((s or "").strip().split())
 
 
+def _format_segments(segments: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    segments_out = []
+    for seg in segments:
+        text = _clean_text(seg.get("text", ""))
+        if not text:
+            continue
+
+        start = float(seg.get("start", 0.0))
+        end = float(seg.get("end", 0.0))
+
+        segments_out.append(
+            {
+                "start": round(start, 3),
+                "end": round(end, 3),
+                "text": text,
+            }
+        )
+    return segments_out
+
+
+def _write_transcript(
+    video_id: str,
+    segments_out: List[Dict[str, Any]],
+    formatted_path: Path,
+    raw_path: Path,
+) -> None:
+    formatted = {"video_id": video_id, "segments": segments_out}
+    metrics.current().add(segments=len(segments_out))
+
+    formatted_path.write_text(
+        json.dumps(formatted, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    raw_lines = [seg["text"] for seg in segments_out]
+    raw_path.write_text("\n".join(raw_lines) + "\n", encoding="utf-8")
+
+
+# -----------------------------
+# Streaming sidecar (transcript_segments.jsonl)
+# -----------------------------
+# Line types:
+#   {"header": {...}}                      first line: video_id, ASR settings, input / code digests
+#   {"start": .., "end": .., "text": ..}   one decoded segment
+#   {"checkpoint": 123.4}                  everything before 123.4s is final
+#   {"done": true}                         transcription finished
+def read_stream(stream_path: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]], bool]:
+    """
+    Read a (possibly still growing) stream: (header, segments, done).
+    A half-written trailing line is ignored.
+    """
+    header: Dict[str, Any] = {}
+    segments: List[Dict[str, Any]] = []
+    done = False
+    if not stream_path.exists():
+        return header, segments, done
+
+    with stream_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                break
+            if "header" in rec:
+                header = rec["header"]
+            elif "done" in rec:
+                done = True
+            elif "text" in rec:
+                segments.append(rec)
+    return header, segments, done
+
+
+def _resume_stream(
+    stream_path: Path, header: Dict[str, Any]
+) -> Tuple[List[Dict[str, Any]], float, bool]:
+    """
+    Reopen a stream left behind by an earlier run.
+
+    Keeps the segments up to the last checkpoint, truncates anything after it
+    and returns (kept_segments, resume_at_seconds, done). If the stream was
+    written with different settings it is discarded.
+    """
+    if not stream_path.exists():
+        return [], 0.0, False
+
+    kept: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+    resume_at = 0.0
+    keep_bytes = 0
+    offset = 0
+    header_ok = False
+    done = False
+
+    with stream_path.open("rb") as f:
+        for raw in f:
+            offset += len(raw)
+            try:
+                rec = json.loads(raw)
+            except ValueError:
+                break
+            if "header" in rec:
+                header_ok = rec["header"] == header
+                if not header_ok:
+                    break
+                keep_bytes = offset
+            elif "checkpoint" in rec:
+                kept.extend(pending)
+                pending = []
+                resume_at = float(rec["checkpoint"])
+                keep_bytes = offset
+            elif "done" in rec:
+                done = True
+                keep_bytes = offset
+            elif "text" in rec:
+                pending.append(rec)
+
+    if not header_ok:
+        stream_path.unlink()
+        return [], 0.0, False
+
+    with stream_path.open("r+b") as f:
+        f.truncate(keep_bytes)
+    return kept, resume_at, done
+
+
+def _append_lines(f, records: Iterable[Dict[str, Any]]) -> None:
+    for rec in records:
+        f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+# -----------------------------
+# Transcription
+# -----------------------------
+def transcript_cache(
+    *,
+    video_id: str,
+    input_path: Path,
+    out_dir: Path,
+    language: str,
+    model_name: str,
+    backend_name: str,
+) -> StageCache:
+    """Stage-cache entry for the transcribe stage (shared with the ASR worker)."""
+    return StageCache(
+        derived_dir=out_dir,
+        video_id=video_id,
+        stage="transcribe",
+        inputs=[input_path],
+        outputs=[out_dir / "transcript_segments.json", out_dir / "transcript_raw.txt"],
+        config={"language": language, "model_name": model_name, "backend": backend_name},
+        # The backends decide which weights actually run.
+        code_files=[__file__, asr_backends.__file__],
+    )
+
+
+def write_transcript_outputs(
+    *,
+    video_id: str,
+    segments: Iterable[Dict[str, Any]],
+    out_dir: Path,
+    cache: StageCache,
+) -> Tuple[Path, Path]:
+    """Clean raw backend segments, write both transcript files, record the cache."""
+    formatted_path = out_dir / "transcript_segments.json"
+    raw_path = out_dir / "transcript_raw.txt"
+    _write_transcript(video_id, _format_segments(segments), formatted_path, raw_path)
+    cache.record()
+    return formatted_path, raw_path
+
+
+@metered("transcribe")
 def transcribe_video_to_derived(
     *,
     video_id: str,
     input_path: Path,
     derived_root: Path = Path("data/derived"),
     language: str = "en",
-    model_name: str = "large-v2", 
+    model_name: str = "large-v2",
+    backend: str | None = None,
+    stream: bool = False,
+    use_worker: bool | None = None,
+    force: bool = False,
 ) -> Tuple[Path, Path]:
     """
     Transcribe a single video/audio file and write two outputs:
@@ -31,44 +213,105 @@ def transcribe_video_to_derived(
 
     2) data/derived/<video_id>/transcript_raw.txt
        Plain text, one segment per line.
+
+    The audio track is first decoded into the shared audio cache
+    (audio_16k_mono.f32, see audio_cache) and transcribed from there.
+
+    `backend` picks the ASR implementation ("mlx" or "cpu"); by default
+    mlx on Apple Silicon and cpu elsewhere (see asr_backends).
+
+    With stream=True, segments are also appended to
+    transcript_segments.jsonl as they are decoded, so downstream stages can
+    follow along (see pipeline.streaming). The stream doubles as a
+    checkpoint: an interrupted run resumes after the last completed piece.
+
+    Client mode: when a warm ASR worker is listening (see asr_worker), the
+    job is sent to it instead of loading a model in this process; the
+    worker's backend and model are used. use_worker=None picks this
+    automatically (non-streaming runs only), True requires the worker,
+    False never uses it.
+
+    Skipped when the stage cache says the outputs are up to date
+    (same input file, language/model/backend and code); pass force=True to rerun.
     """
+    if use_worker is None:
+        from videorag.pipeline.asr_worker import worker_available
+
+        use_worker = not stream and worker_available()
+    if use_worker:
+        from videorag.pipeline.asr_worker import submit_job
+
+        return submit_job(
+            video_id=video_id,
+            input_path=input_path,
+            derived_root=derived_root,
+            language=language,
+            force=force,
+        )
+
     out_dir = derived_root / video_id
     out_dir.mkdir(parents=True, exist_ok=True)
 
     formatted_path = out_dir / "transcript_segments.json"
     raw_path = out_dir / "transcript_raw.txt"
 
-    result = mlx_whisper.transcribe(
-        str(input_path),
+    asr = get_backend(backend, model_name=model_name)
+
+    cache = transcript_cache(
+        video_id=video_id,
+        input_path=input_path,
+        out_dir=out_dir,
         language=language,
+        model_name=model_name,
+        backend_name=asr.name,
     )
+    if cache.is_fresh(force=force):
+        return formatted_path, raw_path
 
-    segments_out = []
-    raw_lines = []
+    # Decode once to 16 kHz PCM; the backends memory-map it.
+    audio_path = extract_audio(video_id=video_id, input_path=input_path, derived_root=derived_root)
 
-    for seg in result.get("segments", []):
-        text = _clean_text(seg.get("text", ""))
-        if not text:
-            continue
+    if not stream:
+        metrics.current().add(audio_seconds=audio_duration(audio_path))
+        return write_transcript_outputs(
+            video_id=video_id,
+            segments=asr.transcribe(audio_path, language=language),
+            out_dir=out_dir,
+            cache=cache,
+        )
 
-        start = float(seg.get("start", 0.0))
-        end = float(seg.get("end", 0.0))
+    stream_path = out_dir / "transcript_segments.jsonl"
+    # A stream only resumes for the same source file and code: anything
+    # else (e.g. a replaced video under the same ID) starts over.
+    fingerprint = cache.fingerprint()
+    header = {
+        "video_id": video_id,
+        "language": language,
+        "model_name": model_name,
+        "backend": asr.name,
+        "input_sha256": fingerprint["inputs"][str(input_path)],
+        "code": fingerprint["code"],
+    }
+    if force and stream_path.exists():
+        stream_path.unlink()
 
-        segments_out.append(
-            {
-                "start": round(start, 3),
-                "end": round(end, 3),
-                "text": text,
-            }
-        )
-        raw_lines.append(text)
+    segments_out, resume_at, done = _resume_stream(stream_path, header)
 
-    formatted = {"video_id": video_id, "segments": segments_out}
+    with stream_path.open("a", encoding="utf-8") as f:
+        if not stream_path.stat().st_size:
+            _append_lines(f, [{"header": header}])
 
-    formatted_path.write_text(
-        json.dumps(formatted, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    raw_path.write_text("\n".join(raw_lines) + "\n", encoding="utf-8")
+        if not done:
+            metrics.current().add(audio_seconds=max(0.0, audio_duration(audio_path) - resume_at))
+            for batch, decoded_until in asr.iter_transcribe(
+                audio_path, language=language, start_at=resume_at
+            ):
+                batch_out = _format_segments(batch)
+                segments_out.extend(batch_out)
+                _append_lines(f, [*batch_out, {"checkpoint": round(decoded_until, 3)}])
+
+            _append_lines(f, [{"done": True}])
 
-    return formatted_path, raw_path
\ No newline at end of file
+    _write_transcript(video_id, segments_out, formatted_path, raw_path)
+    cache.record()
+    return formatted_path, raw_path
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from videorag import metrics
+from videorag.logging import process_segment
+from videorag.pipeline.asr_backends import SAMPLE_RATE, AsrBackend
+from videorag.pipeline.asr_transcription import transcript_cache, write_transcript_outputs
+from videorag.pipeline.audio_cache import AUDIO_FILENAME, audio_duration, extract_audio
+
+DEFAULT_SOCKET = Path("data/asr_worker.sock")
+
+logger = logging.getLogger("rag")
+
+
+def socket_path() -> Path:
+    return Path(os.getenv("VIDEORAG_ASR_SOCKET", str(DEFAULT_SOCKET)))
+
+
+# -----------------------------
+# Client
+# -----------------------------
+def worker_available(path: Path | None = None) -> bool:
+    """True if a worker is accepting connections on the socket."""
+    path = path or socket_path()
+    if not path.exists():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(1.0)
+            s.connect(str(path))
+        return True
+    except OSError:
+        return False
+
+
+def submit_job(
+    *,
+    video_id: str,
+    input_path: Path,
+    derived_root: Path = Path("data/derived"),
+    language: str = "en",
+    force: bool = False,
+    path: Path | None = None,
+) -> Tuple[Path, Path]:
+    """
+    Send one transcription job to the warm worker and block until its
+    transcript files are written. Returns the same paths as
+    transcribe_video_to_derived.
+    """
+    path = path or socket_path()
+    job = {
+        "video_id": video_id,
+        "input_path": str(Path(input_path).resolve()),
+        "derived_root": str(Path(derived_root).resolve()),
+        "language": language,
+        "force": force,
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(path))
+        s.sendall((json.dumps(job) + "\n").encode("utf-8"))
+        with s.makefile("r", encoding="utf-8") as f:
+            reply = json.loads(f.readline() or "{}")
+
+    if not reply.get("ok"):
+        raise RuntimeError(f"ASR worker failed for '{video_id}': {reply.get('error', 'no reply')}")
+    return Path(reply["transcript_segments_path"]), Path(reply["transcript_raw_path"])
+
+
+# -----------------------------
+# Worker
+# -----------------------------
+@dataclass
+class _Job:
+    video_id: str
+    input_path: Path
+    derived_root: Path
+    language: str
+    force: bool = False
+    done: threading.Event = field(default_factory=threading.Event)
+    reply: Dict[str, Any] = field(default_factory=dict)
+
+
+class TranscriptionWorker:
+    """
+    Keeps one ASR backend (and its loaded model) alive and serves jobs.
+
+    Jobs arriving within batch_window seconds of each other are handled as a
+    batch. Clips up to short_clip_seconds are transcribed together, which
+    keeps every worker of the CPU backend busy; longer clips already split
+    into enough pieces on their own and run one at a time.
+    """
+
+    def __init__(
+        self,
+        backend: AsrBackend,
+        *,
+        max_batch: int = 8,
+        batch_window: float = 0.5,
+        short_clip_seconds: float = 120.0,
+    ) -> None:
+        self.backend = backend
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.short_clip_seconds = short_clip_seconds
+        self._jobs: "queue.Queue[_Job]" = queue.Queue()
+
+    def submit(self, job: _Job) -> Dict[str, Any]:
+        self._jobs.put(job)
+        job.done.wait()
+        return job.reply
+
+    def _next_batch(self) -> List[_Job]:
+        batch = [self._jobs.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._jobs.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _audio(self, job: _Job) -> Path:
+        return extract_audio(
+            video_id=job.video_id,
+            input_path=job.input_path,
+            derived_root=job.derived_root,
+        )
+
+    def _finish(self, job: _Job, cache, segments) -> None:
+        formatted_path, raw_path = write_transcript_outputs(
+            video_id=job.video_id,
+            segments=segments,
+            out_dir=job.derived_root / job.video_id,
+            cache=cache,
+        )
+        audio_path = job.derived_root / job.video_id / AUDIO_FILENAME
+        metrics.current().add(jobs=1, audio_seconds=audio_duration(audio_path) if audio_path.exists() else 0.0)
+        job.reply = {
+            "ok": True,
+            "transcript_segments_path": str(formatted_path),
+            "transcript_raw_path": str(raw_path),
+        }
+
+    def _fail(self, job: _Job, exc: Exception) -> None:
+        logger.exception("ASR worker job failed: %s", job.video_id)
+        job.reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    def _run_batch(self, batch: List[_Job]) -> None:
+        todo = []
+        for job in batch:
+            try:
+                out_dir = job.derived_root / job.video_id
+                out_dir.mkdir(parents=True, exist_ok=True)
+                cache = transcript_cache(
+                    video_id=job.video_id,
+                    input_path=job.input_path,
+                    out_dir=out_dir,
+                    language=job.language,
+                    model_name=self.backend.model_name,
+                    backend_name=self.backend.name,
+                )
+                if cache.is_fresh(force=job.force):
+                    job.reply = {
+                        "ok": True,
+                        "transcript_segments_path": str(out_dir / "transcript_segments.json"),
+                        "transcript_raw_path": str(out_dir / "transcript_raw.txt"),
+                    }
+                else:
+                    todo.append((job, cache))
+            except Exception as exc:
+                self._fail(job, exc)
+
+        many = getattr(self.backend, "transcribe_many_audio", None)
+        if many is None:
+            for job, cache in todo:
+                try:
+                    segments = self.backend.transcribe(self._audio(job), language=job.language)
+                    self._finish(job, cache, segments)
+                except Exception as exc:
+                    self._fail(job, exc)
+            return
+
+        short: List[Tuple[_Job, Any, Any]] = []
+        long: List[Tuple[_Job, Any, Any]] = []
+        for job, cache in todo:
+            try:
+                audio = self.backend.load_audio(self._audio(job))
+            except Exception as exc:
+                self._fail(job, exc)
+                continue
+            if len(audio) / SAMPLE_RATE <= self.short_clip_seconds:
+                short.append((job, cache, audio))
+            else:
+                long.append((job, cache, audio))
+
+        # Short clips first, batched per language, so they are not stuck
+        # behind a long recording.
+        for language in sorted({job.language for job, _, _ in short}):
+            group = [item for item in short if item[0].language == language]
+            try:
+                results = many([audio for _, _, audio in group], language=language)
+                for (job, cache, _), segments in zip(group, results):
+                    self._finish(job, cache, segments)
+            except Exception as exc:
+                for job, _, _ in group:
+                    self._fail(job, exc)
+
+        for job, cache, audio in long:
+            try:
+                segments = self.backend.transcribe_audio(audio, language=job.language)
+                self._finish(job, cache, segments)
+            except Exception as exc:
+                self._fail(job, exc)
+
+    def run_forever(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                with process_segment(logger, f"asr_worker batch ({len(batch)} jobs)", stage="asr_worker"):
+                    self._run_batch(batch)
+                # Long-running: export per batch rather than at exit.
+                metrics.export_run()
+            finally:
+                for job in batch:
+                    if not job.reply:
+                        job.reply = {"ok": False, "error": "job was not processed"}
+                    job.done.set()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        worker: TranscriptionWorker = self.server.worker  # type: ignore[attr-defined]
+        line = self.rfile.readline()
+        if not line:
+            # worker_available() probe: connect and hang up.
+            return
+        try:
+            req = json.loads(line)
+            job = _Job(
+                video_id=str(req["video_id"]),
+                input_path=Path(req["input_path"]),
+                derived_root=Path(req.get("derived_root", "data/derived")),
+                language=str(req.get("language", "en")),
+                force=bool(req.get("force", False)),
+            )
+            reply = worker.submit(job)
+        except Exception as exc:
+            reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+
+def serve(backend: AsrBackend, *, path: Path | None = None, **worker_kwargs: Any) -> None:
+    """
+    Load the backend once and serve jobs on a Unix socket until interrupted.
+    """
+    path = path or socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        if worker_available(path):
+            raise RuntimeError(f"An ASR worker is already listening on {path}")
+        path.unlink()
+
+    warm_up = getattr(backend, "warm_up", None)
+    if warm_up is not None:
+        # Start the CPU pool and load the model in every worker up front.
+        warm_up()
+
+    worker = TranscriptionWorker(backend, **worker_kwargs)
+    threading.Thread(target=worker.run_forever, daemon=True).start()
+
+    server = socketserver.ThreadingUnixStreamServer(str(path), _Handler)
+    server.worker = worker  # type: ignore[attr-defined]
+    logger.info("ASR worker (%s, %s) listening on %s", backend.name, backend.model_name, path)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+        close_backend = getattr(backend, "close", None)
+        if close_backend is not None:
+            close_backend()
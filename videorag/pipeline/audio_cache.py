@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from videorag import metrics
+from videorag.logging import metered
+from videorag.pipeline.stage_cache import StageCache
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SAMPLE_RATE = 16000
+AUDIO_FILENAME = "audio_16k_mono.f32"
+
+
+def is_audio_cache(path: Path) -> bool:
+    return Path(path).name.endswith(".f32")
+
+
+@metered("audio")
+def extract_audio(
+    *,
+    video_id: str,
+    input_path: Path,
+    derived_root: Path = Path("data/derived"),
+    force: bool = False,
+) -> Path:
+    """
+    Decode the container once into data/derived/<video_id>/audio_16k_mono.f32:
+    headerless 16 kHz mono float32 PCM (little-endian), the exact format
+    Whisper models consume. Every audio consumer memory-maps this file
+    instead of running ffmpeg on the video again.
+
+    Skipped when the stage cache says the file is up to date.
+    """
+    out_dir = derived_root / video_id
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / AUDIO_FILENAME
+
+    cache = StageCache(
+        derived_dir=out_dir,
+        video_id=video_id,
+        stage="audio",
+        inputs=[input_path],
+        outputs=[out_path],
+        config={"sample_rate": SAMPLE_RATE, "channels": 1, "format": "f32le"},
+        code_files=[__file__],
+    )
+    if cache.is_fresh(force=force):
+        return out_path
+
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg not found on PATH (needed to decode audio).")
+
+    tmp_path = out_path.with_suffix(".f32.tmp")
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error", "-y",
+        "-i", str(input_path),
+        "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-f", "f32le", "-acodec", "pcm_f32le",
+        str(tmp_path),
+    ]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        tmp_path.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg failed for {input_path}: {proc.stderr.strip()}")
+
+    os.replace(tmp_path, out_path)
+    cache.record()
+    metrics.current().add(audio_seconds=audio_duration(out_path))
+    return out_path
+
+
+def open_audio(path: Path) -> np.ndarray:
+    """Read-only memory map of a cached PCM file (no decoding, no copy)."""
+    import numpy as np
+
+    if Path(path).stat().st_size == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(path, dtype="<f4", mode="r")
+
+
+def audio_duration(path: Path) -> float:
+    return Path(path).stat().st_size / 4 / SAMPLE_RATE
+
+
+def read_audio_range(path: Path, t_start: float, t_end: float | None = None) -> np.ndarray:
+    """
+    Samples between t_start and t_end seconds, as a view into the memory
+    map; only the pages actually touched are read from disk.
+    """
+    audio = open_audio(path)
+    a = max(0, int(t_start * SAMPLE_RATE))
+    b = len(audio) if t_end is None else min(len(audio), int(t_end * SAMPLE_RATE))
+    return audio[a:b]
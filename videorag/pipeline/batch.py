@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import fnmatch
+import multiprocessing as mp
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from videorag import metrics
+from videorag.input.paths import VideoPaths, video_paths
+from videorag.input.registry import REGISTRY_PATH, list_video_ids
+from videorag.logging import metered
+from videorag.metrics import StageMetrics
+from videorag.pipeline import stage_cache
+from videorag.pipeline.stage_cache import CacheEvent
+
+STAGES: Tuple[str, ...] = ("transcribe", "events", "chunk", "embed", "index")
+
+# ASR is CPU/GPU heavy, the JSON stages are cheap.
+DEFAULT_WORKERS: Dict[str, int] = {
+    "transcribe": 1,
+    "events": 4,
+    "chunk": 4,
+    # The embedding model already uses every core for one batch.
+    "embed": 1,
+    "index": 2,
+}
+
+
+@dataclass
+class VideoResult:
+    video_id: str
+    completed: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    cache_events: List[CacheEvent] = field(default_factory=list)
+    metrics: List[StageMetrics] = field(default_factory=list)
+    failed_stage: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.failed_stage is None
+
+    @property
+    def cached_stages(self) -> List[str]:
+        return [e.stage for e in self.cache_events if e.hit]
+
+
+# -----------------------------
+# Video selection
+# -----------------------------
+def _stage_output(stage: str, paths: VideoPaths) -> Optional[Path]:
+    if stage == "transcribe":
+        return paths.transcript_segments_path
+    if stage == "events":
+        return paths.events_path
+    if stage == "chunk":
+        return paths.chunks_path
+    if stage == "embed":
+        return paths.embeddings_path
+    # Indexing has no local artifact.
+    return None
+
+
+def _is_indexed(paths: VideoPaths) -> bool:
+    # The index stage records the chunks it wrote in the stage cache, so
+    # a rechunked (or re-embedded) video counts as pending until reindexed.
+    from videorag.db.indexing import index_cache
+
+    return index_cache(paths.video_id, paths.chunks_path).stale_reason() is None
+
+
+def is_processed(paths: VideoPaths, stages: Sequence[str] = STAGES) -> bool:
+    """
+    A video counts as processed when every selected stage's artifact
+    exists and, for "index", its current chunks were indexed.
+    """
+    outputs = [_stage_output(s, paths) for s in stages]
+    if not all(p.exists() for p in outputs if p is not None):
+        return False
+    return "index" not in stages or _is_indexed(paths)
+
+
+def resolve_video_ids(
+    patterns: Iterable[str] = (),
+    *,
+    pending_only: bool = False,
+    stages: Sequence[str] = STAGES,
+    registry_path: Path = REGISTRY_PATH,
+    raw_root: Path = Path("data/raw"),
+    derived_root: Path = Path("data/derived"),
+) -> List[str]:
+    """
+    Expand IDs / glob patterns against the registry.
+
+    - No patterns: every registered video.
+    - Plain IDs that are not registered are kept as-is.
+    - pending_only: drop videos whose stage artifacts already exist.
+    """
+    registered = list_video_ids(registry_path)
+    patterns = list(patterns)
+
+    if not patterns:
+        selected = list(registered)
+    else:
+        selected = []
+        for pat in patterns:
+            if any(ch in pat for ch in "*?["):
+                matches = fnmatch.filter(registered, pat)
+            else:
+                matches = [pat]
+            for vid in matches:
+                if vid not in selected:
+                    selected.append(vid)
+
+    if pending_only:
+        selected = [
+            vid
+            for vid in selected
+            if not is_processed(
+                video_paths(vid, raw_root=raw_root, derived_root=derived_root),
+                stages,
+            )
+        ]
+    return selected
+
+
+# -----------------------------
+# Stage execution (runs in worker processes)
+# -----------------------------
+def _run_stage(
+    stage: str,
+    video_id: str,
+    raw_root: Path,
+    derived_root: Path,
+    force: bool = False,
+) -> Tuple[float, List[CacheEvent], List[StageMetrics]]:
+    # Stage modules are imported lazily so a worker only loads what it needs
+    # (e.g. an index worker never imports the ASR stack).
+    paths = video_paths(video_id, raw_root=raw_root, derived_root=derived_root)
+    stage_cache.drain_report()
+    metrics.drain_metrics()
+    t0 = time.perf_counter()
+
+    if stage == "transcribe":
+        from videorag.pipeline.asr_transcription import transcribe_video_to_derived
+
+        if not paths.raw_video_path.exists():
+            raise FileNotFoundError(f"Raw video not found: {paths.raw_video_path}")
+        transcribe_video_to_derived(
+            video_id=video_id,
+            input_path=paths.raw_video_path,
+            derived_root=derived_root,
+            force=force,
+        )
+    elif stage == "events":
+        from videorag.pipeline.events_builder import build_events_from_asr
+
+        if not paths.transcript_segments_path.exists():
+            raise FileNotFoundError(f"Missing transcript: {paths.transcript_segments_path}")
+        build_events_from_asr(
+            video_id=video_id,
+            transcript_segments_path=paths.transcript_segments_path,
+            derived_root=derived_root,
+            artifact_format=paths.artifact_format,
+            force=force,
+        )
+    elif stage == "chunk":
+        from videorag.pipeline.chunk_events import (
+            chunk_events_to_file,
+            default_chunking_config,
+        )
+
+        if not paths.events_path.exists():
+            raise FileNotFoundError(f"Missing events file: {paths.events_path}")
+        chunk_events_to_file(
+            video_id=video_id,
+            events_path=paths.events_path,
+            derived_root=derived_root,
+            cfg=default_chunking_config(),
+            artifact_format=paths.artifact_format,
+            force=force,
+        )
+    elif stage == "embed":
+        from videorag.pipeline.embeddings import embed_chunks_to_file
+
+        if not paths.chunks_path.exists():
+            raise FileNotFoundError(f"Missing chunks file: {paths.chunks_path}")
+        embed_chunks_to_file(
+            video_id=video_id,
+            chunks_path=paths.chunks_path,
+            derived_root=derived_root,
+            force=force,
+        )
+    elif stage == "index":
+        from videorag.db.indexing import index_chunks_for_video
+
+        index_chunks_for_video(video_id=video_id, chunks_path=paths.chunks_path)
+    else:
+        raise ValueError(f"Unknown stage: {stage}")
+
+    return time.perf_counter() - t0, stage_cache.drain_report(), metrics.drain_metrics()
+
+
+# -----------------------------
+# Batch runner
+# -----------------------------
+@metered("batch")
+def run_batch(
+    video_ids: Sequence[str],
+    *,
+    stages: Sequence[str] = STAGES,
+    workers: Optional[Mapping[str, int]] = None,
+    raw_root: Path = Path("data/raw"),
+    derived_root: Path = Path("data/derived"),
+    force: bool = False,
+) -> List[VideoResult]:
+    """
+    Run the selected stages for many videos.
+
+    Each stage has its own process pool, and a video moves on to the next
+    stage as soon as its previous stage finishes, so cheap stages keep
+    running while ASR is still busy with other videos. A failure stops that
+    video only; the others carry on.
+
+    Stages whose stage-cache entry is up to date are no-ops unless force=True.
+
+    Metrics the workers record are collected into res.metrics and this
+    process's metrics registry.
+    """
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+    # Keep canonical order regardless of how stages were passed in.
+    stages = [s for s in STAGES if s in stages]
+
+    worker_counts = dict(DEFAULT_WORKERS)
+    worker_counts.update(workers or {})
+
+    results = {vid: VideoResult(video_id=vid) for vid in video_ids}
+    if not stages or not video_ids:
+        return list(results.values())
+
+    # spawn: torch / MLX are not fork-safe
+    ctx = mp.get_context("spawn")
+    executors = {
+        stage: ProcessPoolExecutor(max_workers=max(1, worker_counts[stage]), mp_context=ctx)
+        for stage in stages
+    }
+    pending: Dict[Future, Tuple[str, int]] = {}
+
+    def submit(vid: str, stage_idx: int) -> None:
+        stage = stages[stage_idx]
+        fut = executors[stage].submit(
+            _run_stage, stage, vid, raw_root, derived_root, force
+        )
+        pending[fut] = (vid, stage_idx)
+
+    try:
+        for vid in video_ids:
+            submit(vid, 0)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                vid, stage_idx = pending.pop(fut)
+                stage = stages[stage_idx]
+                res = results[vid]
+                try:
+                    res.timings[stage], events, records = fut.result()
+                except Exception as exc:
+                    res.failed_stage = stage
+                    res.error = f"{type(exc).__name__}: {exc}"
+                    continue
+
+                res.cache_events.extend(events)
+                res.metrics.extend(records)
+                metrics.REGISTRY.extend(records)
+                res.completed.append(stage)
+                if stage_idx + 1 < len(stages):
+                    submit(vid, stage_idx + 1)
+    finally:
+        for ex in executors.values():
+            ex.shutdown(wait=True, cancel_futures=True)
+
+    return [results[vid] for vid in video_ids]
+
+
+def format_summary(results: Sequence[VideoResult]) -> str:
+    lines = []
+    for res in results:
+        cached = res.cached_stages
+        timing = ", ".join(
+            f"{s} cached" if s in cached else f"{s} {res.timings[s]:.1f}s"
+            for s in res.completed
+        )
+        if res.ok:
+            lines.append(f"  OK    {res.video_id}  ({timing or 'nothing to do'})")
+        else:
+            done = f"; done: {timing}" if timing else ""
+            lines.append(f"  FAIL  {res.video_id}  [{res.failed_stage}] {res.error}{done}")
+
+    n_ok = sum(1 for r in results if r.ok)
+    lines.append(f"{n_ok}/{len(results)} videos succeeded.")
+
+    cache_events = [e for r in results for e in r.cache_events]
+    hits = sum(1 for e in cache_events if e.hit)
+    lines.append(f"Stage cache: {hits} hit(s), {len(cache_events) - hits} miss(es).")
+    return "\n".join(lines)
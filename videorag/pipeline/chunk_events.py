@@ -1,11 +1,26 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-import tiktoken
+import numpy as np
+
+from videorag import metrics
+from videorag.logging import metered
+from videorag.pipeline.columnar import MISSING, artifact_suffix, is_columnar, load_payload, open_columnar, write_payload
+from videorag.pipeline.stage_cache import StageCache
+from videorag.pipeline.tokens import DEFAULT_TOKENIZER, count_tokens, tokenizer_id
+
+TOKENIZER_NAME = DEFAULT_TOKENIZER
+
+# "inline": every chunk carries its text. "events": chunks keep only their
+# event_range and the text is rebuilt from events.json on load (no overlap
+# text stored twice; see materialize_chunk_texts).
+TEXT_LAYOUTS = ("inline", "events")
 
 
 # -----------------------------
@@ -22,154 +37,436 @@ def default_chunking_config() -> ChunkingConfig:
     return ChunkingConfig()
 
 
+def config_hash(cfg: ChunkingConfig) -> str:
+    """Short stable id of a config, used in chunks.<hash>.json file names."""
+    blob = json.dumps({**asdict(cfg), "tokenizer": TOKENIZER_NAME}, sort_keys=True)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:10]
+
+
 # -----------------------------
 # IO
 # -----------------------------
-def _load_events(events_path: Path) -> Tuple[str, List[Dict[str, Any]]]:
-    data = json.loads(events_path.read_text(encoding="utf-8"))
+@dataclass
+class _Events:
+    """
+    A video's events with text, sorted by (t_start, t_end), as parallel
+    columns. Type codes are numbered in order of first appearance.
+    """
+
+    texts: List[str]
+    t_start: np.ndarray
+    t_end: np.ndarray
+    type_codes: np.ndarray
+    type_names: List[str]
+    # Counts stored by the events builder (None unless every event has one).
+    token_counts: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+def _sorted_events(
+    texts: List[str],
+    t_start: np.ndarray,
+    t_end: np.ndarray,
+    type_codes: np.ndarray,
+    type_names: List[str],
+    token_counts: Optional[np.ndarray],
+) -> _Events:
+    # lexsort is stable: ties keep file order, like sorted() did.
+    order = np.lexsort((t_end, t_start))
+    codes = type_codes[order]
+    present, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    rank = np.empty(len(present), dtype=np.int64)
+    rank[np.argsort(first, kind="stable")] = np.arange(len(present))
+    return _Events(
+        texts=[texts[i] for i in order.tolist()],
+        t_start=t_start[order],
+        t_end=t_end[order],
+        type_codes=rank[inverse.reshape(-1)],
+        type_names=[type_names[c] for c in present[np.argsort(first, kind="stable")].tolist()],
+        token_counts=token_counts[order].tolist() if token_counts is not None else None,
+    )
 
-    video_id = str(data.get("video_id", "")).strip()
-    events = data.get("events", [])
 
-    cleaned: List[Dict[str, Any]] = []
-    for idx, e in enumerate(events):
+def _load_columnar_events(events_path: Path) -> Tuple[str, _Events, Optional[str]]:
+    # Straight from the mapped columns: no per-event dicts.
+    with open_columnar(events_path) as art:
+        texts = [t.strip() for t in art.iter_text()]
+        keep = np.flatnonzero([bool(t) for t in texts])
+        token_counts = art["token_count"][keep]
+        names = [name or "asr" for name in art.categories["type"]]
+        events = _sorted_events(
+            [texts[i] for i in keep.tolist()],
+            art["t_start"][keep],
+            art["t_end"][keep],
+            art["type"][keep].astype(np.int64),
+            names,
+            None if (token_counts == MISSING).any() else token_counts,
+        )
+        return str(art.video_id).strip(), events, art.meta.get("tokenizer")
+
+
+def _load_events(events_path: Path) -> Tuple[str, _Events, Optional[str]]:
+    """
+    Returns (video_id, events, tokenizer). Events keep a stored
+    "token_count" when present; tokenizer names what produced those counts.
+    """
+    if is_columnar(events_path):
+        return _load_columnar_events(events_path)
+
+    data = load_payload(events_path)
+
+    video_id = str(data.get("video_id", "")).strip()
+    tokenizer = data.get("tokenizer")
+
+    texts: List[str] = []
+    t_start: List[float] = []
+    t_end: List[float] = []
+    codes: List[int] = []
+    code_of: Dict[str, int] = {}
+    token_counts: Optional[List[int]] = []
+    for e in data.get("events", []):
         text = (e.get("text") or "").strip()
         if not text:
             continue
+        start = float(e.get("t_start", e.get("t", 0.0)))
+        texts.append(text)
+        t_start.append(start)
+        t_end.append(float(e.get("t_end", e.get("t", start))))
+        codes.append(code_of.setdefault(str(e.get("type", "asr")), len(code_of)))
+        if token_counts is not None:
+            if "token_count" in e:
+                token_counts.append(int(e["token_count"]))
+            else:
+                token_counts = None
+
+    return video_id, _sorted_events(
+        texts,
+        np.array(t_start, dtype=np.float64),
+        np.array(t_end, dtype=np.float64),
+        np.array(codes, dtype=np.int64),
+        list(code_of),
+        np.array(token_counts, dtype=np.int64) if token_counts is not None else None,
+    ), tokenizer
+
+
+def _event_token_counts(events: _Events, tokenizer: Optional[str]) -> List[int]:
+    # Reuse counts stored by the events builder when they come from our tokenizer.
+    if tokenizer == tokenizer_id(TOKENIZER_NAME) and events.token_counts is not None:
+        return events.token_counts
+    return count_tokens(events.texts, name=TOKENIZER_NAME)
 
-        t_start = float(e.get("t_start", e.get("t", 0.0)))
-        t_end = float(e.get("t_end", e.get("t", t_start)))
-
-        cleaned.append(
-            {
-                "event_id": idx,
-                "type": str(e.get("type", "asr")),
-                "t_start": t_start,
-                "t_end": t_end,
-                "text": text,
-            }
-        )
 
-    cleaned.sort(key=lambda x: (x["t_start"], x["t_end"]))
-    return video_id, cleaned
+# -----------------------------
+# Chunking engine
+# -----------------------------
+class _EventIndex:
+    """
+    Per-video lookup tables shared by every ChunkingConfig:
+
+    - prefix[k]: tokens of events [0, k), so any range sum is O(1) and the
+      greedy boundary / overlap searches are binary searches;
+    - t_end as an array for range max (events are sorted by t_start, so the
+      range min of t_start is simply its first event);
+    - per-type prefix counts and positions for event_counts.
+    """
+
+    def __init__(self, events: _Events, event_tokens: Sequence[int]) -> None:
+        n = len(events)
+        self.n = n
+        self.texts = events.texts
+        self.t_start: List[float] = events.t_start.tolist()
+        self.t_end = events.t_end
+
+        prefix = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.asarray(event_tokens, dtype=np.int64), out=prefix[1:])
+        # Plain ints: bisect and scalar lookups are much faster on a list.
+        self.prefix: List[int] = prefix.tolist()
+
+        codes = events.type_codes
+        self.types = events.type_names
+        self._type_prefix: Dict[str, np.ndarray] = {}
+        self._type_pos: Dict[str, np.ndarray] = {}
+        if len(self.types) == 1:
+            return
+        for k, t in enumerate(self.types):
+            mask = codes == k
+            pre = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(mask, out=pre[1:])
+            self._type_prefix[t] = pre
+            self._type_pos[t] = np.flatnonzero(mask)
+
+    def max_t_end(self, starts: np.ndarray, ends: np.ndarray) -> List[float]:
+        """max(t_end[s..e]) for every inclusive range (s, e)."""
+        if len(starts) == 0:
+            return []
+        # reduceat over interleaved [s, e + 1] bounds; the padding element
+        # lets e + 1 == n be a valid index.
+        padded = np.append(self.t_end, 0.0)
+        bounds = np.column_stack([starts, ends + 1]).ravel()
+        return np.maximum.reduceat(padded, bounds)[::2].tolist()
+
+    def event_counts(self, starts: np.ndarray, ends: np.ndarray) -> List[Dict[str, int]]:
+        """Events per type for every range, keyed in order of first appearance."""
+        if len(self.types) == 1:
+            t = self.types[0]
+            return [{t: c} for c in (ends - starts + 1).tolist()]
+
+        columns = []
+        for t in self.types:
+            pre, pos = self._type_prefix[t], self._type_pos[t]
+            counts = (pre[ends + 1] - pre[starts]).tolist()
+            first = pos[np.minimum(np.searchsorted(pos, starts), len(pos) - 1)].tolist()
+            columns.append((t, counts, first))
+
+        out: List[Dict[str, int]] = []
+        for k in range(len(starts)):
+            present = sorted((first[k], t, counts[k]) for t, counts, first in columns if counts[k])
+            out.append({t: cnt for _, t, cnt in present})
+        return out
+
+
+def _chunk_ranges(index: _EventIndex, cfg: ChunkingConfig) -> List[Tuple[int, int]]:
+    """
+    Inclusive event ranges of each chunk.
+
+    Greedy fill up to chunk_tokens (the first event is always taken), then
+    take one more event if that lands closer to chunk_tokens without
+    exceeding max_tokens. The next chunk starts so that at least
+    overlap_tokens of trailing events are repeated, and always advances by
+    at least one event.
+    """
+    P = index.prefix
+    n = index.n
+    ranges: List[Tuple[int, int]] = []
+
+    i = 0
+    while i < n:
+        s = i
+        # Largest e with P[e + 1] - P[s] <= chunk_tokens, at least s.
+        e = max(s, bisect_right(P, P[s] + cfg.chunk_tokens, s + 1) - 2)
+
+        if e + 1 < n:
+            # ----- closest-to-boundary decision -----
+            token_count = P[e + 1] - P[s]
+            next_tokens = P[e + 2] - P[s]
+            diff_stop = abs(cfg.chunk_tokens - token_count)
+            diff_add = abs(cfg.chunk_tokens - next_tokens)
+            if diff_add <= diff_stop and next_tokens <= cfg.max_tokens:
+                e += 1
+
+        ranges.append((s, e))
+
+        # -----------------------------
+        # Token-based overlap (event-aligned): the latest start m in [s, e]
+        # whose tail P[e + 1] - P[m] covers overlap_tokens.
+        # -----------------------------
+        if cfg.overlap_tokens <= 0:
+            m = e + 1
+        else:
+            m = max(s, bisect_right(P, P[e + 1] - cfg.overlap_tokens, s, e + 1) - 1)
+
+        i = max(m, s + 1)
+
+    return ranges
+
+
+def _build_chunks(index: _EventIndex, cfg: ChunkingConfig, *, with_text: bool = True) -> List[Dict[str, Any]]:
+    ranges = _chunk_ranges(index, cfg)
+    starts = np.array([s for s, _ in ranges], dtype=np.int64)
+    ends = np.array([e for _, e in ranges], dtype=np.int64)
+    ts_end = index.max_t_end(starts, ends)
+    event_counts = index.event_counts(starts, ends)
+
+    P = index.prefix
+    chunks: List[Dict[str, Any]] = []
+    for chunk_id, (s, e) in enumerate(ranges):
+        chunk: Dict[str, Any] = {
+            "chunk_id": chunk_id,
+            "ts_start": round(index.t_start[s], 3),
+            "ts_end": round(ts_end[chunk_id], 3),
+        }
+        if with_text:
+            chunk["text"] = " ".join(index.texts[s : e + 1])
+        chunk["event_range"] = [s, e]
+        chunk["event_counts"] = event_counts[chunk_id]
+        chunk["token_count"] = P[e + 1] - P[s]
+        chunks.append(chunk)
+    return chunks
+
+
+def _payload(
+    video_id: str, cfg: ChunkingConfig, chunks: List[Dict[str, Any]], text_layout: str = "inline"
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "video_id": video_id,
+        "config": {
+            "chunk_tokens": cfg.chunk_tokens,
+            "overlap_tokens": cfg.overlap_tokens,
+            "max_tokens": cfg.max_tokens,
+            "tokenizer": tokenizer_id(TOKENIZER_NAME),
+        },
+        "chunks": chunks,
+    }
+    if text_layout != "inline":
+        payload["text_layout"] = text_layout
+    return payload
+
+
+def _check_text_layout(text_layout: str, artifact_format: str) -> None:
+    if text_layout not in TEXT_LAYOUTS:
+        raise ValueError(f"Unknown text layout '{text_layout}'. Choose from: {TEXT_LAYOUTS}")
+    if text_layout == "events" and artifact_format != "json":
+        raise ValueError("text_layout='events' is only supported for JSON chunks files.")
+
+
+def materialize_chunk_texts(payload: Dict[str, Any], events_path: Path) -> Dict[str, Any]:
+    """
+    Fill in the text of a text_layout="events" chunks payload from its
+    events file, in place. The result is what the inline layout stores.
+    """
+    texts = _load_events(events_path)[1].texts
+    for ch in payload.get("chunks", []):
+        s, e = ch["event_range"]
+        ch["text"] = " ".join(texts[s : e + 1])
+    payload.pop("text_layout", None)
+    return payload
+
+
+def _chunk_cache(
+    *,
+    video_id: str,
+    stage: str,
+    events_path: Path,
+    out_path: Path,
+    cfg: ChunkingConfig,
+    text_layout: str = "inline",
+) -> StageCache:
+    config: Dict[str, Any] = {**asdict(cfg), "tokenizer": TOKENIZER_NAME}
+    if text_layout != "inline":
+        # Only recorded when set, so existing inline caches stay fresh.
+        config["text_layout"] = text_layout
+    return StageCache(
+        derived_dir=out_path.parent,
+        video_id=video_id,
+        stage=stage,
+        inputs=[events_path],
+        outputs=[out_path],
+        config=config,
+        code_files=[__file__],
+    )
 
 
 # -----------------------------
 # Chunking
 # -----------------------------
+@metered("chunk")
 def chunk_events_to_file(
     *,
     video_id: str,
     events_path: Path,
     derived_root: Path = Path("data/derived"),
     cfg: ChunkingConfig | None = None,
+    artifact_format: str = "json",
+    text_layout: str = "inline",
+    force: bool = False,
 ) -> Path:
+    """
+    Chunk events.json into token-bounded, overlapping chunks (chunks.json).
+    events_path may also be a columnar events.vrc; artifact_format="columnar"
+    writes chunks.vrc. text_layout="events" leaves the text out of
+    chunks.json; load_payload rebuilds it from the events file.
+
+    Skipped when the stage cache says chunks.json is up to date for this
+    events file and config.
+    """
 
     if cfg is None:
         cfg = default_chunking_config()
+    _check_text_layout(text_layout, artifact_format)
 
-    file_video_id, events = _load_events(events_path)
+    file_video_id, events, tokenizer = _load_events(events_path)
     if not video_id:
         video_id = file_video_id or events_path.parent.name
 
     out_dir = derived_root / video_id
     out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / "chunks.json"
-
-    enc = tiktoken.get_encoding("cl100k_base")
-
-    # Precompute token counts per event
-    event_tokens = [len(enc.encode(e["text"])) for e in events]
-
-    chunks: List[Dict[str, Any]] = []
-
-    i = 0
-    chunk_id = 0
+    out_path = out_dir / f"chunks{artifact_suffix(artifact_format)}"
+
+    cache = _chunk_cache(
+        video_id=video_id,
+        stage="chunk",
+        events_path=events_path,
+        out_path=out_path,
+        cfg=cfg,
+        text_layout=text_layout,
+    )
+    if cache.is_fresh(force=force):
+        return out_path
 
-    while i < len(events):
-        start_i = i
-        token_count = 0
-        end_i = i - 1
+    # Token counts per event (stored by the events builder, or computed now)
+    index = _EventIndex(events, _event_token_counts(events, tokenizer))
 
-        while i < len(events):
-            next_tokens = token_count + event_tokens[i]
+    chunks = _build_chunks(index, cfg, with_text=text_layout == "inline")
+    write_payload(_payload(video_id, cfg, chunks, text_layout), out_path)
+    cache.record()
+    metrics.current().add(events=index.n, tokens=index.prefix[-1], chunks=len(chunks))
 
-            # Always allow first event
-            if i == start_i:
-                token_count = next_tokens
-                end_i = i
-                i += 1
-                continue
+    return out_path
 
-            if next_tokens <= cfg.chunk_tokens:
-                token_count = next_tokens
-                end_i = i
-                i += 1
-                continue
 
-            # ----- closest-to-boundary decision -----
-            diff_stop = abs(cfg.chunk_tokens - token_count)
-            diff_add = abs(cfg.chunk_tokens - next_tokens)
+@metered("chunk_multi")
+def chunk_events_multi(
+    *,
+    video_id: str,
+    events_path: Path,
+    cfgs: Sequence[ChunkingConfig],
+    derived_root: Path = Path("data/derived"),
+    artifact_format: str = "json",
+    text_layout: str = "inline",
+    force: bool = False,
+) -> Dict[ChunkingConfig, Path]:
+    """
+    Chunk one video with several configs in a single pass: events are
+    loaded, counted and indexed once, then each config only runs its
+    boundary search. Each result is written to chunks.<config_hash>.json
+    (or .vrc) next to chunks.json; the content for a given config is the
+    same as chunk_events_to_file would produce.
+    """
+    _check_text_layout(text_layout, artifact_format)
+    file_video_id, events, tokenizer = _load_events(events_path)
+    if not video_id:
+        video_id = file_video_id or events_path.parent.name
 
-            if diff_add <= diff_stop and next_tokens <= cfg.max_tokens:
-                token_count = next_tokens
-                end_i = i
-                i += 1
-
-            break
-
-        # Build chunk
-        texts = [events[k]["text"] for k in range(start_i, end_i + 1)]
-        chunk_text = " ".join(texts)
-
-        ts_start = min(events[k]["t_start"] for k in range(start_i, end_i + 1))
-        ts_end = max(events[k]["t_end"] for k in range(start_i, end_i + 1))
-
-        counts: Dict[str, int] = {}
-        for k in range(start_i, end_i + 1):
-            t = events[k]["type"]
-            counts[t] = counts.get(t, 0) + 1
-
-        chunks.append(
-            {
-                "chunk_id": chunk_id,
-                "ts_start": round(ts_start, 3),
-                "ts_end": round(ts_end, 3),
-                "text": chunk_text,
-                "event_range": [start_i, end_i],
-                "event_counts": counts,
-                "token_count": token_count,
-            }
+    out_dir = derived_root / video_id
+    out_dir.mkdir(parents=True, exist_ok=True)
+    suffix = artifact_suffix(artifact_format)
+
+    outputs: Dict[ChunkingConfig, Path] = {}
+    index: Optional[_EventIndex] = None
+    for cfg in cfgs:
+        h = config_hash(cfg)
+        out_path = out_dir / f"chunks.{h}{suffix}"
+        outputs[cfg] = out_path
+
+        cache = _chunk_cache(
+            video_id=video_id,
+            stage=f"chunk.{h}",
+            events_path=events_path,
+            out_path=out_path,
+            cfg=cfg,
+            text_layout=text_layout,
         )
-        chunk_id += 1
-
-        # -----------------------------
-        # Token-based overlap (event-aligned)
-        # -----------------------------
-        overlap_budget = cfg.overlap_tokens
-        back_tokens = 0
-        j = end_i
-
-        while j >= start_i and back_tokens < overlap_budget:
-            back_tokens += event_tokens[j]
-            j -= 1
-
-        i = max(j + 1, start_i + 1)
-
-    payload = {
-        "video_id": video_id,
-        "config": {
-            "chunk_tokens": cfg.chunk_tokens,
-            "overlap_tokens": cfg.overlap_tokens,
-            "max_tokens": cfg.max_tokens,
-            "tokenizer": "tiktoken::cl100k_base",
-        },
-        "chunks": chunks,
-    }
+        if cache.is_fresh(force=force):
+            continue
 
-    out_path.write_text(
-        json.dumps(payload, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+        if index is None:
+            index = _EventIndex(events, _event_token_counts(events, tokenizer))
+            metrics.current().add(events=index.n, tokens=index.prefix[-1])
+        chunks = _build_chunks(index, cfg, with_text=text_layout == "inline")
+        write_payload(_payload(video_id, cfg, chunks, text_layout), out_path)
+        cache.record()
+        metrics.current().add(configs=1, chunks=len(chunks))
 
-    return out_path
\ No newline at end of file
+    return outputs
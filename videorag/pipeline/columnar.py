@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+# File layout (all little-endian):
+#   8 bytes   magic
+#   8 bytes   header length (uint64)
+#   header    UTF-8 JSON: kind, video_id, n_rows, meta, columns, categories
+#   columns   raw arrays, each starting on a 64-byte boundary
+#
+# Text is one concatenated UTF-8 blob ("text" column, uint8) plus an
+# n_rows + 1 "text_offsets" column, so text i is blob[off[i]:off[i + 1]].
+MAGIC = b"VRCOL\x00\x01\x00"
+ALIGN = 64
+SUFFIX = ".vrc"
+
+# Numeric columns per artifact kind (name, dtype).
+EVENT_COLUMNS = (
+    ("event_id", "<i8"),
+    ("t_start", "<f8"),
+    ("t_end", "<f8"),
+    ("token_count", "<i8"),
+)
+CHUNK_COLUMNS = (
+    ("chunk_id", "<i8"),
+    ("ts_start", "<f8"),
+    ("ts_end", "<f8"),
+    ("event_start", "<i8"),
+    ("event_end", "<i8"),
+    ("token_count", "<i8"),
+)
+# String columns with few distinct values, stored as uint16 codes.
+EVENT_CATEGORIES = ("type", "source")
+
+MISSING = -1
+
+ARTIFACT_FORMATS = ("json", "columnar")
+
+
+def artifact_suffix(artifact_format: str) -> str:
+    if artifact_format == "json":
+        return ".json"
+    if artifact_format == "columnar":
+        return SUFFIX
+    raise ValueError(f"Unknown artifact format '{artifact_format}'. Choose from: {ARTIFACT_FORMATS}")
+
+
+def is_columnar(path: Path) -> bool:
+    return Path(path).suffix == SUFFIX
+
+
+# -----------------------------
+# Writing
+# -----------------------------
+def _write_file(
+    path: Path,
+    *,
+    kind: str,
+    video_id: str,
+    meta: Mapping[str, Any],
+    columns: Mapping[str, np.ndarray],
+    categories: Mapping[str, List[str]],
+) -> Path:
+    n_rows = len(columns["text_offsets"]) - 1
+    col_specs: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, arr in columns.items():
+        offset = -(-offset // ALIGN) * ALIGN
+        col_specs[name] = {"dtype": arr.dtype.str, "offset": offset, "length": int(arr.shape[0])}
+        offset += arr.nbytes
+
+    header = {
+        "kind": kind,
+        "video_id": video_id,
+        "n_rows": n_rows,
+        "meta": dict(meta),
+        "categories": dict(categories),
+        "columns": col_specs,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = -(-(16 + len(header_bytes)) // ALIGN) * ALIGN
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, arr in columns.items():
+            pos = data_start + col_specs[name]["offset"]
+            f.write(b"\x00" * (pos - f.tell()))
+            f.write(np.ascontiguousarray(arr).tobytes())
+    os.replace(tmp, path)
+    return path
+
+
+def _text_columns(texts: Sequence[str]) -> Dict[str, np.ndarray]:
+    encoded = [t.encode("utf-8") for t in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return {"text_offsets": offsets, "text": blob}
+
+
+def _encode_categories(values: Sequence[str]) -> tuple[np.ndarray, List[str]]:
+    cats: Dict[str, int] = {}
+    codes = np.array([cats.setdefault(v, len(cats)) for v in values], dtype="<u2")
+    return codes, list(cats)
+
+
+def write_events(payload: Mapping[str, Any], path: Path) -> Path:
+    """Write an events.json-shaped payload as a columnar file."""
+    events = payload.get("events", [])
+    columns: Dict[str, np.ndarray] = {}
+    for name, dtype in EVENT_COLUMNS:
+        columns[name] = np.array([e.get(name, MISSING) for e in events], dtype=dtype)
+
+    categories: Dict[str, List[str]] = {}
+    for name in EVENT_CATEGORIES:
+        columns[name], categories[name] = _encode_categories([str(e.get(name, "")) for e in events])
+
+    columns.update(_text_columns([e["text"] for e in events]))
+    meta = {k: v for k, v in payload.items() if k not in ("video_id", "events")}
+    return _write_file(
+        path,
+        kind="events",
+        video_id=str(payload.get("video_id", "")),
+        meta=meta,
+        columns=columns,
+        categories=categories,
+    )
+
+
+def write_chunks(payload: Mapping[str, Any], path: Path) -> Path:
+    """
+    Write a chunks.json-shaped payload as a columnar file.
+
+    event_counts become one count column per event type ("count:<type>").
+    """
+    chunks = payload.get("chunks", [])
+    columns: Dict[str, np.ndarray] = {}
+    for name, dtype in CHUNK_COLUMNS:
+        if name in ("event_start", "event_end"):
+            idx = 0 if name == "event_start" else 1
+            values = [ch["event_range"][idx] for ch in chunks]
+        else:
+            values = [ch.get(name, MISSING) for ch in chunks]
+        columns[name] = np.array(values, dtype=dtype)
+
+    types: List[str] = []
+    for ch in chunks:
+        for t in ch.get("event_counts", {}):
+            if t not in types:
+                types.append(t)
+    for t in types:
+        columns[f"count:{t}"] = np.array(
+            [ch.get("event_counts", {}).get(t, 0) for ch in chunks], dtype="<i8"
+        )
+
+    columns.update(_text_columns([ch["text"] for ch in chunks]))
+    meta = {k: v for k, v in payload.items() if k not in ("video_id", "chunks")}
+    return _write_file(
+        path,
+        kind="chunks",
+        video_id=str(payload.get("video_id", "")),
+        meta=meta,
+        columns=columns,
+        categories={"event_types": types},
+    )
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+class ColumnarArtifact:
+    """
+    Read-only, memory-mapped view of a .vrc file.
+
+    Columns are NumPy arrays backed by the mapping, and text is decoded one
+    row at a time, so opening a file costs only the header parse no matter
+    how many rows it has.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:8] != MAGIC:
+            raise ValueError(f"Not a columnar artifact: {self.path}")
+        (header_len,) = struct.unpack("<Q", self._mm[8:16])
+        header = json.loads(self._mm[16 : 16 + header_len].decode("utf-8"))
+        data_start = -(-(16 + header_len) // ALIGN) * ALIGN
+
+        self.kind: str = header["kind"]
+        self.video_id: str = header["video_id"]
+        self.meta: Dict[str, Any] = header["meta"]
+        self.categories: Dict[str, List[str]] = header["categories"]
+        self._n = int(header["n_rows"])
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.frombuffer(
+                self._mm,
+                dtype=np.dtype(spec["dtype"]),
+                count=spec["length"],
+                offset=data_start + spec["offset"],
+            )
+            for name, spec in header["columns"].items()
+        }
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __enter__(self) -> "ColumnarArtifact":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Arrays keep the buffer alive; drop them before closing the map.
+        self.columns = {}
+        try:
+            self._mm.close()
+        except BufferError:
+            # Some caller still holds a column view; the map is released
+            # when that view goes away.
+            pass
+
+    def text(self, i: int) -> str:
+        off = self.columns["text_offsets"]
+        a, b = int(off[i]), int(off[i + 1])
+        return self.columns["text"][a:b].tobytes().decode("utf-8")
+
+    def iter_text(self, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        stop = self._n if stop is None else stop
+        for i in range(start, stop):
+            yield self.text(i)
+
+    def category(self, name: str, i: int) -> str:
+        return self.categories[name][int(self.columns[name][i])]
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Row i as the dict events.json / chunks.json would hold."""
+        c = self.columns
+        if self.kind == "events":
+            e: Dict[str, Any] = {
+                "type": self.category("type", i),
+                "t_start": float(c["t_start"][i]),
+                "t_end": float(c["t_end"][i]),
+                "text": self.text(i),
+                "source": self.category("source", i),
+            }
+            for name in ("event_id", "token_count"):
+                if int(c[name][i]) != MISSING:
+                    e[name] = int(c[name][i])
+            return e
+        counts = ((t, int(c[f"count:{t}"][i])) for t in self.categories["event_types"])
+        return {
+            "chunk_id": int(c["chunk_id"][i]),
+            "ts_start": float(c["ts_start"][i]),
+            "ts_end": float(c["ts_end"][i]),
+            "text": self.text(i),
+            "event_range": [int(c["event_start"][i]), int(c["event_end"][i])],
+            "event_counts": {t: n for t, n in counts if n},
+            "token_count": int(c["token_count"][i]),
+        }
+
+    # ---- materialisation (conversion / compatibility) ----
+    def to_payload(self) -> Dict[str, Any]:
+        """Rebuild the equivalent events.json / chunks.json payload."""
+        if self.kind == "events":
+            return {"video_id": self.video_id, "events": self._event_records(), **self.meta}
+        return {"video_id": self.video_id, **self.meta, "chunks": self._chunk_records()}
+
+    def _event_records(self) -> List[Dict[str, Any]]:
+        cols = {name: self.columns[name].tolist() for name, _ in EVENT_COLUMNS}
+        out = []
+        for i in range(self._n):
+            e: Dict[str, Any] = {
+                "type": self.category("type", i),
+                "t_start": cols["t_start"][i],
+                "t_end": cols["t_end"][i],
+                "text": self.text(i),
+                "source": self.category("source", i),
+            }
+            if cols["event_id"][i] != MISSING:
+                e["event_id"] = cols["event_id"][i]
+            if cols["token_count"][i] != MISSING:
+                e["token_count"] = cols["token_count"][i]
+            out.append(e)
+        return out
+
+    def _chunk_records(self) -> List[Dict[str, Any]]:
+        cols = {name: self.columns[name].tolist() for name, _ in CHUNK_COLUMNS}
+        counts = {t: self.columns[f"count:{t}"].tolist() for t in self.categories["event_types"]}
+        out = []
+        for i in range(self._n):
+            out.append(
+                {
+                    "chunk_id": cols["chunk_id"][i],
+                    "ts_start": cols["ts_start"][i],
+                    "ts_end": cols["ts_end"][i],
+                    "text": self.text(i),
+                    "event_range": [cols["event_start"][i], cols["event_end"][i]],
+                    "event_counts": {t: c[i] for t, c in counts.items() if c[i]},
+                    "token_count": cols["token_count"][i],
+                }
+            )
+        return out
+
+
+def open_columnar(path: Path) -> ColumnarArtifact:
+    return ColumnarArtifact(path)
+
+
+# -----------------------------
+# Conversion
+# -----------------------------
+def _sibling_events(path: Path) -> Path:
+    for name in ("events.json", f"events{SUFFIX}"):
+        candidate = path.parent / name
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"{path} stores chunk text as event ranges but no events file is next to it.")
+
+
+def load_payload(path: Path) -> Dict[str, Any]:
+    """
+    Load events/chunks as a JSON-style payload, whatever the format.
+    Chunks written with text_layout="events" get their text rebuilt from
+    the events file in the same directory.
+    """
+    if is_columnar(path):
+        with open_columnar(path) as art:
+            return art.to_payload()
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    if payload.get("text_layout") == "events":
+        from videorag.pipeline.chunk_events import materialize_chunk_texts
+
+        materialize_chunk_texts(payload, _sibling_events(Path(path)))
+    return payload
+
+
+def read_chunk_spans(path: Path) -> List[Tuple[int, int, int, float, float, int]]:
+    """
+    (chunk_id, event_start, event_end, ts_start, ts_end, token_count) per
+    chunk, without loading chunk text: read from the columns of a .vrc
+    file, or from chunks.json as stored (any text layout).
+    """
+    if is_columnar(path):
+        with open_columnar(path) as art:
+            return list(
+                zip(
+                    art["chunk_id"].tolist(),
+                    art["event_start"].tolist(),
+                    art["event_end"].tolist(),
+                    art["ts_start"].tolist(),
+                    art["ts_end"].tolist(),
+                    art["token_count"].tolist(),
+                )
+            )
+    chunks = json.loads(Path(path).read_text(encoding="utf-8")).get("chunks", [])
+    return [
+        (
+            int(ch["chunk_id"]),
+            int(ch["event_range"][0]),
+            int(ch["event_range"][1]),
+            float(ch["ts_start"]),
+            float(ch["ts_end"]),
+            int(ch.get("token_count", 0)),
+        )
+        for ch in chunks
+    ]
+
+
+def write_payload(payload: Mapping[str, Any], path: Path) -> Path:
+    """Write events/chunks in the format implied by the file suffix."""
+    path = Path(path)
+    if is_columnar(path):
+        if "events" in payload:
+            return write_events(payload, path)
+        return write_chunks(payload, path)
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def json_to_columnar(json_path: Path, out_path: Path | None = None) -> Path:
+    """
+    Convert events.json / chunks.json to the columnar format. Chunks with
+    text_layout="events" are stored with their text filled in (columnar
+    chunks always carry text).
+    """
+    out_path = out_path or Path(json_path).with_suffix(SUFFIX)
+    return write_payload(load_payload(Path(json_path)), out_path)
+
+
+def columnar_to_json(path: Path, out_path: Path | None = None) -> Path:
+    """
+    Inverse of json_to_columnar. Values round-trip exactly; the only
+    normalisation is the key order inside a chunk's event_counts.
+    """
+    out_path = out_path or Path(path).with_suffix(".json")
+    return write_payload(load_payload(path), out_path)
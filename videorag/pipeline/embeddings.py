@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from videorag import metrics
+from videorag.logging import metered
+from videorag.pipeline.columnar import load_payload
+from videorag.pipeline.stage_cache import StageCache
+
+logger = logging.getLogger("rag")
+
+# Width of the chunks.embedding column (see db.schema). Both built-in
+# embedders produce vectors of this size by default.
+EMBEDDING_DIM = 384
+
+DEFAULT_CACHE_PATH = Path("data/embedding_cache.sqlite")
+
+EMBEDDINGS_FILENAME = "embeddings.npy"
+EMBEDDINGS_META_FILENAME = "embeddings.json"
+
+
+class Embedder(Protocol):
+    name: str
+    dim: int
+
+    @property
+    def model_id(self) -> str:
+        """Identifies the vectors: cache key and embeddings.json 'model'."""
+        ...
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dim) float32, L2-normalised rows."""
+        ...
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+# -----------------------------
+# Embedders
+# -----------------------------
+_WORD_RE = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature(token: str, dim: int) -> Tuple[int, float]:
+    h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+    return h % dim, 1.0 if h >> 63 else -1.0
+
+
+@dataclass
+class HashingEmbedder:
+    """
+    Deterministic, model-free embedder: signed feature hashing of word
+    unigrams and bigrams. No semantic quality to speak of, but identical
+    text always gives identical vectors on any machine, which is what
+    offline tests and benchmarks need.
+    """
+
+    dim: int = EMBEDDING_DIM
+    name: str = "hashing"
+
+    @property
+    def model_id(self) -> str:
+        return f"hashing-{self.dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows: List[int] = []
+        cols: List[int] = []
+        vals: List[float] = []
+        for i, text in enumerate(texts):
+            words = _WORD_RE.findall(text.lower())
+            for token in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                col, sign = _feature(token, self.dim)
+                rows.append(i)
+                cols.append(col)
+                vals.append(sign)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(out, (rows, cols), vals)
+        return _normalise(out)
+
+
+@dataclass
+class SentenceTransformerEmbedder:
+    """
+    Local sentence-transformers model on CPU. Texts are encoded in large
+    batches; the model is loaded on first use.
+    """
+
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    batch_size: int = 256
+    device: str = "cpu"
+    name: str = "sentence-transformers"
+
+    def __post_init__(self) -> None:
+        self._model: Any = None
+
+    def _load(self) -> Any:
+        if self._model is None:
+            # Imported lazily: only needed when actually embedding.
+            from sentence_transformers import SentenceTransformer
+
+            self._model = SentenceTransformer(self.model_name, device=self.device)
+        return self._model
+
+    @property
+    def dim(self) -> int:
+        return int(self._load().get_sentence_embedding_dimension())
+
+    @property
+    def model_id(self) -> str:
+        return f"st::{self.model_name}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self._load().encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+EMBEDDERS = ("sentence-transformers", "hashing")
+
+
+def default_embedder_name() -> str:
+    """
+    VIDEORAG_EMBEDDER if set, otherwise the local sentence-transformers
+    model. The hashing embedder is never picked implicitly: its vectors are
+    not comparable with a real model's, so it has to be asked for.
+    """
+    import importlib.util
+
+    name = os.getenv("VIDEORAG_EMBEDDER", "").strip().lower()
+    if name:
+        return name
+    if importlib.util.find_spec("sentence_transformers") is None:
+        raise RuntimeError(
+            "sentence-transformers is not installed (pip install 'thesis-rag[embed]'). "
+            "Set VIDEORAG_EMBEDDER=hashing to use the model-free embedder instead."
+        )
+    return "sentence-transformers"
+
+
+def get_embedder(name: str | None = None, **kwargs: Any) -> Embedder:
+    name = (name or default_embedder_name()).lower()
+    if name == "hashing":
+        return HashingEmbedder(**kwargs)
+    if name == "sentence-transformers":
+        return SentenceTransformerEmbedder(**kwargs)
+    raise ValueError(f"Unknown embedder '{name}'. Choose from: {', '.join(EMBEDDERS)}")
+
+
+# -----------------------------
+# Vector cache
+# -----------------------------
+class EmbeddingCache:
+    """
+    sqlite store of vectors keyed by (model_id, text_hash), shared by all
+    videos: overlapping chunks, re-chunked videos with unchanged text and
+    repeated phrases are only ever embedded once per model.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vectors ("
+            " model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, text_hash))"
+        )
+
+    def get_many(self, model_id: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(hashes))
+        # Stay under sqlite's bound-parameter limit.
+        for i in range(0, len(unique), 900):
+            part = unique[i : i + 900]
+            marks = ",".join("?" * len(part))
+            for h, blob in self._conn.execute(
+                f"SELECT text_hash, vector FROM vectors WHERE model = ? AND text_hash IN ({marks})",
+                [model_id, *part],
+            ):
+                found[h] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model_id: str, items: Sequence[Tuple[str, np.ndarray]]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vectors (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(model_id, h, np.asarray(v, dtype=np.float32).tobytes()) for h, v in items],
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "EmbeddingCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# -----------------------------
+# Stage
+# -----------------------------
+@dataclass(frozen=True)
+class EmbedStats:
+    chunks: int
+    cached: int
+    embedded: int
+    seconds: float
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.chunks} chunks ({self.cached} cached, {self.embedded} embedded) "
+            f"in {self.seconds:.2f}s, {self.chunks_per_second:.0f} chunks/s"
+        )
+
+
+def embed_texts(
+    texts: Sequence[str],
+    *,
+    embedder: Embedder,
+    cache: Optional[EmbeddingCache] = None,
+    batch_size: int = 1024,
+) -> Tuple[np.ndarray, EmbedStats]:
+    """
+    Vectors for texts, in order. Cached vectors are reused; the rest are
+    embedded batch_size unique texts at a time and added to the cache.
+    """
+    t0 = time.perf_counter()
+    hashes = [text_hash(t) for t in texts]
+    found = cache.get_many(embedder.model_id, hashes) if cache is not None else {}
+
+    missing: Dict[str, str] = {}
+    for h, t in zip(hashes, texts):
+        if h not in found and h not in missing:
+            missing[h] = t
+
+    todo = list(missing.items())
+    for i in range(0, len(todo), batch_size):
+        batch = todo[i : i + batch_size]
+        vectors = embedder.embed([t for _, t in batch])
+        new = list(zip([h for h, _ in batch], vectors))
+        found.update(new)
+        if cache is not None:
+            cache.put_many(embedder.model_id, new)
+
+    out = np.zeros((len(texts), embedder.dim), dtype=np.float32)
+    for i, h in enumerate(hashes):
+        out[i] = found[h]
+
+    stats = EmbedStats(
+        chunks=len(texts),
+        cached=len(texts) - sum(1 for h in hashes if h in missing),
+        embedded=len(missing),
+        seconds=time.perf_counter() - t0,
+    )
+    return out, stats
+
+
+def load_embeddings(derived_dir: Path) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+    """(vectors, sidecar) for a video, or None if it has not been embedded."""
+    vectors_path = derived_dir / EMBEDDINGS_FILENAME
+    meta_path = derived_dir / EMBEDDINGS_META_FILENAME
+    if not vectors_path.exists() or not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    return np.load(vectors_path, mmap_mode="r"), meta
+
+
+@metered("embed")
+def embed_chunks_to_file(
+    *,
+    video_id: str,
+    chunks_path: Path,
+    derived_root: Path = Path("data/derived"),
+    embedder: Optional[Embedder] = None,
+    cache_path: Path = DEFAULT_CACHE_PATH,
+    batch_size: int = 1024,
+    force: bool = False,
+) -> Path:
+    """
+    Embed every chunk's text into data/derived/<video_id>/embeddings.npy
+    (float32, one row per chunk, in chunks file order) with an
+    embeddings.json sidecar holding the model id, chunk_ids and text hashes,
+    so the indexer can tell which vector belongs to which chunk and whether
+    it is still current.
+
+    Skipped when the stage cache says both files are up to date.
+    """
+    embedder = embedder or get_embedder()
+
+    out_dir = derived_root / video_id
+    out_dir.mkdir(parents=True, exist_ok=True)
+    vectors_path = out_dir / EMBEDDINGS_FILENAME
+    meta_path = out_dir / EMBEDDINGS_META_FILENAME
+
+    cache = StageCache(
+        derived_dir=out_dir,
+        video_id=video_id,
+        stage="embed",
+        inputs=[chunks_path],
+        outputs=[vectors_path, meta_path],
+        config={"model": embedder.model_id},
+        code_files=[__file__],
+    )
+    if cache.is_fresh(force=force):
+        return vectors_path
+
+    chunks = load_payload(chunks_path).get("chunks", [])
+    texts = [str(ch["text"]) for ch in chunks]
+
+    with EmbeddingCache(cache_path) as vector_cache:
+        vectors, stats = embed_texts(
+            texts, embedder=embedder, cache=vector_cache, batch_size=batch_size
+        )
+    logger.info("EMBED: %s: %s", video_id, stats)
+    metrics.current().add(chunks=stats.chunks, embedded=stats.embedded)
+
+    tmp = vectors_path.with_suffix(".tmp.npy")
+    np.save(tmp, vectors)
+    os.replace(tmp, vectors_path)
+    meta = {
+        "video_id": video_id,
+        "model": embedder.model_id,
+        "dim": int(vectors.shape[1]),
+        "chunk_ids": [int(ch["chunk_id"]) for ch in chunks],
+        "text_hashes": [text_hash(t) for t in texts],
+        "stats": asdict(stats),
+    }
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    cache.record()
+
+    return vectors_path
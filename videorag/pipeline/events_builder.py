@@ -1,32 +1,61 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from videorag import metrics
+from videorag.logging import metered
+from videorag.pipeline.columnar import artifact_suffix, write_payload
+from videorag.pipeline.stage_cache import StageCache
+from videorag.pipeline.tokens import DEFAULT_TOKENIZER, count_tokens, tokenizer_id
+
 
 def _clean_text(s: str) -> str:
     return " ".join((s or "").strip().split())
 
 
+def _load_transcript(path: Path) -> Dict[str, Any]:
+    """
+    Load transcript_segments.json, or the streaming transcript_segments.jsonl
+    sidecar while ASR is still running (marked "partial" until it is done).
+    """
+    if path.suffix == ".jsonl":
+        from videorag.pipeline.asr_transcription import read_stream
+
+        header, segments, done = read_stream(path)
+        return {
+            "video_id": header.get("video_id", ""),
+            "segments": segments,
+            "partial": not done,
+        }
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
 @dataclass(frozen=True)
 class EventBuilderConfig:
     # If true, include an "event_id" (index) field on each event for traceability
     include_event_id: bool = True
+    # tiktoken encoding used to store a "token_count" per event ("" = skip)
+    tokenizer: str = DEFAULT_TOKENIZER
 
 
+@metered("events")
 def build_events_from_asr(
     *,
     video_id: str,
     transcript_segments_path: Path,
     derived_root: Path = Path("data/derived"),
     cfg: EventBuilderConfig = EventBuilderConfig(),
+    artifact_format: str = "json",
+    force: bool = False,
 ) -> Path:
     """
     Build a unified events.json from ASR transcript segments (MVP).
 
     Input:  data/derived/<video_id>/transcript_segments.json
+            (or the growing transcript_segments.jsonl stream)
       {
         "video_id": "...",
         "segments": [{"start": 12.345, "end": 18.901, "text": "..."}]
@@ -36,16 +65,42 @@ def build_events_from_asr(
       {
         "video_id": "...",
         "events": [
-          {"event_id": 0, "type": "asr", "t_start": 12.345, "t_end": 18.901, "text": "...", "source": "asr"}
-        ]
+          {"event_id": 0, "type": "asr", "t_start": 12.345, "t_end": 18.901, "text": "...", "source": "asr",
+           "token_count": 9}
+        ],
+        "tokenizer": "tiktoken::cl100k_base"
       }
+
+    Token counts are computed once here (batched, multi-threaded) so the
+    chunker can reuse them for every ChunkingConfig.
+
+    Events built from an unfinished stream carry "partial": true.
+
+    artifact_format="columnar" writes events.vrc instead (see columnar).
+
+    Skipped when the stage cache says events.json is up to date.
     """
-    data = json.loads(transcript_segments_path.read_text(encoding="utf-8"))
+    data = _load_transcript(transcript_segments_path)
 
     file_video_id = str(data.get("video_id", "")).strip()
     if not video_id:
         video_id = file_video_id or transcript_segments_path.parent.name
 
+    out_dir = derived_root / video_id
+    out_path = out_dir / f"events{artifact_suffix(artifact_format)}"
+
+    cache = StageCache(
+        derived_dir=out_dir,
+        video_id=video_id,
+        stage="events",
+        inputs=[transcript_segments_path],
+        outputs=[out_path],
+        config=asdict(cfg),
+        code_files=[__file__],
+    )
+    if cache.is_fresh(force=force):
+        return out_path
+
     segments = data.get("segments", [])
     if not isinstance(segments, list):
         raise ValueError("Invalid transcript file: 'segments' must be a list.")
@@ -76,10 +131,22 @@ def build_events_from_asr(
         for idx, e in enumerate(events):
             e["event_id"] = idx
 
-    out_dir = derived_root / video_id
+    if cfg.tokenizer:
+        counts = count_tokens([e["text"] for e in events], name=cfg.tokenizer)
+        for e, n in zip(events, counts):
+            e["token_count"] = n
+
+    metrics.current().add(segments=len(segments), events=len(events))
+    if cfg.tokenizer:
+        metrics.current().add(tokens=sum(counts))
+
     out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / "events.json"
 
-    payload = {"video_id": video_id, "events": events}
-    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    payload: Dict[str, Any] = {"video_id": video_id, "events": events}
+    if data.get("partial"):
+        payload["partial"] = True
+    if cfg.tokenizer:
+        payload["tokenizer"] = tokenizer_id(cfg.tokenizer)
+    write_payload(payload, out_path)
+    cache.record()
     return out_path
\ No newline at end of file
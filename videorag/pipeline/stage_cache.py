@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from videorag import metrics
+
+MANIFEST_NAME = "manifest.json"
+
+logger = logging.getLogger("rag")
+
+
+@dataclass(frozen=True)
+class CacheEvent:
+    video_id: str
+    stage: str
+    hit: bool
+    reason: str
+
+
+# Cache decisions made in this process; drained by the batch runner / scripts.
+_REPORT: List[CacheEvent] = []
+
+
+def drain_report() -> List[CacheEvent]:
+    events = list(_REPORT)
+    _REPORT.clear()
+    return events
+
+
+def format_report(events: Sequence[CacheEvent]) -> str:
+    hits = sum(1 for e in events if e.hit)
+    lines = [f"Stage cache: {hits} hit(s), {len(events) - hits} miss(es)"]
+    for e in events:
+        status = "hit " if e.hit else "miss"
+        lines.append(f"  {status} {e.video_id}/{e.stage}: {e.reason}")
+    return "\n".join(lines)
+
+
+# -----------------------------
+# Manifest IO
+# -----------------------------
+def _manifest_path(derived_dir: Path) -> Path:
+    return derived_dir / MANIFEST_NAME
+
+
+def load_manifest(derived_dir: Path) -> Dict[str, Any]:
+    path = _manifest_path(derived_dir)
+    if not path.exists():
+        return {"files": {}, "stages": {}}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        # A corrupt manifest only costs a recompute.
+        return {"files": {}, "stages": {}}
+    data.setdefault("files", {})
+    data.setdefault("stages", {})
+    return data
+
+
+def _save_manifest(derived_dir: Path, manifest: Dict[str, Any]) -> None:
+    derived_dir.mkdir(parents=True, exist_ok=True)
+    path = _manifest_path(derived_dir)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# -----------------------------
+# Hashing
+# -----------------------------
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# (path, size, mtime_ns) -> sha256 of files hashed by this process, for
+# the checks that run before the manifest is saved again.
+_DIGESTS: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_digest(path: Path, manifest: Dict[str, Any]) -> str:
+    """
+    sha256 of a file, memoised in the manifest by (size, mtime_ns) so a
+    multi-GB video is only hashed again when it actually changes on disk.
+    """
+    st = path.stat()
+    key = str(path.resolve())
+    known = manifest["files"].get(key)
+    if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+        return known["sha256"]
+
+    memo_key = (key, st.st_size, st.st_mtime_ns)
+    digest = _DIGESTS.get(memo_key) or _sha256_file(path)
+    _DIGESTS[memo_key] = digest
+    manifest["files"][key] = {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": digest,
+    }
+    return digest
+
+
+def _config_digest(config: Mapping[str, Any]) -> str:
+    blob = json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _code_digest(code_files: Sequence[str]) -> str:
+    h = hashlib.sha256()
+    for f in code_files:
+        h.update(Path(f).read_bytes())
+    return h.hexdigest()
+
+
+# -----------------------------
+# Stage cache
+# -----------------------------
+@dataclass
+class StageCache:
+    """
+    Per-video record of what each stage was last computed from.
+
+    A stage is fresh when its input file hashes, config and code version
+    match the manifest and its outputs are still the files it wrote.
+    Downstream invalidation falls out of this: a stage's inputs are the
+    upstream outputs, so it only reruns if those actually changed.
+    """
+
+    derived_dir: Path
+    video_id: str
+    stage: str
+    inputs: Sequence[Path]
+    outputs: Sequence[Path]
+    config: Mapping[str, Any]
+    code_files: Sequence[str]
+
+    def _fingerprint(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "inputs": {str(p): file_digest(p, manifest) for p in self.inputs},
+            "config": _config_digest(self.config),
+            "code": _code_digest(self.code_files),
+        }
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """Input hashes and config / code digests, as record() would store them."""
+        return self._fingerprint(load_manifest(self.derived_dir))
+
+    def _outputs_state(self) -> Dict[str, List[int]]:
+        state = {}
+        for p in self.outputs:
+            st = p.stat()
+            state[str(p)] = [st.st_size, st.st_mtime_ns]
+        return state
+
+    def _miss(self, reason: str) -> bool:
+        _REPORT.append(CacheEvent(self.video_id, self.stage, False, reason))
+        metrics.current().cache_event(False)
+        logger.info("CACHE MISS: %s/%s (%s)", self.video_id, self.stage, reason)
+        return False
+
+    def stale_reason(self) -> Optional[str]:
+        """Why the stage would rerun, or None when it is fresh. Reports and records nothing."""
+        manifest = load_manifest(self.derived_dir)
+        entry = manifest["stages"].get(self.stage)
+        if entry is None:
+            return "no previous run"
+        if not all(p.exists() for p in self.inputs):
+            return "input missing"
+        if not all(p.exists() for p in self.outputs):
+            return "output missing"
+        if entry.get("outputs") != self._outputs_state():
+            return "output modified"
+
+        fp = self._fingerprint(manifest)
+        for part in ("inputs", "config", "code"):
+            if entry.get(part) != fp[part]:
+                return f"{part} changed"
+        return None
+
+    def is_fresh(self, *, force: bool = False) -> bool:
+        if force:
+            return self._miss("forced")
+        reason = self.stale_reason()
+        if reason is not None:
+            return self._miss(reason)
+
+        _REPORT.append(CacheEvent(self.video_id, self.stage, True, "up to date"))
+        metrics.current().cache_event(True)
+        logger.info("CACHE HIT:  %s/%s", self.video_id, self.stage)
+        return True
+
+    def record(self) -> None:
+        manifest = load_manifest(self.derived_dir)
+        entry = self._fingerprint(manifest)
+        entry["outputs"] = self._outputs_state()
+        manifest["stages"][self.stage] = entry
+        _save_manifest(self.derived_dir, manifest)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from videorag.input.paths import video_paths
+from videorag.pipeline.chunk_events import ChunkingConfig, chunk_events_to_file
+from videorag.pipeline.events_builder import build_events_from_asr
+
+
+def follow_transcript_stream(
+    *,
+    video_id: str,
+    derived_root: Path = Path("data/derived"),
+    cfg: ChunkingConfig | None = None,
+    poll_seconds: float = 10.0,
+    wait_seconds: float = 600.0,
+    on_update: Optional[Callable[[Path, bool], None]] = None,
+) -> Path:
+    """
+    Keep events.json and chunks.json in step with a growing
+    transcript_segments.jsonl (written by transcribe_video_to_derived with
+    stream=True).
+
+    Every time the stream grows, events and chunks are rebuilt from what has
+    been decoded so far and on_update(chunks_path, done) is called, e.g. to
+    index the partial chunks. Chunking is left-to-right, so earlier chunks
+    stay stable and only the tail changes between updates.
+
+    Returns the final chunks path once the stream is marked done. Gives up
+    if the stream does not exist after wait_seconds.
+    """
+    from videorag.pipeline.asr_transcription import read_stream
+
+    paths = video_paths(video_id, derived_root=derived_root)
+    stream_path = paths.transcript_stream_path
+
+    deadline = time.monotonic() + wait_seconds
+    while not stream_path.exists():
+        if time.monotonic() > deadline:
+            raise FileNotFoundError(f"No transcript stream appeared at {stream_path}")
+        time.sleep(poll_seconds)
+
+    last_size = -1
+    while True:
+        size = stream_path.stat().st_size
+        if size == last_size:
+            time.sleep(poll_seconds)
+            continue
+        last_size = size
+
+        _header, segments, done = read_stream(stream_path)
+        if segments:
+            events_path = build_events_from_asr(
+                video_id=video_id,
+                transcript_segments_path=stream_path,
+                derived_root=derived_root,
+                artifact_format=paths.artifact_format,
+            )
+            chunks_path = chunk_events_to_file(
+                video_id=video_id,
+                events_path=events_path,
+                derived_root=derived_root,
+                cfg=cfg,
+                artifact_format=paths.artifact_format,
+            )
+            if on_update is not None:
+                on_update(chunks_path, done)
+
+        if done:
+            return paths.chunks_path
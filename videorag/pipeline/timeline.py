@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from videorag.pipeline.columnar import ColumnarArtifact, is_columnar, load_payload, open_columnar
+
+
+class IntervalIndex:
+    """
+    Closed intervals [start, end] sorted by start, for "what covers t" and
+    "what intersects [t0, t1]" lookups.
+
+    Intervals may overlap (chunks overlap their neighbours, events can), so
+    besides the sorted starts the index keeps the running maximum of ends:
+    it is non-decreasing, so the first interval that can still reach t is
+    found by binary search as well. A query costs O(log n) plus the
+    candidates between the two bounds, which for chunks and events is a
+    handful.
+
+    Results are positions in the original (unsorted) input order.
+    """
+
+    def __init__(self, starts: Sequence[float], ends: Sequence[float]) -> None:
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        self.order = np.argsort(starts, kind="stable")
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        self.max_end = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _bounds(self, t0: np.ndarray, t1: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Candidates for [t0, t1]: started by t1 and, from lo on, possibly
+        # still running at t0.
+        lo = np.searchsorted(self.max_end, t0, side="left")
+        hi = np.searchsorted(self.starts, t1, side="right")
+        return lo, hi
+
+    def _select(self, lo: int, hi: int, t0: float) -> np.ndarray:
+        if hi <= lo:
+            return np.zeros(0, dtype=np.int64)
+        keep = self.ends[lo:hi] >= t0
+        return self.order[lo:hi][keep]
+
+    def overlapping(self, t0: float, t1: float) -> np.ndarray:
+        """Positions of intervals intersecting [t0, t1], by start time."""
+        lo, hi = self._bounds(np.float64(t0), np.float64(t1))
+        return self._select(int(lo), int(hi), float(t0))
+
+    def at(self, t: float) -> np.ndarray:
+        """Positions of intervals covering t, by start time."""
+        return self.overlapping(t, t)
+
+    def overlapping_flat(self, t0: Sequence[float], t1: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        overlapping() for many ranges at once, without a Python loop:
+        returns (offsets, positions) where the hits of range i are
+        positions[offsets[i]:offsets[i + 1]].
+        """
+        t0 = np.asarray(t0, dtype=np.float64)
+        t1 = np.asarray(t1, dtype=np.float64)
+        lo, hi = self._bounds(t0, t1)
+        counts = np.maximum(hi - lo, 0)
+        # Every candidate slot lo[i] .. hi[i] - 1, flattened.
+        query = np.repeat(np.arange(len(t0)), counts)
+        starts = np.cumsum(counts) - counts
+        slots = np.arange(counts.sum()) - np.repeat(starts, counts) + np.repeat(lo, counts)
+        keep = self.ends[slots] >= t0[query]
+        offsets = np.zeros(len(t0) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(query[keep], minlength=len(t0)), out=offsets[1:])
+        return offsets, self.order[slots[keep]]
+
+    def overlapping_many(self, t0: Sequence[float], t1: Sequence[float]) -> List[np.ndarray]:
+        offsets, positions = self.overlapping_flat(t0, t1)
+        return np.split(positions, offsets[1:-1])
+
+    def at_many(self, ts: Sequence[float]) -> List[np.ndarray]:
+        return self.overlapping_many(ts, ts)
+
+    def current(self, ts: Sequence[float]) -> np.ndarray:
+        """
+        For each t, the latest-starting interval covering it, or -1 (a
+        playhead in a gap). Fully vectorised in the common case where that
+        is the last interval started by t; falls back to a scan of the
+        candidates otherwise.
+        """
+        ts = np.asarray(ts, dtype=np.float64)
+        out = np.full(len(ts), -1, dtype=np.int64)
+        if len(self) == 0:
+            return out
+        lo, hi = self._bounds(ts, ts)
+        last = hi - 1
+        valid = last >= lo
+        direct = valid & (self.ends[np.maximum(last, 0)] >= ts)
+        out[direct] = self.order[last[direct]]
+        for i in np.flatnonzero(valid & ~direct):
+            hits = np.flatnonzero(self.ends[lo[i] : hi[i]] >= ts[i])
+            if len(hits):
+                out[i] = self.order[lo[i] + hits[-1]]
+        return out
+
+
+class _ColumnarRows:
+    """Rows of a .vrc file, turned into dicts only when a lookup returns them."""
+
+    def __init__(self, art: ColumnarArtifact) -> None:
+        self.art = art
+
+    def __len__(self) -> int:
+        return len(self.art)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return self.art.record(int(i))
+
+
+def _load_rows(path: Path | None, key: str, start: str, end: str) -> Tuple[Sequence[Dict[str, Any]], Any]:
+    """(rows, (starts, ends) or None). Columnar files stay mapped; times come from their columns."""
+    if path is None:
+        return [], None
+    if is_columnar(path):
+        art = open_columnar(path)
+        return _ColumnarRows(art), (art[start], art[end])
+    return load_payload(path).get(key, []), None
+
+
+class VideoTimeline:
+    """
+    Time lookups over one video's events and chunks, for mapping a player
+    position to transcript rows. Lookups return row dicts from the
+    events / chunks payloads.
+    """
+
+    def __init__(
+        self,
+        events: Sequence[Dict[str, Any]],
+        chunks: Sequence[Dict[str, Any]],
+        *,
+        event_times: Tuple[Sequence[float], Sequence[float]] | None = None,
+        chunk_times: Tuple[Sequence[float], Sequence[float]] | None = None,
+    ) -> None:
+        self.events = events
+        self.chunks = chunks
+        if event_times is None:
+            event_times = ([e["t_start"] for e in events], [e.get("t_end", e["t_start"]) for e in events])
+        if chunk_times is None:
+            chunk_times = ([c["ts_start"] for c in chunks], [c["ts_end"] for c in chunks])
+        self.event_index = IntervalIndex(*event_times)
+        self.chunk_index = IntervalIndex(*chunk_times)
+
+    @classmethod
+    def from_files(cls, *, events_path: Path | None = None, chunks_path: Path | None = None) -> "VideoTimeline":
+        events, event_times = _load_rows(events_path, "events", "t_start", "t_end")
+        chunks, chunk_times = _load_rows(chunks_path, "chunks", "ts_start", "ts_end")
+        return cls(events, chunks, event_times=event_times, chunk_times=chunk_times)
+
+    def events_at(self, t: float) -> List[Dict[str, Any]]:
+        return [self.events[i] for i in self.event_index.at(t)]
+
+    def chunks_at(self, t: float) -> List[Dict[str, Any]]:
+        return [self.chunks[i] for i in self.chunk_index.at(t)]
+
+    def events_between(self, t0: float, t1: float) -> List[Dict[str, Any]]:
+        return [self.events[i] for i in self.event_index.overlapping(t0, t1)]
+
+    def chunks_between(self, t0: float, t1: float) -> List[Dict[str, Any]]:
+        return [self.chunks[i] for i in self.chunk_index.overlapping(t0, t1)]
+
+    def current_events(self, ts: Sequence[float]) -> List[Dict[str, Any] | None]:
+        """The event shown at each playhead position (None in gaps)."""
+        return [self.events[i] if i >= 0 else None for i in self.event_index.current(ts)]
+
+
+@lru_cache(maxsize=32)
+def _cached_timeline(events_path: str, events_mtime: int, chunks_path: str, chunks_mtime: int) -> VideoTimeline:
+    return VideoTimeline.from_files(
+        events_path=Path(events_path) if events_path else None,
+        chunks_path=Path(chunks_path) if chunks_path else None,
+    )
+
+
+def video_timeline(video_id: str, *, derived_root: Path = Path("data/derived")) -> VideoTimeline:
+    """
+    Timeline of a video's current events / chunks files, cached per process
+    until either file changes.
+    """
+    from videorag.input.paths import video_paths
+
+    paths = video_paths(video_id, derived_root=derived_root)
+    ev = paths.events_path if paths.events_path.exists() else None
+    ch = paths.chunks_path if paths.chunks_path.exists() else None
+    return _cached_timeline(
+        str(ev or ""),
+        ev.stat().st_mtime_ns if ev else 0,
+        str(ch or ""),
+        ch.stat().st_mtime_ns if ch else 0,
+    )
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import fnmatch
+import io
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+from videorag.metrics import RUN_ID
+
+logger = logging.getLogger("rag")
+
+# VIDEORAG_PROFILE=cprofile,tracemalloc,sample turns profiling on. Each
+# mode profiles the outermost matching process_segment only (profilers do
+# not nest), which by default means stage functions: sections with a
+# video_id. VIDEORAG_PROFILE_STAGES (comma-separated stage names or globs)
+# picks others, e.g. "embed" or "script.*".
+MODES = ("cprofile", "tracemalloc", "sample")
+
+DEFAULT_TOP = 20
+DEFAULT_SAMPLE_INTERVAL = 0.005
+DEFAULT_PROFILE_ROOT = Path("data/profiles")
+
+# Modes currently running in this process (outermost section owns them).
+_ACTIVE: set = set()
+_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ProfileConfig:
+    modes: Tuple[str, ...]
+    stages: Tuple[str, ...] = ()
+    top: int = DEFAULT_TOP
+    interval: float = DEFAULT_SAMPLE_INTERVAL
+
+    def wants(self, stage: str, video_id: Optional[str]) -> bool:
+        if not self.stages:
+            return video_id is not None
+        return any(fnmatch.fnmatchcase(stage, pat) for pat in self.stages)
+
+
+def _split(value: str) -> Tuple[str, ...]:
+    return tuple(p.strip().lower() for p in value.split(",") if p.strip())
+
+
+def profile_config() -> Optional[ProfileConfig]:
+    """Profiling settings from the environment, or None when it is off (the common case)."""
+    raw = os.environ.get("VIDEORAG_PROFILE")
+    if not raw:
+        return None
+    modes = _split(raw)
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        raise ValueError(f"Unknown profiling mode(s) {unknown}. Choose from: {', '.join(MODES)}")
+    return ProfileConfig(
+        modes=modes,
+        stages=tuple(p.strip() for p in os.environ.get("VIDEORAG_PROFILE_STAGES", "").split(",") if p.strip()),
+        top=int(os.environ.get("VIDEORAG_PROFILE_TOP", DEFAULT_TOP)),
+        interval=float(os.environ.get("VIDEORAG_PROFILE_INTERVAL", DEFAULT_SAMPLE_INTERVAL)),
+    )
+
+
+def profile_dir(video_id: Optional[str], *, derived_root: Optional[Path] = None) -> Path:
+    """data/derived/<video_id>/profiles/, or data/profiles/ for sections without a video."""
+    if video_id:
+        return Path(derived_root or "data/derived") / video_id / "profiles"
+    return DEFAULT_PROFILE_ROOT
+
+
+# -----------------------------
+# Sampling profiler
+# -----------------------------
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+
+
+class _Sampler:
+    """
+    Wall-clock stack sampler for the thread that started it: a daemon
+    thread reads its frame every `interval` seconds. Unlike cProfile it
+    costs nothing per call, so it suits long ASR / embedding runs; output is
+    folded stacks (flamegraph.pl, speedscope).
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="videorag-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def summary(self, top: int) -> str:
+        total = sum(self.stacks.values())
+        own: Counter = Counter()
+        for stack, n in self.stacks.items():
+            own[stack.rsplit(";", 1)[-1]] += n
+        lines = [f"{total} samples every {self.interval * 1000:g} ms; top frames by own samples:"]
+        lines.extend(f"  {n / total:6.1%}  {frame}" for frame, n in own.most_common(top))
+        return "\n".join(lines)
+
+
+# -----------------------------
+# Section profiler
+# -----------------------------
+class SectionProfiler:
+    """Runs the configured profilers around one section and writes their output."""
+
+    def __init__(self, cfg: ProfileConfig, modes: Sequence[str], *, stage: str, out_dir: Path) -> None:
+        self.cfg = cfg
+        self.modes = tuple(modes)
+        self.stage = stage
+        self.out_dir = out_dir
+        self._profile: Any = None
+        self._sampler: Optional[_Sampler] = None
+        self._t0 = 0.0
+
+    def start(self) -> None:
+        self._t0 = time.perf_counter()
+        # cProfile first: it is the one that can refuse (another profiler
+        # already active), and then nothing else has been started.
+        if "cprofile" in self.modes:
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        if "tracemalloc" in self.modes:
+            tracemalloc.start(10)
+        if "sample" in self.modes:
+            self._sampler = _Sampler(self.cfg.interval)
+            self._sampler.start()
+
+    def stop(self) -> List[Path]:
+        written: List[Path] = []
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        snapshot = peak = None
+        if "tracemalloc" in self.modes:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        base = self.out_dir / f"{self.stage}.{RUN_ID}"
+        dt = time.perf_counter() - self._t0
+
+        if self._profile is not None:
+            import pstats
+
+            path = base.with_name(base.name + ".prof")
+            self._profile.dump_stats(path)
+            buf = io.StringIO()
+            pstats.Stats(self._profile, stream=buf).sort_stats("cumulative").print_stats(self.cfg.top)
+            summary = _trim_pstats(buf.getvalue())
+            # Readable copy next to the binary dump (batch workers do not log).
+            path.with_name(path.name + ".txt").write_text(summary + "\n", encoding="utf-8")
+            logger.info("PROFILE cprofile: %s (%.2fs) -> %s\n%s", self.stage, dt, path, summary)
+            written.append(path)
+
+        if snapshot is not None:
+            path = base.with_name(base.name + ".tracemalloc.txt")
+            stats = snapshot.filter_traces(
+                [
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                    tracemalloc.Filter(False, __file__),
+                    tracemalloc.Filter(False, "*/cProfile.py"),
+                    tracemalloc.Filter(False, "*/profile.py"),
+                ]
+            ).statistics("lineno")
+            lines = [f"peak traced: {peak / 2**20:.1f} MiB; live at end by line:"]
+            lines.extend(f"  {s.size / 2**20:9.2f} MiB {s.count:9d} blocks  {s.traceback}" for s in stats[: self.cfg.top])
+            summary = "\n".join(lines)
+            path.write_text(summary + "\n", encoding="utf-8")
+            snapshot.dump(str(base.with_name(base.name + ".tracemalloc")))
+            logger.info("PROFILE tracemalloc: %s -> %s\n%s", self.stage, path, summary)
+            written.append(path)
+
+        if self._sampler is not None:
+            path = base.with_name(base.name + ".folded")
+            path.write_text(self._sampler.folded(), encoding="utf-8")
+            summary = self._sampler.summary(self.cfg.top)
+            path.with_name(path.name + ".txt").write_text(summary + "\n", encoding="utf-8")
+            logger.info("PROFILE sample: %s -> %s\n%s", self.stage, path, summary)
+            written.append(path)
+        return written
+
+
+def _trim_pstats(text: str) -> str:
+    # Drop pstats' header noise; keep the totals line and the table.
+    lines = [line for line in text.splitlines() if line.strip()]
+    return "\n".join(line for line in lines if not line.lstrip().startswith("Ordered by"))
+
+
+def start_profiling(
+    stage: str,
+    video_id: Optional[str] = None,
+    *,
+    derived_root: Optional[Path] = None,
+) -> Optional[SectionProfiler]:
+    """
+    Start the profilers VIDEORAG_PROFILE asks for on this section, or
+    return None: profiling is off, the section is not selected, or an
+    outer section already owns every requested profiler. Pair with
+    stop_profiling(). When off this is one environment lookup.
+    """
+    cfg = profile_config()
+    if cfg is None or not cfg.wants(stage, video_id):
+        return None
+    with _LOCK:
+        # cProfile / tracemalloc are process-wide: one section at a time,
+        # and never one somebody else started.
+        modes = [
+            m for m in cfg.modes
+            if m not in _ACTIVE and not (m == "tracemalloc" and tracemalloc.is_tracing())
+        ]
+        _ACTIVE.update(modes)
+    if not modes:
+        return None
+    profiler = SectionProfiler(cfg, modes, stage=stage, out_dir=profile_dir(video_id, derived_root=derived_root))
+    try:
+        profiler.start()
+    except Exception as exc:
+        logger.warning("PROFILE: not profiling %s (%s)", stage, exc)
+        with _LOCK:
+            _ACTIVE.difference_update(modes)
+        return None
+    return profiler
+
+
+def stop_profiling(profiler: Optional[SectionProfiler]) -> List[Path]:
+    if profiler is None:
+        return []
+    try:
+        return profiler.stop()
+    except Exception:
+        # A profiler must never fail the stage it watched.
+        logger.exception("PROFILE: could not write profile for %s", profiler.stage)
+        return []
+    finally:
+        with _LOCK:
+            _ACTIVE.difference_update(profiler.modes)
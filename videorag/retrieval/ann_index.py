@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+INDEX_KINDS = ("hnsw", "ivfflat")
+
+# Embeddings are L2-normalised, so cosine distance (<=>) and its opclass.
+DISTANCE_OP = "<=>"
+_OPCLASS = "vector_cosine_ops"
+
+_INDEX_NAME = "chunks_embedding_{kind}_idx"
+
+
+@dataclass(frozen=True)
+class AnnIndexConfig:
+    """
+    Build parameters of the ANN index on chunks.embedding.
+
+    hnsw: m / ef_construction (recall vs build time and size).
+    ivfflat: lists; rule of thumb rows / 1000 up to 1M rows, sqrt(rows) above.
+    """
+
+    kind: str = "hnsw"
+    m: int = 16
+    ef_construction: int = 64
+    lists: int = 100
+
+    @property
+    def index_name(self) -> str:
+        return _INDEX_NAME.format(kind=self.kind)
+
+    def create_sql(self, *, concurrently: bool = False, table: str = "chunks", name: str | None = None) -> str:
+        if self.kind == "hnsw":
+            with_ = f"m = {int(self.m)}, ef_construction = {int(self.ef_construction)}"
+        elif self.kind == "ivfflat":
+            with_ = f"lists = {int(self.lists)}"
+        else:
+            raise ValueError(f"Unknown ANN index kind '{self.kind}'. Choose from: {INDEX_KINDS}")
+        return (
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name or self.index_name} "
+            f"ON {table} USING {self.kind} (embedding {_OPCLASS}) WITH ({with_})"
+        )
+
+
+@dataclass(frozen=True)
+class SearchParams:
+    """
+    Per-query knobs, applied with SET LOCAL so they only affect the current
+    transaction.
+
+    ef_search: HNSW candidate list size (>= k; higher = better recall).
+    probes: IVFFlat lists visited per query.
+    iterative_scan: pgvector >= 0.8; keeps scanning the index when filters
+      remove too many candidates ("relaxed_order" or "strict_order").
+    exact: skip the ANN index and scan, giving exact results.
+    """
+
+    ef_search: int = 40
+    probes: int = 10
+    iterative_scan: Optional[str] = None
+    exact: bool = False
+
+    def settings(self) -> Dict[str, Any]:
+        if self.exact:
+            return {"enable_indexscan": "off", "enable_bitmapscan": "off"}
+        out: Dict[str, Any] = {"hnsw.ef_search": int(self.ef_search), "ivfflat.probes": int(self.probes)}
+        if self.iterative_scan:
+            out["hnsw.iterative_scan"] = self.iterative_scan
+            out["ivfflat.iterative_scan"] = self.iterative_scan
+        return out
+
+
+def apply_search_params(session: Any, params: SearchParams) -> None:
+    for name, value in params.settings().items():
+        # SET does not take bind parameters; values come from SearchParams.
+        session.execute(text(f"SET LOCAL {name} = '{value}'"))
+
+
+# -----------------------------
+# Management
+# -----------------------------
+def _partitions(conn: Any) -> List[str]:
+    """Partitions of chunks (empty when it is a plain table)."""
+    return list(
+        conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass('chunks') ORDER BY c.relname"
+            )
+        ).scalars()
+    )
+
+
+def _drop_index(conn: Any, name: str) -> None:
+    # A partitioned index cannot be dropped concurrently; dropping it drops
+    # the partitions' indexes with it.
+    partitioned = conn.execute(
+        text("SELECT relkind = 'I' FROM pg_class WHERE oid = to_regclass(:name)"), {"name": name}
+    ).scalar()
+    conn.execute(text(f"DROP INDEX {'' if partitioned else 'CONCURRENTLY '}IF EXISTS {name}"))
+
+
+def create_ann_index(cfg: AnnIndexConfig = AnnIndexConfig(), *, drop_others: bool = True) -> str:
+    """
+    Build the ANN index (no-op if it already exists) and ANALYZE the table.
+    With drop_others, an index of the other kind is dropped so the planner
+    has one choice. Returns the index name.
+
+    On the hash-partitioned chunks table the index is created on the parent
+    only, built concurrently on each partition and attached, so writes to
+    other partitions never wait for a build.
+    """
+    from videorag.db.session import get_engine
+
+    # CONCURRENTLY cannot run inside a transaction block.
+    with get_engine().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if drop_others:
+            for kind in INDEX_KINDS:
+                if kind != cfg.kind:
+                    _drop_index(conn, _INDEX_NAME.format(kind=kind))
+        partitions = _partitions(conn)
+        if not partitions:
+            conn.execute(text(cfg.create_sql(concurrently=True)))
+        else:
+            conn.execute(text(cfg.create_sql(table="ONLY chunks")))
+            for part in partitions:
+                name = f"{part}_{cfg.index_name.removeprefix('chunks_')}"
+                conn.execute(text(cfg.create_sql(concurrently=True, table=part, name=name)))
+                attached = conn.execute(
+                    text("SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:name)"), {"name": name}
+                ).scalar()
+                if not attached:
+                    conn.execute(text(f"ALTER INDEX {cfg.index_name} ATTACH PARTITION {name}"))
+        conn.execute(text("ANALYZE chunks"))
+    return cfg.index_name
+
+
+def drop_ann_index(kind: str) -> None:
+    from videorag.db.session import get_engine
+
+    with get_engine().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        _drop_index(conn, _INDEX_NAME.format(kind=kind))
+
+
+def existing_ann_indexes() -> Dict[str, str]:
+    """{index name: definition} of the ANN indexes on chunks."""
+    from videorag.db.session import db_session
+
+    with db_session() as session:
+        rows = session.execute(
+            text(
+                "SELECT indexname, indexdef FROM pg_indexes "
+                "WHERE tablename = 'chunks' AND indexname LIKE 'chunks_embedding_%'"
+            )
+        ).all()
+    return dict(rows)
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from videorag.retrieval.search import RetrievalBackend, SearchHit, TimeRange, get_backend
+
+DEFAULT_CACHE_PATH = Path("data/retrieval_cache.sqlite")
+
+
+# -----------------------------
+# Caches
+# -----------------------------
+@dataclass
+class CacheCounters:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class Cache(Protocol):
+    counters: CacheCounters
+
+    def get(self, key: str) -> Any:
+        ...
+
+    def put(self, key: str, value: Any) -> None:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+
+def _size_of(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_size_of(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_size_of(k) + _size_of(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class LruTtlCache:
+    """
+    In-process LRU cache with a per-entry time to live. Thread-safe.
+    Tracks hits / misses / evictions and approximate memory use.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.counters = CacheCounters()
+        self._data: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.counters.misses += 1
+                return None
+            expires, size, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                self._bytes -= size
+                self.counters.expired += 1
+                self.counters.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.counters.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        size = _size_of(key) + _size_of(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries:
+                _, (_, evicted, _) = self._data.popitem(last=False)
+                self._bytes -= evicted
+                self.counters.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **asdict(self.counters),
+            "hit_rate": self.counters.hit_rate,
+            "entries": len(self._data),
+            "bytes": self._bytes,
+        }
+
+
+class SqliteCache:
+    """
+    The same contract shared on disk between processes (workers, CLI runs).
+    Values are stored as JSON (numpy arrays as float32 bytes). Counters are
+    per process; entries / bytes are of the whole file.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        *,
+        table: str = "entries",
+        max_entries: int = 100_000,
+        ttl_seconds: float = 24 * 3600.0,
+    ) -> None:
+        self.path = Path(path)
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.counters = CacheCounters()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, kind TEXT NOT NULL,"
+            " expires REAL NOT NULL, used REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_used ON {table} (used)")
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, kind, expires FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.counters.misses += 1
+                return None
+            value, kind, expires = row
+            with self._conn:
+                if expires < now:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    self.counters.expired += 1
+                    self.counters.misses += 1
+                    return None
+                self._conn.execute(f"UPDATE {self.table} SET used = ? WHERE key = ?", (now, key))
+        self.counters.hits += 1
+        if kind == "f32":
+            return np.frombuffer(value, dtype=np.float32)
+        return json.loads(value)
+
+    def put(self, key: str, value: Any) -> None:
+        if isinstance(value, np.ndarray):
+            blob, kind = np.asarray(value, dtype=np.float32).tobytes(), "f32"
+        else:
+            blob, kind = json.dumps(value).encode("utf-8"), "json"
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, kind, expires, used) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, kind, now + self.ttl_seconds, now),
+            )
+            (n,) = self._conn.execute(f"SELECT count(*) FROM {self.table}").fetchone()
+            if n > self.max_entries:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN "
+                    f"(SELECT key FROM {self.table} ORDER BY used LIMIT ?)",
+                    (n - self.max_entries,),
+                )
+                self.counters.evictions += n - self.max_entries
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                f"SELECT count(*), coalesce(sum(length(value)), 0) FROM {self.table}"
+            ).fetchone()
+        return {**asdict(self.counters), "hit_rate": self.counters.hit_rate, "entries": entries, "bytes": size}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# -----------------------------
+# Cached retrieval
+# -----------------------------
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _key(*parts: Any) -> str:
+    return hashlib.blake2b(json.dumps(parts, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CachedRetriever:
+    """
+    search() with two cache levels in front of a RetrievalBackend:
+
+    1. query text -> query embedding (skips the embedding model);
+    2. (normalised query, video_ids, time_range, k, backend, index version)
+       -> ranked hits (skips the backend round trip).
+
+    The index version comes from the backend (for Postgres, the
+    index_versions row the indexers bump with the chunks), so results for
+    a video are invalidated as soon as it is re-indexed, without touching
+    the caches themselves. Only the cache key uses the normalised query;
+    the backend is queried with the original text.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[RetrievalBackend] = None,
+        *,
+        embedder: Any = None,
+        query_cache: Optional[Cache] = None,
+        result_cache: Optional[Cache] = None,
+    ) -> None:
+        self.backend = backend or get_backend()
+        self.embedder = embedder
+        self.query_cache: Cache = query_cache if query_cache is not None else LruTtlCache(4096, 24 * 3600.0)
+        self.result_cache: Cache = result_cache if result_cache is not None else LruTtlCache(1024, 3600.0)
+
+    @classmethod
+    def on_disk(cls, path: Path = DEFAULT_CACHE_PATH, **kwargs: Any) -> "CachedRetriever":
+        """Both levels in one shared sqlite file."""
+        return cls(
+            query_cache=SqliteCache(path, table="query_embeddings", ttl_seconds=7 * 24 * 3600.0),
+            result_cache=SqliteCache(path, table="results", ttl_seconds=3600.0),
+            **kwargs,
+        )
+
+    def _model_id(self) -> str:
+        from videorag.retrieval.search import _default_embedder
+
+        embedder = self.embedder or _default_embedder()
+        return getattr(embedder, "model_id", type(embedder).__name__)
+
+    def embed(self, query: str) -> np.ndarray:
+        from videorag.retrieval.search import embed_query
+
+        key = _key("q", self._model_id(), query)
+        vector = self.query_cache.get(key)
+        if vector is None:
+            vector = np.asarray(embed_query(query, self.embedder), dtype=np.float32)
+            self.query_cache.put(key, vector)
+        return np.asarray(vector, dtype=np.float32)
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        video_ids: Optional[Sequence[str]] = None,
+        time_range: Optional[TimeRange] = None,
+    ) -> List[SearchHit]:
+        norm = normalize_query(query)
+        key = _key(
+            "r",
+            norm,
+            sorted(set(video_ids)) if video_ids is not None else None,
+            list(time_range) if time_range is not None else None,
+            int(k),
+            repr(self.backend),
+            self.backend.index_version(video_ids),
+        )
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return [SearchHit(**h) for h in cached]
+
+        hits = self.backend.search_vector(
+            self.embed(query), k=k, video_ids=video_ids, time_range=time_range, model=self._model_id()
+        )
+        self.result_cache.put(key, [asdict(h) for h in hits])
+        return hits
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {"query_embeddings": self.query_cache.stats(), "results": self.result_cache.stats()}
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from videorag.pipeline.chunk_events import _event_token_counts, _load_events
+from videorag.pipeline.columnar import read_chunk_spans
+from videorag.pipeline.tokens import count_tokens
+from videorag.retrieval.search import SearchHit
+
+logger = logging.getLogger("rag")
+
+DEFAULT_TOKEN_BUDGET = 3000
+
+
+@dataclass
+class ContextBlock:
+    """
+    A run of consecutive events of one video, covering one or more
+    retrieved chunks. Text is rebuilt from the events, so sentences shared
+    by overlapping chunks appear once.
+    """
+
+    video_id: str
+    ts_start: float
+    ts_end: float
+    # Inclusive [first, last] event index, as in chunks.json event_range.
+    event_range: Tuple[int, int]
+    chunk_ids: List[int]
+    text: str
+    token_count: int
+    # Best score among the merged hits; blocks are packed in this order.
+    score: float
+
+    def citation(self) -> str:
+        return f"{self.video_id} {self.ts_start:.1f}-{self.ts_end:.1f}s"
+
+
+@dataclass
+class PackedContext:
+    # Selected blocks, grouped by video (best video first) and in time order.
+    blocks: List[ContextBlock]
+    token_count: int
+    token_budget: int
+    # Tokens of the retrieved chunks as returned (with their overlaps).
+    hit_tokens: int = 0
+    dropped: List[ContextBlock] = field(default_factory=list)
+
+    def render(self) -> str:
+        """Blocks as prompt text, each headed by its citation."""
+        return "\n\n".join(f"[{b.citation()}]\n{b.text}" for b in self.blocks)
+
+
+# -----------------------------
+# Loading
+# -----------------------------
+@dataclass
+class _VideoEvents:
+    texts: List[str]
+    prefix: np.ndarray
+    # chunk_id -> (first, last, ts_start, ts_end)
+    chunks: Dict[int, Tuple[int, int, float, float]]
+
+
+@lru_cache(maxsize=64)
+def _video_events(events_path: str, events_mtime_ns: int, chunks_path: str, chunks_mtime_ns: int) -> _VideoEvents:
+    _, events, tokenizer = _load_events(Path(events_path))
+    prefix = np.zeros(len(events) + 1, dtype=np.int64)
+    np.cumsum(_event_token_counts(events, tokenizer), out=prefix[1:])
+    chunks = {
+        chunk_id: (first, last, ts_start, ts_end)
+        for chunk_id, first, last, ts_start, ts_end, _ in read_chunk_spans(Path(chunks_path))
+    }
+    return _VideoEvents(texts=events.texts, prefix=prefix, chunks=chunks)
+
+
+def _load_video(video_id: str, derived_root: Path) -> Optional[_VideoEvents]:
+    from videorag.input.paths import video_paths
+
+    paths = video_paths(video_id, derived_root=derived_root)
+    if not paths.events_path.exists() or not paths.chunks_path.exists():
+        return None
+    return _video_events(
+        str(paths.events_path),
+        paths.events_path.stat().st_mtime_ns,
+        str(paths.chunks_path),
+        paths.chunks_path.stat().st_mtime_ns,
+    )
+
+
+# -----------------------------
+# Merging and packing
+# -----------------------------
+def merge_hits(hits: Sequence[SearchHit], *, derived_root: Path = Path("data/derived")) -> List[ContextBlock]:
+    """
+    Merge hits of the same video whose event ranges overlap or touch into
+    one block per run of events. Hits whose chunk is not in the current
+    chunks file (stale index) are kept as they are.
+    """
+    by_video: Dict[str, List[SearchHit]] = {}
+    for hit in hits:
+        by_video.setdefault(hit.video_id, []).append(hit)
+
+    blocks: List[ContextBlock] = []
+    for video_id, video_hits in by_video.items():
+        video = _load_video(video_id, derived_root)
+        spans: List[Tuple[int, int, float, float, SearchHit]] = []
+        for hit in video_hits:
+            span = video.chunks.get(hit.chunk_id) if video is not None else None
+            if span is None:
+                logger.warning("No event range for %s chunk %s; using the hit text as is", video_id, hit.chunk_id)
+                (n,) = count_tokens([hit.text])
+                blocks.append(
+                    ContextBlock(
+                        video_id=video_id,
+                        ts_start=hit.ts_start,
+                        ts_end=hit.ts_end,
+                        event_range=(-1, -1),
+                        chunk_ids=[hit.chunk_id],
+                        text=hit.text,
+                        token_count=n,
+                        score=hit.score,
+                    )
+                )
+                continue
+            spans.append((*span, hit))
+
+        spans.sort(key=lambda s: (s[0], s[1]))
+        run: List[Tuple[int, int, float, float, SearchHit]] = []
+        for span in spans:
+            # Touching ranges ([3, 7] then [8, 12]) are contiguous text too.
+            if run and span[0] > max(s[1] for s in run) + 1:
+                blocks.append(_block(video_id, video, run))
+                run = []
+            run.append(span)
+        if run:
+            blocks.append(_block(video_id, video, run))
+    return blocks
+
+
+def _block(video_id: str, video: _VideoEvents, run: Sequence[Tuple[int, int, float, float, SearchHit]]) -> ContextBlock:
+    first = min(s[0] for s in run)
+    last = max(s[1] for s in run)
+    return ContextBlock(
+        video_id=video_id,
+        ts_start=min(s[2] for s in run),
+        ts_end=max(s[3] for s in run),
+        event_range=(first, last),
+        chunk_ids=sorted({s[4].chunk_id for s in run}),
+        text=" ".join(video.texts[first : last + 1]),
+        token_count=int(video.prefix[last + 1] - video.prefix[first]),
+        score=max(s[4].score for s in run),
+    )
+
+
+def pack_context(
+    hits: Sequence[SearchHit],
+    *,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    derived_root: Path = Path("data/derived"),
+) -> PackedContext:
+    """
+    Deduplicate retrieved chunks (merge_hits) and fill token_budget with
+    the best-scoring blocks; a block that does not fit is skipped so that
+    smaller, lower-ranked ones can still use the room. The selected blocks
+    are returned per video in time order, so citations read chronologically.
+
+    Token counts are the stored per-event counts, not a re-encode of the
+    packed text.
+    """
+    blocks = merge_hits(hits, derived_root=derived_root)
+    selected: List[ContextBlock] = []
+    dropped: List[ContextBlock] = []
+    used = 0
+    for block in sorted(blocks, key=lambda b: b.score, reverse=True):
+        if used + block.token_count <= token_budget:
+            selected.append(block)
+            used += block.token_count
+        else:
+            dropped.append(block)
+
+    video_rank: Dict[str, int] = {}
+    for block in selected:
+        video_rank.setdefault(block.video_id, len(video_rank))
+    selected.sort(key=lambda b: (video_rank[b.video_id], b.ts_start, b.event_range))
+
+    hit_tokens = 0
+    for hit in hits:
+        video = _load_video(hit.video_id, derived_root)
+        span = video.chunks.get(hit.chunk_id) if video is not None else None
+        if span is not None:
+            hit_tokens += int(video.prefix[span[1] + 1] - video.prefix[span[0]])
+    return PackedContext(
+        blocks=selected,
+        token_count=used,
+        token_budget=token_budget,
+        hit_tokens=hit_tokens,
+        dropped=dropped,
+    )
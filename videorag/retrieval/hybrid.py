@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+from videorag.db.schema import TEXT_SEARCH_CONFIG
+from videorag.retrieval.ann_index import DISTANCE_OP, SearchParams, apply_search_params
+from videorag.retrieval.search import (
+    SearchHit,
+    TimeRange,
+    _default_embedder,
+    check_embedding_model,
+    embed_query,
+    filter_sql,
+    other_model_sql,
+)
+
+# Standard RRF damping constant (Cormack et al.): score = w / (RRF_K + rank).
+RRF_K = 60
+
+ChunkKey = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class HybridConfig:
+    """
+    candidates: how many hits each component contributes before fusion.
+    lexical_weight / vector_weight: RRF weights of the two rankings.
+    """
+
+    candidates: int = 50
+    lexical_weight: float = 1.0
+    vector_weight: float = 1.0
+    rrf_k: int = RRF_K
+
+
+@dataclass
+class HybridResult:
+    hits: List[SearchHit]
+    # Milliseconds: embed, db (one round trip for both components), fuse,
+    # total; plus lexical / vector when run with profile=True.
+    timings: Dict[str, float] = field(default_factory=dict)
+    # Rank of each hit in each component (1-based; missing = not retrieved).
+    ranks: Dict[ChunkKey, Dict[str, int]] = field(default_factory=dict)
+
+
+def reciprocal_rank_fusion(
+    rankings: Mapping[str, Sequence[ChunkKey]],
+    weights: Mapping[str, float],
+    *,
+    rrf_k: int = RRF_K,
+) -> List[Tuple[ChunkKey, float]]:
+    """
+    Fuse ranked lists: each key scores sum(weight / (rrf_k + rank)) over the
+    lists it appears in. Ties keep first-seen order.
+    """
+    scores: Dict[ChunkKey, float] = {}
+    for name, keys in rankings.items():
+        w = weights.get(name, 1.0)
+        for rank, key in enumerate(keys, start=1):
+            scores[key] = scores.get(key, 0.0) + w / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+# Both components in one statement; rows are tagged with their source and
+# rank and fused client-side so weights do not change the SQL.
+_LEXICAL_CTE = """
+query AS (
+  SELECT websearch_to_tsquery('{ts_config}', :query_text) AS tsq
+),
+lexical AS (
+  SELECT c.video_id, c.chunk_id, c.ts_start, c.ts_end, c.text,
+         row_number() OVER (ORDER BY ts_rank_cd(c.text_tsv, q.tsq) DESC) AS rank
+  FROM chunks c, query q
+  WHERE c.text_tsv @@ q.tsq {filters}
+  ORDER BY ts_rank_cd(c.text_tsv, q.tsq) DESC
+  LIMIT :n
+)"""
+
+_SEMANTIC_CTE = """
+semantic AS (
+  SELECT c.video_id, c.chunk_id, c.ts_start, c.ts_end, c.text,
+         row_number() OVER (ORDER BY c.embedding {op} CAST(:q AS vector)) AS rank
+  FROM chunks c
+  WHERE c.embedding IS NOT NULL {filters}
+  ORDER BY c.embedding {op} CAST(:q AS vector)
+  LIMIT :n
+)"""
+
+_HYBRID_SQL = f"""
+WITH {_LEXICAL_CTE.strip()},
+{_SEMANTIC_CTE.strip()}
+SELECT 'lexical' AS source, * FROM lexical
+UNION ALL
+SELECT 'vector' AS source, * FROM semantic
+"""
+
+
+def _format(sql: str, filters: List[str]) -> str:
+    extra = "".join(f" AND c.{cond}" for cond in filters)
+    return sql.format(ts_config=TEXT_SEARCH_CONFIG, op=DISTANCE_OP, filters=extra)
+
+
+def _sql(filters: List[str]) -> str:
+    return _format(_HYBRID_SQL, filters)
+
+
+def _component_sql(source: str, filters: List[str]) -> str:
+    """One component on its own (profile timings, async fan-out)."""
+    if source == "lexical":
+        return _format(f"WITH {_LEXICAL_CTE.strip()}\nSELECT 'lexical' AS source, * FROM lexical", filters)
+    return _format(f"WITH {_SEMANTIC_CTE.strip()}\nSELECT 'vector' AS source, * FROM semantic", filters)
+
+
+def _fuse(
+    rows: Sequence[Any], k: int, cfg: HybridConfig
+) -> Tuple[List[SearchHit], Dict[ChunkKey, Dict[str, int]]]:
+    rankings: Dict[str, List[ChunkKey]] = {"lexical": [], "vector": []}
+    rows_by_key: Dict[ChunkKey, Any] = {}
+    ranks: Dict[ChunkKey, Dict[str, int]] = {}
+    for r in sorted(rows, key=lambda r: (r.source, r.rank)):
+        key = (r.video_id, int(r.chunk_id))
+        rankings[r.source].append(key)
+        rows_by_key.setdefault(key, r)
+        ranks.setdefault(key, {})[r.source] = int(r.rank)
+
+    fused = reciprocal_rank_fusion(
+        rankings,
+        {"lexical": cfg.lexical_weight, "vector": cfg.vector_weight},
+        rrf_k=cfg.rrf_k,
+    )[:k]
+    hits = [
+        SearchHit(
+            video_id=key[0],
+            chunk_id=key[1],
+            ts_start=float(rows_by_key[key].ts_start),
+            ts_end=float(rows_by_key[key].ts_end),
+            text=rows_by_key[key].text,
+            score=score,
+        )
+        for key, score in fused
+    ]
+    return hits, {key: ranks[key] for key, _ in fused}
+
+
+def hybrid_search(
+    query: str,
+    k: int = 10,
+    video_ids: Optional[Sequence[str]] = None,
+    time_range: Optional[TimeRange] = None,
+    *,
+    cfg: HybridConfig = HybridConfig(),
+    params: SearchParams = SearchParams(),
+    embedder: Any = None,
+    profile: bool = False,
+) -> HybridResult:
+    """
+    Full-text ranking (websearch syntax, GIN index on text_tsv) and vector
+    kNN (ANN index on embedding) in one round trip, fused with weighted
+    reciprocal rank fusion. Exact terms the embedding misses (names,
+    formulas, acronyms) still surface through the lexical side. Raises
+    ValueError if the chunks were embedded with a different embedder.
+
+    profile=True additionally runs each component on its own to time it
+    (extra round trips; for diagnosis, not serving).
+    """
+    from videorag.db.indexing import vector_literal
+    from videorag.db.session import db_session
+
+    t_total = time.perf_counter()
+    timings: Dict[str, float] = {}
+
+    embedder = embedder or _default_embedder()
+    t0 = time.perf_counter()
+    vector = embed_query(query, embedder)
+    timings["embed"] = (time.perf_counter() - t0) * 1000
+
+    filters, bind = filter_sql(video_ids, time_range)
+    check = {**bind, "model": embedder.model_id}
+    bind.update({"query_text": query, "q": vector_literal(vector), "n": int(max(k, cfg.candidates))})
+
+    with db_session() as session:
+        check_embedding_model(embedder.model_id, session.execute(text(other_model_sql(filters)), check).first())
+        apply_search_params(session, params)
+        t0 = time.perf_counter()
+        rows = session.execute(text(_sql(filters)), bind).all()
+        timings["db"] = (time.perf_counter() - t0) * 1000
+
+        if profile:
+            for source in ("lexical", "vector"):
+                t0 = time.perf_counter()
+                session.execute(text(_component_sql(source, filters)), bind).all()
+                timings[source] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    hits, ranks = _fuse(rows, k, cfg)
+    timings["fuse"] = (time.perf_counter() - t0) * 1000
+    timings["total"] = (time.perf_counter() - t_total) * 1000
+
+    return HybridResult(hits=hits, timings=timings, ranks=ranks)
+
+
+async def hybrid_search_async(
+    query: str,
+    k: int = 10,
+    video_ids: Optional[Sequence[str]] = None,
+    time_range: Optional[TimeRange] = None,
+    *,
+    cfg: HybridConfig = HybridConfig(),
+    params: SearchParams = SearchParams(),
+    embedder: Any = None,
+) -> HybridResult:
+    """
+    hybrid_search() for asyncio services. The two components run as
+    concurrent queries on separate pooled connections, and the lexical one
+    starts while the query is still being embedded (in a worker thread), so
+    latency is max(lexical, embed + vector) instead of their sum. Results
+    are the same as hybrid_search(). Timings: embed, lexical, vector, fuse,
+    total.
+    """
+    import asyncio
+
+    from videorag.db.indexing import vector_literal
+    from videorag.db.session import async_db_session
+
+    t_total = time.perf_counter()
+    timings: Dict[str, float] = {}
+    embedder = embedder or _default_embedder()
+    filters, bind = filter_sql(video_ids, time_range)
+    check = {**bind, "model": embedder.model_id}
+    bind.update({"query_text": query, "n": int(max(k, cfg.candidates))})
+
+    async def component(source: str, extra: Dict[str, Any]) -> List[Any]:
+        async with async_db_session() as session:
+            if source == "vector":
+                stored = await session.execute(text(other_model_sql(filters)), check)
+                check_embedding_model(embedder.model_id, stored.first())
+            for name, value in params.settings().items():
+                await session.execute(text(f"SET LOCAL {name} = '{value}'"))
+            t0 = time.perf_counter()
+            result = await session.execute(text(_component_sql(source, filters)), {**bind, **extra})
+            rows = result.all()
+            timings[source] = (time.perf_counter() - t0) * 1000
+            return rows
+
+    async def vector_side() -> List[Any]:
+        t0 = time.perf_counter()
+        vector = await asyncio.to_thread(embed_query, query, embedder)
+        timings["embed"] = (time.perf_counter() - t0) * 1000
+        return await component("vector", {"q": vector_literal(vector)})
+
+    lexical_rows, vector_rows = await asyncio.gather(component("lexical", {}), vector_side())
+
+    t0 = time.perf_counter()
+    hits, ranks = _fuse([*lexical_rows, *vector_rows], k, cfg)
+    timings["fuse"] = (time.perf_counter() - t0) * 1000
+    timings["total"] = (time.perf_counter() - t_total) * 1000
+    return HybridResult(hits=hits, timings=timings, ranks=ranks)
@@ -0,0 +1,486 @@
+from __future__ import annotations
+
+import json
+import os
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from videorag.pipeline.columnar import load_payload
+from videorag.pipeline.embeddings import load_embeddings
+from videorag.retrieval.search import SearchHit, TimeRange
+from videorag.retrieval.versions import GLOBAL_KEY, format_version, version_keys
+
+DEFAULT_INDEX_DIR = Path("data/index/local")
+
+# Rows scored per matrix product; bounds the (queries x rows) score buffer.
+_BLOCK_ROWS = 65_536
+
+# Layout of an index directory:
+#   vectors.bin    row-major matrix (float32 or float16), append-only
+#   rows.npz       chunk_id, ts_start, ts_end, alive per row
+#   table.json     dtype, dim, model, n_rows, version, per-video
+#                  offset/count/source/version
+#   ivf.npz        optional: centroids, list of every row, rows sorted by list
+
+
+@dataclass
+class _Video:
+    offset: int
+    count: int
+    chunks_path: str
+    source_mtime_ns: int
+    # Index version when the video was last written (0: older tables).
+    version: int = 0
+
+
+def _topk(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row (indices, scores) of the k largest entries, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.zeros((scores.shape[0], 0))
+        return empty.astype(np.int64), empty
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+@lru_cache(maxsize=64)
+def _chunk_texts(chunks_path: str, mtime_ns: int) -> Dict[int, str]:
+    payload = load_payload(Path(chunks_path))
+    return {int(ch["chunk_id"]): ch["text"] for ch in payload.get("chunks", [])}
+
+
+class LocalIndex:
+    """
+    In-process vector index over embeddings.npy files, for running
+    retrieval without Postgres (laptops, CI).
+
+    Vectors live in one memory-mapped matrix (float32, or float16 to halve
+    memory) with a per-row table of chunk_id / time span and a per-video
+    offset table. Videos are added incrementally; re-adding a video marks
+    its old rows dead and appends the new ones (compact() reclaims them).
+
+    Search is exact, batched dot products (embeddings are normalised, so
+    this is cosine similarity). build_ivf() adds an inverted-file layer:
+    queries then only score the rows of their n_probe nearest lists.
+
+    Single writer; readers reopen to see appends.
+    """
+
+    def __init__(self, root: Path = DEFAULT_INDEX_DIR) -> None:
+        self.root = Path(root)
+        self._table: Dict[str, Any] = {
+            "dtype": "float32", "dim": 0, "model": None, "n_rows": 0, "version": 0, "videos": {},
+        }
+        self._vectors: Optional[np.ndarray] = None
+        self._rows: Dict[str, np.ndarray] = {
+            "chunk_id": np.zeros(0, dtype=np.int64),
+            "ts_start": np.zeros(0, dtype=np.float64),
+            "ts_end": np.zeros(0, dtype=np.float64),
+            "alive": np.zeros(0, dtype=bool),
+        }
+        self._ivf: Optional[Dict[str, np.ndarray]] = None
+        # Sorted (offset, video_id), built on first hit() lookup.
+        self._owners: Optional[List[Tuple[int, str]]] = None
+        self._load()
+
+    # ---- persistence ----
+    @property
+    def _vectors_path(self) -> Path:
+        return self.root / "vectors.bin"
+
+    def _load(self) -> None:
+        table_path = self.root / "table.json"
+        if not table_path.exists():
+            return
+        self._table = json.loads(table_path.read_text(encoding="utf-8"))
+        with np.load(self.root / "rows.npz") as rows:
+            self._rows = {name: rows[name] for name in rows.files}
+        ivf_path = self.root / "ivf.npz"
+        if ivf_path.exists():
+            with np.load(ivf_path) as ivf:
+                self._ivf = {name: ivf[name] for name in ivf.files}
+        self._map_vectors()
+
+    def _map_vectors(self) -> None:
+        n, dim = self._table["n_rows"], self._table["dim"]
+        if n == 0:
+            self._vectors = None
+            return
+        # n_rows is authoritative: bytes past it are from an interrupted append.
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=self._table["dtype"], mode="r", shape=(n, dim)
+        )
+
+    def _save_npz(self, name: str, arrays: Dict[str, np.ndarray]) -> None:
+        tmp = self.root / f"{name}.tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, self.root / f"{name}.npz")
+
+    def _save(self) -> None:
+        self._owners = None
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._save_npz("rows", self._rows)
+        if self._ivf is not None:
+            self._save_npz("ivf", self._ivf)
+        tmp = self.root / "table.json.tmp"
+        tmp.write_text(json.dumps(self._table, indent=2), encoding="utf-8")
+        os.replace(tmp, self.root / "table.json")
+
+    # ---- info ----
+    def __repr__(self) -> str:
+        # Stable across processes: part of CachedRetriever's result keys.
+        return f"LocalIndex({str(self.root)!r})"
+
+    def __len__(self) -> int:
+        return int(self._rows["alive"].sum())
+
+    @property
+    def model(self) -> Optional[str]:
+        return self._table["model"]
+
+    @property
+    def video_ids(self) -> List[str]:
+        return list(self._table["videos"])
+
+    def index_version(self, video_ids: Optional[Sequence[str]] = None) -> str:
+        """Same token as retrieval.versions.index_version, from this index's own counters."""
+        keys = version_keys(video_ids)
+        found = {video_id: v.get("version", 0) for video_id, v in self._table["videos"].items()}
+        return format_version(keys, {**found, GLOBAL_KEY: self._table.get("version", 0)})
+
+    def _bump(self, video_id: str) -> None:
+        self._table["version"] = self._table.get("version", 0) + 1
+        if video_id in self._table["videos"]:
+            self._table["videos"][video_id]["version"] = self._table["version"]
+
+    def _video(self, video_id: str) -> Optional[_Video]:
+        v = self._table["videos"].get(video_id)
+        return _Video(**v) if v else None
+
+    # ---- writing ----
+    def add(
+        self,
+        video_id: str,
+        vectors: np.ndarray,
+        *,
+        chunk_ids: Sequence[int],
+        ts_start: Sequence[float],
+        ts_end: Sequence[float],
+        model: str,
+        chunks_path: Path | str = "",
+        source_mtime_ns: int = 0,
+        dtype: str = "float32",
+    ) -> None:
+        """Append (or replace) one video's vectors."""
+        vectors = np.asarray(vectors)
+        if self._table["n_rows"] == 0:
+            self._table.update({"dtype": np.dtype(dtype).name, "dim": int(vectors.shape[1]), "model": model})
+        elif model != self._table["model"]:
+            raise ValueError(
+                f"Index holds '{self._table['model']}' vectors; cannot add '{model}' vectors for {video_id}."
+            )
+        elif vectors.shape[1] != self._table["dim"]:
+            raise ValueError(f"Expected dim {self._table['dim']}, got {vectors.shape[1]} for {video_id}.")
+
+        old = self._video(video_id)
+        if old is not None:
+            self._rows["alive"][old.offset : old.offset + old.count] = False
+
+        offset = self._table["n_rows"]
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._vectors_path.open("r+b" if self._vectors_path.exists() else "wb") as f:
+            f.seek(offset * self._table["dim"] * np.dtype(self._table["dtype"]).itemsize)
+            f.truncate()
+            f.write(np.ascontiguousarray(vectors, dtype=self._table["dtype"]).tobytes())
+
+        n = len(vectors)
+        self._rows = {
+            "chunk_id": np.concatenate([self._rows["chunk_id"], np.asarray(chunk_ids, dtype=np.int64)]),
+            "ts_start": np.concatenate([self._rows["ts_start"], np.asarray(ts_start, dtype=np.float64)]),
+            "ts_end": np.concatenate([self._rows["ts_end"], np.asarray(ts_end, dtype=np.float64)]),
+            "alive": np.concatenate([self._rows["alive"], np.ones(n, dtype=bool)]),
+        }
+        self._table["n_rows"] = offset + n
+        self._table["videos"][video_id] = {
+            "offset": offset,
+            "count": n,
+            "chunks_path": str(chunks_path),
+            "source_mtime_ns": int(source_mtime_ns),
+        }
+        self._bump(video_id)
+        self._map_vectors()
+        if self._ivf is not None:
+            self._assign_ivf(offset)
+        self._save()
+
+    def add_video(
+        self,
+        video_id: str,
+        *,
+        derived_root: Path = Path("data/derived"),
+        dtype: str = "float32",
+    ) -> bool:
+        """
+        Add a video from its embeddings.npy / embeddings.json and chunks
+        file. Returns False if it is already indexed from the same
+        embeddings file (or was never embedded).
+        """
+        from videorag.input.paths import video_paths
+
+        paths = video_paths(video_id, derived_root=derived_root)
+        loaded = load_embeddings(paths.derived_dir)
+        if loaded is None:
+            return False
+        mtime_ns = paths.embeddings_path.stat().st_mtime_ns
+        old = self._video(video_id)
+        if old is not None and old.source_mtime_ns == mtime_ns:
+            return False
+
+        vectors, meta = loaded
+        chunks = {int(ch["chunk_id"]): ch for ch in load_payload(paths.chunks_path).get("chunks", [])}
+        spans = [chunks.get(int(cid), {}) for cid in meta["chunk_ids"]]
+        self.add(
+            video_id,
+            vectors,
+            chunk_ids=meta["chunk_ids"],
+            ts_start=[float(ch.get("ts_start", 0.0)) for ch in spans],
+            ts_end=[float(ch.get("ts_end", 0.0)) for ch in spans],
+            model=meta["model"],
+            chunks_path=paths.chunks_path,
+            source_mtime_ns=mtime_ns,
+            dtype=dtype,
+        )
+        return True
+
+    def remove(self, video_id: str) -> None:
+        old = self._video(video_id)
+        if old is None:
+            return
+        self._rows["alive"][old.offset : old.offset + old.count] = False
+        del self._table["videos"][video_id]
+        self._bump(video_id)
+        self._save()
+
+    def compact(self) -> None:
+        """Rewrite the matrix without dead rows (drops the IVF layer's row lists too)."""
+        if self._vectors is None:
+            return
+        new_offsets: Dict[str, int] = {}
+        pos = 0
+        order: List[np.ndarray] = [np.zeros(0, dtype=np.int64)]
+        for video_id, v in self._table["videos"].items():
+            order.append(np.arange(v["offset"], v["offset"] + v["count"]))
+            new_offsets[video_id] = pos
+            pos += v["count"]
+        idx = np.concatenate(order)
+
+        tmp = self.root / "vectors.bin.tmp"
+        np.ascontiguousarray(self._vectors[idx]).tofile(tmp)
+        self._vectors = None
+        os.replace(tmp, self._vectors_path)
+
+        self._rows = {name: arr[idx] for name, arr in self._rows.items()}
+        for video_id, offset in new_offsets.items():
+            self._table["videos"][video_id]["offset"] = offset
+        self._table["n_rows"] = int(len(idx))
+        self._map_vectors()
+        if self._ivf is not None:
+            self._ivf["assign"] = self._ivf["assign"][idx]
+            self._sort_ivf()
+        self._save()
+
+    # ---- IVF ----
+    def build_ivf(self, n_lists: int = 0, *, iters: int = 10, sample: int = 100_000, seed: int = 0) -> None:
+        """
+        k-means (spherical) the live vectors into n_lists lists
+        (default ~4*sqrt(rows)). Rows appended later are assigned to their
+        nearest list on add().
+        """
+        if self._vectors is None:
+            raise ValueError("Index is empty.")
+        alive = np.flatnonzero(self._rows["alive"])
+        if not len(alive):
+            raise ValueError("Index has no live rows.")
+        n_lists = n_lists or max(1, int(4 * np.sqrt(len(alive))))
+        rng = np.random.default_rng(seed)
+        picks = np.sort(rng.choice(alive, min(sample, len(alive)), replace=False))
+        train = np.asarray(self._vectors[picks], dtype=np.float32)
+        centroids = train[rng.choice(len(train), min(n_lists, len(train)), replace=False)].copy()
+        for _ in range(iters):
+            labels = np.argmax(train @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, train)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            centroids = np.where(empty[:, None], centroids, sums / np.maximum(norms, 1e-12))
+
+        self._ivf = {"centroids": centroids.astype(np.float32)}
+        self._ivf["assign"] = np.zeros(0, dtype=np.int32)
+        self._assign_ivf(0)
+        self._save()
+
+    def drop_ivf(self) -> None:
+        self._ivf = None
+        (self.root / "ivf.npz").unlink(missing_ok=True)
+
+    def _assign_ivf(self, start: int) -> None:
+        assert self._ivf is not None and self._vectors is not None
+        centroids = self._ivf["centroids"]
+        labels = [self._ivf["assign"][:start]]
+        for a in range(start, len(self._vectors), _BLOCK_ROWS):
+            block = np.asarray(self._vectors[a : a + _BLOCK_ROWS], dtype=np.float32)
+            labels.append(np.argmax(block @ centroids.T, axis=1).astype(np.int32))
+        self._ivf["assign"] = np.concatenate(labels)
+        self._sort_ivf()
+
+    def _sort_ivf(self) -> None:
+        assert self._ivf is not None
+        assign = self._ivf["assign"]
+        self._ivf["order"] = np.argsort(assign, kind="stable").astype(np.int64)
+        self._ivf["bounds"] = np.searchsorted(
+            assign[self._ivf["order"]], np.arange(len(self._ivf["centroids"]) + 1)
+        ).astype(np.int64)
+
+    # ---- search ----
+    def _mask(self, video_ids: Optional[Sequence[str]], time_range: Optional[TimeRange]) -> np.ndarray:
+        mask = self._rows["alive"].copy()
+        if video_ids is not None:
+            keep = np.zeros_like(mask)
+            for vid in video_ids:
+                v = self._video(vid)
+                if v is not None:
+                    keep[v.offset : v.offset + v.count] = True
+            mask &= keep
+        if time_range is not None:
+            t0, t1 = time_range
+            if t0 is not None:
+                mask &= self._rows["ts_end"] >= t0
+            if t1 is not None:
+                mask &= self._rows["ts_start"] <= t1
+        return mask
+
+    def _score_rows(self, queries: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-k of queries against the given row indices (sorted)."""
+        assert self._vectors is not None
+        best_idx = np.zeros((len(queries), 0), dtype=np.int64)
+        best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+        for a in range(0, len(rows), _BLOCK_ROWS):
+            block_rows = rows[a : a + _BLOCK_ROWS]
+            if len(block_rows) == block_rows[-1] - block_rows[0] + 1:
+                # Contiguous: slice the memmap instead of fancy indexing.
+                block = self._vectors[block_rows[0] : block_rows[-1] + 1]
+            else:
+                block = self._vectors[block_rows]
+            scores = queries @ np.asarray(block, dtype=np.float32).T
+            idx, top = _topk(scores, k)
+            best_idx = np.concatenate([best_idx, block_rows[idx]], axis=1)
+            best_scores = np.concatenate([best_scores, top], axis=1)
+            if best_idx.shape[1] > k:
+                keep, best_scores = _topk(best_scores, k)
+                best_idx = np.take_along_axis(best_idx, keep, axis=1)
+        return best_idx, best_scores
+
+    def search_vectors(
+        self,
+        queries: np.ndarray,
+        *,
+        k: int,
+        video_ids: Optional[Sequence[str]] = None,
+        time_range: Optional[TimeRange] = None,
+        n_probe: Optional[int] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Batched search: for each query row, [(row, score), ...] best first.
+        n_probe uses the IVF layer (if built) and scores only the rows of
+        the n_probe nearest lists.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if self._vectors is None:
+            return [[] for _ in queries]
+        mask = self._mask(video_ids, time_range)
+
+        if n_probe is None or self._ivf is None:
+            idx, scores = self._score_rows(queries, np.flatnonzero(mask), k)
+            return [list(zip(i.tolist(), s.tolist())) for i, s in zip(idx, scores)]
+
+        order, bounds = self._ivf["order"], self._ivf["bounds"]
+        probe_lists, _ = _topk(queries @ self._ivf["centroids"].T, n_probe)
+        out = []
+        for q, lists in zip(queries, probe_lists):
+            rows = np.sort(np.concatenate([order[bounds[l] : bounds[l + 1]] for l in lists]))
+            rows = rows[mask[rows]]
+            if len(rows) == 0:
+                out.append([])
+                continue
+            idx, scores = self._score_rows(q[None, :], rows, k)
+            out.append(list(zip(idx[0].tolist(), scores[0].tolist())))
+        return out
+
+    def hit(self, row: int, score: float) -> SearchHit:
+        video_id, v = self._owner(row)
+        texts = {}
+        if v.chunks_path and Path(v.chunks_path).exists():
+            texts = _chunk_texts(v.chunks_path, Path(v.chunks_path).stat().st_mtime_ns)
+        chunk_id = int(self._rows["chunk_id"][row])
+        return SearchHit(
+            video_id=video_id,
+            chunk_id=chunk_id,
+            ts_start=float(self._rows["ts_start"][row]),
+            ts_end=float(self._rows["ts_end"][row]),
+            text=texts.get(chunk_id, ""),
+            score=float(score),
+        )
+
+    def _owner(self, row: int) -> Tuple[str, _Video]:
+        if self._owners is None:
+            self._owners = sorted((v["offset"], vid) for vid, v in self._table["videos"].items())
+        i = bisect_right(self._owners, (row, "\uffff")) - 1
+        if i >= 0:
+            video_id = self._owners[i][1]
+            v = self._video(video_id)
+            if v is not None and v.offset <= row < v.offset + v.count:
+                return video_id, v
+        raise KeyError(f"Row {row} belongs to no indexed video")
+
+
+# -----------------------------
+# Retrieval backend
+# -----------------------------
+@dataclass
+class LocalBackend:
+    """RetrievalBackend over a LocalIndex; n_probe > 0 enables IVF search."""
+
+    index: LocalIndex
+    n_probe: Optional[int] = None
+
+    def search_vector(
+        self,
+        vector: Sequence[float],
+        *,
+        k: int,
+        video_ids: Optional[Sequence[str]] = None,
+        time_range: Optional[TimeRange] = None,
+        model: Optional[str] = None,
+    ) -> List[SearchHit]:
+        if model is not None and self.index.model is not None and model != self.index.model:
+            raise ValueError(
+                f"Index holds '{self.index.model}' vectors but the query was embedded with '{model}'."
+            )
+        (results,) = self.index.search_vectors(
+            np.asarray(vector, dtype=np.float32)[None, :],
+            k=k,
+            video_ids=video_ids,
+            time_range=time_range,
+            n_probe=self.n_probe,
+        )
+        return [self.index.hit(row, score) for row, score in results]
+
+    def index_version(self, video_ids: Optional[Sequence[str]] = None) -> str:
+        return self.index.index_version(video_ids)
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from sqlalchemy import text
+
+from videorag.retrieval.ann_index import DISTANCE_OP, SearchParams, apply_search_params
+
+# (t_start, t_end) in seconds; either side may be None for an open range.
+TimeRange = Tuple[Optional[float], Optional[float]]
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    video_id: str
+    chunk_id: int
+    ts_start: float
+    ts_end: float
+    text: str
+    # Cosine similarity (higher is better) or a fused score for hybrid search.
+    score: float
+
+    def deep_link(self, base: str | Path | None = None) -> str:
+        """
+        Media-fragment link to the hit's span, e.g.
+        data/raw/<video_id>/video.mp4#t=120.5,151.0
+        """
+        if base is None:
+            from videorag.input.paths import video_paths
+
+            base = video_paths(self.video_id).raw_video_path
+        return f"{base}#t={self.ts_start:.1f},{self.ts_end:.1f}"
+
+
+class RetrievalBackend(Protocol):
+    def search_vector(
+        self,
+        vector: Sequence[float],
+        *,
+        k: int,
+        video_ids: Optional[Sequence[str]] = None,
+        time_range: Optional[TimeRange] = None,
+        model: Optional[str] = None,
+    ) -> List[SearchHit]:
+        """model: the query embedder's model_id; rejected if the index holds other vectors."""
+        ...
+
+    def index_version(self, video_ids: Optional[Sequence[str]] = None) -> str:
+        """Token that changes whenever the indexed chunks of video_ids (None: any video) change."""
+        ...
+
+
+def filter_sql(
+    video_ids: Optional[Sequence[str]], time_range: Optional[TimeRange]
+) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    WHERE conditions for the video / time filters. A chunk matches a time
+    range if it overlaps it.
+    """
+    where: List[str] = []
+    params: Dict[str, Any] = {}
+    if video_ids is not None:
+        where.append("video_id = ANY(:video_ids)")
+        params["video_ids"] = list(video_ids)
+    if time_range is not None:
+        t0, t1 = time_range
+        if t0 is not None:
+            where.append("ts_end >= :t0")
+            params["t0"] = float(t0)
+        if t1 is not None:
+            where.append("ts_start <= :t1")
+            params["t1"] = float(t1)
+    return where, params
+
+
+# Indexed vectors that are not from :model, or of unknown model. Written as
+# two ranges so the partial index chunks_embedding_model_idx answers it
+# without touching the table when every vector matches.
+_OTHER_MODEL_SQL = """
+SELECT embedding_model FROM chunks
+WHERE embedding IS NOT NULL
+  AND (embedding_model < :model OR embedding_model > :model OR embedding_model IS NULL){filters}
+LIMIT 1
+"""
+
+
+def other_model_sql(filters: List[str]) -> str:
+    return _OTHER_MODEL_SQL.format(filters="".join(f" AND {cond}" for cond in filters))
+
+
+def check_embedding_model(model: str, stored: Sequence[Any]) -> None:
+    """
+    Raise if other_model_sql() found a row: vectors of different models are
+    not comparable, so the hits would be meaningless.
+    """
+    if not stored:
+        return
+    (other,) = stored
+    if other is None:
+        raise ValueError(
+            "Some chunks were indexed without their embedding model (before the "
+            f"embedding_model column existed); re-index them before querying with '{model}'."
+        )
+    raise ValueError(
+        f"Chunks were embedded with '{other}' but the query with '{model}'. "
+        "Re-embed and re-index the videos, or query with the same embedder."
+    )
+
+
+# -----------------------------
+# Postgres (pgvector)
+# -----------------------------
+@dataclass
+class PostgresBackend:
+    """
+    kNN over chunks.embedding. Filters are part of the same query, so with
+    an HNSW/IVFFlat index (see ann_index) Postgres walks the index and
+    checks the filters as it goes instead of scanning the table.
+    """
+
+    params: SearchParams = field(default_factory=SearchParams)
+
+    def search_vector(
+        self,
+        vector: Sequence[float],
+        *,
+        k: int,
+        video_ids: Optional[Sequence[str]] = None,
+        time_range: Optional[TimeRange] = None,
+        model: Optional[str] = None,
+    ) -> List[SearchHit]:
+        from videorag.db.indexing import vector_literal
+        from videorag.db.session import db_session
+
+        where, params = filter_sql(video_ids, time_range)
+        check_sql, check_params = text(other_model_sql(where)), {**params, "model": model}
+        where.insert(0, "embedding IS NOT NULL")
+        params.update({"q": vector_literal(vector), "k": int(k)})
+        sql = text(
+            f"""
+            SELECT video_id, chunk_id, ts_start, ts_end, text,
+                   embedding {DISTANCE_OP} CAST(:q AS vector) AS distance
+            FROM chunks
+            WHERE {" AND ".join(where)}
+            ORDER BY embedding {DISTANCE_OP} CAST(:q AS vector)
+            LIMIT :k
+            """
+        )
+        with db_session() as session:
+            if model is not None:
+                check_embedding_model(model, session.execute(check_sql, check_params).first())
+            apply_search_params(session, self.params)
+            rows = session.execute(sql, params).all()
+
+        return [
+            SearchHit(
+                video_id=r.video_id,
+                chunk_id=int(r.chunk_id),
+                ts_start=float(r.ts_start),
+                ts_end=float(r.ts_end),
+                text=r.text,
+                score=1.0 - float(r.distance),
+            )
+            for r in rows
+        ]
+
+    def index_version(self, video_ids: Optional[Sequence[str]] = None) -> str:
+        from videorag.retrieval.versions import index_version
+
+        return index_version(video_ids)
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+BACKENDS = ("postgres", "local")
+
+
+def default_backend_name() -> str:
+    """VIDEORAG_RETRIEVAL_BACKEND if set, otherwise postgres."""
+    return os.getenv("VIDEORAG_RETRIEVAL_BACKEND", "").strip().lower() or "postgres"
+
+
+def get_backend(name: str | None = None, **kwargs: Any) -> RetrievalBackend:
+    name = (name or default_backend_name()).lower()
+    if name == "postgres":
+        return PostgresBackend(**kwargs)
+    if name == "local":
+        from videorag.retrieval.local_index import LocalBackend, LocalIndex
+
+        index = kwargs.pop("index", None) or LocalIndex()
+        return LocalBackend(index=index, **kwargs)
+    raise ValueError(f"Unknown retrieval backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+
+
+@lru_cache(maxsize=None)
+def _default_embedder():
+    from videorag.pipeline.embeddings import get_embedder
+
+    return get_embedder()
+
+
+def embed_query(query: str, embedder: Any = None) -> List[float]:
+    embedder = embedder or _default_embedder()
+    return embedder.embed([query])[0].tolist()
+
+
+def search(
+    query: str,
+    k: int = 10,
+    video_ids: Optional[Sequence[str]] = None,
+    time_range: Optional[TimeRange] = None,
+    *,
+    embedder: Any = None,
+    backend: Optional[RetrievalBackend] = None,
+) -> List[SearchHit]:
+    """
+    Top-k chunks for a natural-language query, best first.
+
+    The query is embedded with the same embedder the chunks were embedded
+    with (VIDEORAG_EMBEDDER by default); the backend rejects a query whose
+    embedder differs from the one the chunks were indexed with. video_ids
+    restricts the search to those videos; time_range to chunks overlapping
+    (t_start, t_end). backend defaults to get_backend(): Postgres, or the
+    in-process index with VIDEORAG_RETRIEVAL_BACKEND=local.
+    """
+    backend = backend or get_backend()
+    embedder = embedder or _default_embedder()
+    return backend.search_vector(
+        embed_query(query, embedder), k=k, video_ids=video_ids, time_range=time_range, model=embedder.model_id
+    )
@@ -0,0 +1,64 @@
+"""
+Per-video index version counters, kept in Postgres (`index_versions`) next
+to the chunks. Indexers bump them in the transaction that writes the rows,
+so a version never lags the chunks it describes; caches put them in their
+keys.
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Mapping, Optional, Sequence
+
+from sqlalchemy import text
+
+# Version key for "all videos" queries; bumped by every index write.
+GLOBAL_KEY = "*"
+
+# Rows are locked in key order, so concurrent indexers (which all bump
+# GLOBAL_KEY) queue up instead of deadlocking.
+_BUMP = """
+INSERT INTO index_versions (video_id, version)
+SELECT video_id, 1 FROM unnest({keys}) AS k(video_id)
+ORDER BY video_id
+ON CONFLICT (video_id) DO UPDATE SET version = index_versions.version + 1
+"""
+
+BUMP_SQL = text(_BUMP.format(keys="CAST(:video_ids AS text[])"))
+# Same statement for a raw psycopg cursor (db.bulk_index).
+BUMP_DBAPI_SQL = _BUMP.format(keys="%s::text[]")
+
+_VERSIONS_SQL = text("SELECT video_id, version FROM index_versions WHERE video_id = ANY(:video_ids)")
+
+
+def bump_keys(video_ids: Iterable[str]) -> List[str]:
+    """Keys to bump for a write to video_ids: each video and GLOBAL_KEY (none if no videos)."""
+    ids = set(video_ids)
+    return sorted(ids | {GLOBAL_KEY}) if ids else []
+
+
+def bump_index_version(session, video_ids: Iterable[str]) -> None:
+    """
+    Record that these videos' indexed chunks changed. Called by every
+    indexer in the session that wrote them, as its last statement: the
+    GLOBAL_KEY row stays locked until commit.
+    """
+    keys = bump_keys(video_ids)
+    if keys:
+        session.execute(BUMP_SQL, {"video_ids": keys})
+
+
+def version_keys(video_ids: Optional[Sequence[str]]) -> List[str]:
+    return [GLOBAL_KEY] if video_ids is None else sorted(set(video_ids))
+
+
+def format_version(keys: Sequence[str], found: Mapping[str, int]) -> str:
+    return ",".join(str(found.get(k, 0)) for k in keys)
+
+
+def index_version(video_ids: Optional[Sequence[str]] = None) -> str:
+    """Opaque token that changes whenever any of video_ids (or any video) is re-indexed."""
+    from videorag.db.session import db_session
+
+    keys = version_keys(video_ids)
+    with db_session() as session:
+        found = dict(session.execute(_VERSIONS_SQL, {"video_ids": keys}).all())
+    return format_version(keys, found)